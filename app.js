@@ -0,0 +1 @@
+console.log('hello');
\ No newline at end of file
@@ -0,0 +1,5 @@
+package main
+
+func getUserData() string {
+    return "user"
+}
\ No newline at end of file
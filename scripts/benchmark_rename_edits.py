@@ -0,0 +1,110 @@
+"""
+Benchmarks the application of a large rename (workspace edit with many text edits in a single file) to a file
+opened in a language server, comparing the previous per-edit synchronisation (a delete and an insert notification
+per edit) with the batched application (a single didChange notification).
+
+Usage: python scripts/benchmark_rename_edits.py [--num-lines 20000] [--num-edits 500]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from serena.constants import SERENA_MANAGED_DIR_IN_HOME, SERENA_MANAGED_DIR_NAME
+from solidlsp import SolidLanguageServer, ls_types
+from solidlsp.ls_config import Language, LanguageServerConfig
+from solidlsp.ls_logger import LanguageServerLogger
+from solidlsp.settings import SolidLSPSettings
+
+FILE_NAME = "large_module.py"
+
+
+def create_module(num_lines: int, num_calls: int) -> str:
+    lines = ["def target_function(x):", "    return x", ""]
+    call_every = max(1, (num_lines - len(lines)) // num_calls)
+    num_calls_added = 0
+    while len(lines) < num_lines:
+        if num_calls_added < num_calls and len(lines) % call_every == 0:
+            lines.append(f"value_{len(lines)} = target_function({len(lines)})")
+            num_calls_added += 1
+        else:
+            lines.append(f"other_{len(lines)} = {len(lines)}")
+    return "\n".join(lines) + "\n"
+
+
+def rename_edits(contents: str, old_name: str, new_name: str) -> list[ls_types.TextEdit]:
+    edits = []
+    for line_no, line in enumerate(contents.split("\n")):
+        col = line.find(old_name)
+        if col != -1:
+            edits.append(
+                ls_types.TextEdit(
+                    range=ls_types.Range(
+                        start=ls_types.Position(line=line_no, character=col),
+                        end=ls_types.Position(line=line_no, character=col + len(old_name)),
+                    ),
+                    newText=new_name,
+                )
+            )
+    return edits
+
+
+def apply_edits_individually(ls: SolidLanguageServer, relative_path: str, edits: list[ls_types.TextEdit]) -> None:
+    """The previous strategy: a delete and an insert (each with its own notification) per edit"""
+    sorted_edits = sorted(edits, key=lambda e: (e["range"]["start"]["line"], e["range"]["start"]["character"]), reverse=True)
+    for edit in sorted_edits:
+        ls.delete_text_between_positions(relative_path, edit["range"]["start"], edit["range"]["end"])
+        ls.insert_text_at_position(relative_path, edit["range"]["start"]["line"], edit["range"]["start"]["character"], edit["newText"])
+
+
+def run_benchmark(ls: SolidLanguageServer, edits: list[ls_types.TextEdit], batched: bool) -> tuple[float, float]:
+    """
+    :return: the time taken to apply the edits and the time taken by a subsequent document symbol request
+        (which requires the language server to have processed all changes)
+    """
+    with ls.open_file(FILE_NAME):
+        start_time = time.perf_counter()
+        if batched:
+            ls.apply_text_edits_to_file(FILE_NAME, edits)
+        else:
+            apply_edits_individually(ls, FILE_NAME, edits)
+        apply_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        ls.request_document_symbols(FILE_NAME)
+        symbols_time = time.perf_counter() - start_time
+    return apply_time, symbols_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-lines", type=int, default=20000)
+    parser.add_argument("--num-edits", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo_path:
+        contents = create_module(args.num_lines, args.num_edits - 1)
+        with open(os.path.join(repo_path, FILE_NAME), "w", encoding="utf-8") as f:
+            f.write(contents)
+
+        ls = SolidLanguageServer.create(
+            LanguageServerConfig(code_language=Language.PYTHON),
+            LanguageServerLogger(log_level=logging.ERROR),
+            repo_path,
+            solidlsp_settings=SolidLSPSettings(solidlsp_dir=SERENA_MANAGED_DIR_IN_HOME, project_data_relative_path=SERENA_MANAGED_DIR_NAME),
+        )
+        with ls.start_server():
+            for batched in (False, True):
+                # use a different new name for each run, such that no cached symbols can be used
+                edits = rename_edits(contents, "target_function", "batched_target_function" if batched else "renamed_target_function")
+                print(f"Applying {len(edits)} edits to a file with {args.num_lines} lines")
+                apply_time, symbols_time = run_benchmark(ls, edits, batched)
+                print(
+                    f"{'batched' if batched else 'per-edit'}: applying edits took {apply_time:.3f}s, "
+                    f"subsequent document symbol request took {symbols_time:.3f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 区域检测模块
 """
 
+from .backup_store import BackupSnapshot, BackupStore
 from .data_models import AppliedArea, EditValidationError, EditValidationResult, ProjectArea, QueryRouting, RollbackResult, RollbackStrategy
 from .detector import AreaDetector
 from .edit_validator import EditValidator
@@ -14,6 +15,8 @@ from .wrapper import ConstraintViolationError, SafeSearchError, SafeSearchWrappe
 __all__ = [
     "AppliedArea",
     "AreaDetector",
+    "BackupSnapshot",
+    "BackupStore",
     "ConstraintViolationError",
     "EditValidationError",
     "EditValidationResult",
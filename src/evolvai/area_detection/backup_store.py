@@ -0,0 +1,361 @@
+"""
+内容寻址备份存储
+文件内容按哈希存储为压缩数据块（相同内容只存储一次），每个快照（一批编辑）对应一个小型清单
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+def write_bytes_atomically(path: Path, data: bytes) -> None:
+    """
+    原子写入文件（写入同目录下的临时文件后替换），保留已有文件的权限
+
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@dataclass
+class BackupSnapshot:
+    """备份快照（一个编辑批次的所有文件）"""
+
+    snapshot_id: str
+    created_at: float
+    # 文件路径 -> 内容哈希, None 表示创建快照时文件不存在
+    files: dict[str, Optional[str]] = field(default_factory=dict)
+    label: str = ""
+
+
+class BackupStore:
+    """
+    内容寻址备份存储
+
+    目录结构:
+        objects/<哈希前两位>/<哈希>   zlib 压缩的文件内容
+        manifests/<快照ID>.json       快照清单（快照中的文件及其内容哈希）
+        index.jsonl                   索引（对象大小与快照的ID、时间和清单大小），用于大小统计和垃圾回收，无需遍历目录
+
+    索引是只追加的增量记录，每次快照只追加新对象和该快照的记录，因此每次编辑的开销与历史长度无关；
+    垃圾回收时索引被压缩为当前状态。快照的文件列表只保存在清单中，需要时才读取。
+    """
+
+    SNAPSHOT_ID_PREFIX = "snap-"
+    INDEX_FILE_NAME = "index.jsonl"
+    LEGACY_INDEX_FILE_NAME = "index.json"
+    """旧版本的索引文件（包含所有快照的文件列表，每次快照都完整重写），重建索引时删除"""
+    COMPRESSION_LEVEL = 6
+
+    def __init__(self, root_dir: str):
+        """
+        初始化备份存储
+
+        Args:
+            root_dir: 存储根目录（例如 <项目>/.evolvai/backups）
+
+        """
+        self.root_dir = Path(root_dir)
+        self._objects_dir = self.root_dir / "objects"
+        self._manifests_dir = self.root_dir / "manifests"
+        self._index_path = self.root_dir / self.INDEX_FILE_NAME
+        self._lock = threading.Lock()
+        self._object_sizes: dict[str, int] = {}
+        self._snapshots: dict[str, BackupSnapshot] = {}
+        self._manifest_sizes: dict[str, int] = {}
+        # 文件列表尚未从清单中读取的快照
+        self._unloaded_snapshot_ids: set[str] = set()
+        self._load_index()
+
+    @classmethod
+    def is_snapshot_id(cls, identifier: Optional[str]) -> bool:
+        return identifier is not None and identifier.startswith(cls.SNAPSHOT_ID_PREFIX)
+
+    def snapshot(self, file_paths: list[str], label: str = "") -> BackupSnapshot:
+        """
+        为多个文件创建一个快照（一次操作，一个清单）
+
+        Args:
+            file_paths: 文件路径列表
+            label: 快照描述
+
+        Returns:
+            BackupSnapshot: 创建的快照
+
+        """
+        created_at = time.time()
+        snapshot_id = f"{self.SNAPSHOT_ID_PREFIX}{time.strftime('%Y%m%d%H%M%S', time.localtime(created_at))}-{uuid.uuid4().hex[:12]}"
+        snapshot = BackupSnapshot(snapshot_id=snapshot_id, created_at=created_at, label=label)
+
+        with self._lock:
+            index_records: list[dict] = []
+            for file_path in file_paths:
+                key = os.path.abspath(file_path)
+                try:
+                    content = Path(file_path).read_bytes()
+                except FileNotFoundError:
+                    snapshot.files[key] = None
+                    continue
+                content_hash = hashlib.sha256(content).hexdigest()
+                if content_hash not in self._object_sizes:
+                    self._object_sizes[content_hash] = self._write_object(content_hash, content)
+                    index_records.append({"object": content_hash, "size": self._object_sizes[content_hash]})
+                snapshot.files[key] = content_hash
+
+            manifest = json.dumps(
+                {"snapshot_id": snapshot_id, "created_at": created_at, "label": label, "files": snapshot.files}, ensure_ascii=False
+            ).encode("utf-8")
+            write_bytes_atomically(self._manifests_dir / f"{snapshot_id}.json", manifest)
+            self._snapshots[snapshot_id] = snapshot
+            self._manifest_sizes[snapshot_id] = len(manifest)
+            index_records.append(self._snapshot_record(snapshot))
+            self._append_to_index(index_records)
+
+        return snapshot
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[BackupSnapshot]:
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is not None:
+            self._load_files(snapshot)
+        return snapshot
+
+    def find_latest_snapshot(self, file_path: str) -> Optional[BackupSnapshot]:
+        """
+        查找包含指定文件的最新快照
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            Optional[BackupSnapshot]: 最新快照，不存在时返回 None
+
+        """
+        key = os.path.abspath(file_path)
+        # 从最新的快照开始查找，通常只需读取少量清单
+        for snapshot in sorted(self._snapshots.values(), key=lambda s: s.created_at, reverse=True):
+            if key in self._load_files(snapshot):
+                return snapshot
+        return None
+
+    def read_content(self, content_hash: str) -> bytes:
+        """读取指定哈希的文件内容"""
+        return zlib.decompress(self._object_path(content_hash).read_bytes())
+
+    def restore(self, snapshot_id: str, file_paths: Optional[list[str]] = None) -> list[str]:
+        """
+        将文件恢复为快照中的状态（快照时不存在的文件将被删除）
+
+        Args:
+            snapshot_id: 快照ID
+            file_paths: 要恢复的文件（默认恢复快照中的所有文件）
+
+        Returns:
+            List[str]: 已恢复的文件路径
+
+        """
+        snapshot = self.get_snapshot(snapshot_id)
+        if snapshot is None:
+            raise KeyError(f"Unknown snapshot: {snapshot_id}")
+
+        if file_paths is None:
+            keys = list(snapshot.files)
+        else:
+            keys = [os.path.abspath(p) for p in file_paths]
+            missing = [k for k in keys if k not in snapshot.files]
+            if missing:
+                raise KeyError(f"Files not contained in snapshot {snapshot_id}: {missing}")
+
+        restored = []
+        for key in keys:
+            content_hash = snapshot.files[key]
+            if content_hash is None:
+                if os.path.exists(key):
+                    os.remove(key)
+            else:
+                os.makedirs(os.path.dirname(key), exist_ok=True)
+                write_bytes_atomically(Path(key), self.read_content(content_hash))
+            restored.append(key)
+        return restored
+
+    def list_snapshots(self) -> list[BackupSnapshot]:
+        """按创建时间排序的所有快照（读取尚未读取的清单）"""
+        snapshots = self._sorted_snapshots()
+        for snapshot in snapshots:
+            self._load_files(snapshot)
+        return snapshots
+
+    def get_total_size(self) -> int:
+        """
+        获取存储大小（基于索引，不遍历目录）
+
+        Returns:
+            int: 压缩对象与清单的总字节数
+
+        """
+        return sum(self._object_sizes.values()) + sum(self._manifest_sizes.values())
+
+    def remove_snapshots(self, snapshot_ids: list[str]) -> None:
+        """删除指定快照（不回收对象，见 collect_garbage）"""
+        with self._lock:
+            for snapshot_id in snapshot_ids:
+                if self._snapshots.pop(snapshot_id, None) is not None:
+                    self._manifest_sizes.pop(snapshot_id, None)
+                    self._unloaded_snapshot_ids.discard(snapshot_id)
+                    (self._manifests_dir / f"{snapshot_id}.json").unlink(missing_ok=True)
+            self._append_to_index([{"removed_snapshot": snapshot_id} for snapshot_id in snapshot_ids])
+
+    def collect_garbage(self, max_age_days: Optional[float] = None, max_snapshots: Optional[int] = None) -> int:
+        """
+        清理旧快照并删除不再被任何快照引用的对象，并将索引压缩为当前状态
+
+        Args:
+            max_age_days: 快照最大保留天数
+            max_snapshots: 最大保留快照数量（保留最新的）
+
+        Returns:
+            int: 释放的字节数
+
+        """
+        size_before = self.get_total_size()
+        snapshots = self._sorted_snapshots()
+        expired: list[str] = []
+        if max_age_days is not None:
+            cutoff_time = time.time() - max_age_days * 24 * 60 * 60
+            expired.extend(s.snapshot_id for s in snapshots if s.created_at < cutoff_time)
+        if max_snapshots is not None and len(snapshots) > max_snapshots:
+            expired.extend(s.snapshot_id for s in snapshots[: len(snapshots) - max_snapshots])
+        if expired:
+            self.remove_snapshots(expired)
+
+        with self._lock:
+            referenced = {h for s in self._snapshots.values() for h in self._load_files(s).values() if h is not None}
+            unreferenced = [h for h in self._object_sizes if h not in referenced]
+            for content_hash in unreferenced:
+                self._object_path(content_hash).unlink(missing_ok=True)
+                del self._object_sizes[content_hash]
+            self._compact_index()
+
+        return size_before - self.get_total_size()
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self._objects_dir / content_hash[:2] / content_hash
+
+    def _write_object(self, content_hash: str, content: bytes) -> int:
+        """写入压缩对象，返回存储大小"""
+        compressed = zlib.compress(content, self.COMPRESSION_LEVEL)
+        object_path = self._object_path(content_hash)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomically(object_path, compressed)
+        return len(compressed)
+
+    def _sorted_snapshots(self) -> list[BackupSnapshot]:
+        return sorted(self._snapshots.values(), key=lambda s: s.created_at)
+
+    def _load_files(self, snapshot: BackupSnapshot) -> dict[str, Optional[str]]:
+        """读取快照的文件列表（只在首次访问时读取清单；清单缺失或损坏时视为空）"""
+        if snapshot.snapshot_id in self._unloaded_snapshot_ids:
+            try:
+                manifest = json.loads((self._manifests_dir / f"{snapshot.snapshot_id}.json").read_text(encoding="utf-8"))
+                snapshot.files = dict(manifest["files"])
+            except (OSError, ValueError, KeyError, TypeError):
+                snapshot.files = {}
+            self._unloaded_snapshot_ids.discard(snapshot.snapshot_id)
+        return snapshot.files
+
+    def _snapshot_record(self, snapshot: BackupSnapshot) -> dict:
+        return {
+            "snapshot": snapshot.snapshot_id,
+            "created_at": snapshot.created_at,
+            "label": snapshot.label,
+            "manifest_size": self._manifest_sizes.get(snapshot.snapshot_id, 0),
+        }
+
+    def _append_to_index(self, records: list[dict]) -> None:
+        """将增量记录追加到索引"""
+        if not records:
+            return
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+    def _compact_index(self) -> None:
+        """将索引重写为当前状态（不含已删除的快照和对象）"""
+        records = [{"object": h, "size": size} for h, size in self._object_sizes.items()]
+        records.extend(self._snapshot_record(s) for s in self._sorted_snapshots())
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        write_bytes_atomically(self._index_path, data.encode("utf-8"))
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            if self._manifests_dir.exists() or self._objects_dir.exists():
+                self._rebuild_index()
+            return
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if "object" in record:
+                        self._object_sizes[record["object"]] = record["size"]
+                    elif "snapshot" in record:
+                        snapshot_id = record["snapshot"]
+                        self._snapshots[snapshot_id] = BackupSnapshot(
+                            snapshot_id=snapshot_id, created_at=record["created_at"], label=record.get("label", "")
+                        )
+                        self._manifest_sizes[snapshot_id] = record.get("manifest_size", 0)
+                        self._unloaded_snapshot_ids.add(snapshot_id)
+                    elif "removed_snapshot" in record:
+                        snapshot_id = record["removed_snapshot"]
+                        self._snapshots.pop(snapshot_id, None)
+                        self._manifest_sizes.pop(snapshot_id, None)
+                        self._unloaded_snapshot_ids.discard(snapshot_id)
+                    else:
+                        raise ValueError(f"Unknown index record: {record}")
+        except (ValueError, KeyError, TypeError):
+            # 例如写入中断导致的不完整记录
+            self._object_sizes = {}
+            self._snapshots = {}
+            self._manifest_sizes = {}
+            self._unloaded_snapshot_ids = set()
+            self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """索引缺失或损坏时，从清单和对象目录重建索引（仅在此时遍历目录）"""
+        self._object_sizes = {p.name: p.stat().st_size for p in self._objects_dir.glob("*/*") if not p.name.endswith(".tmp")}
+        self._snapshots = {}
+        self._manifest_sizes = {}
+        for manifest_path in self._manifests_dir.glob("*.json"):
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except ValueError:
+                continue
+            snapshot_id = manifest["snapshot_id"]
+            self._snapshots[snapshot_id] = BackupSnapshot(
+                snapshot_id=snapshot_id, created_at=manifest["created_at"], files=manifest["files"], label=manifest.get("label", "")
+            )
+            self._manifest_sizes[snapshot_id] = manifest_path.stat().st_size
+        self._unloaded_snapshot_ids = set()
+        self._compact_index()
+        (self.root_dir / self.LEGACY_INDEX_FILE_NAME).unlink(missing_ok=True)
@@ -2,10 +2,12 @@
 区域检测的数据模型
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
+from .line_diff import LineDiff
+
 
 @dataclass
 class ProjectArea:
@@ -65,6 +67,8 @@ class EditValidationResult:
     lines_removed: int = 0
     new_imports: list[str] = None
     removed_imports: list[str] = None
+    lines_modified: int = 0
+    diff: Optional[LineDiff] = None
 
     def __post_init__(self):
         if self.syntax_errors is None:
@@ -127,6 +131,15 @@ class ExecutionRiskLevel(Enum):
     CRITICAL = "critical"
 
 
+@dataclass
+class ResourceLimits:
+    """子进程资源限制（由子进程中的 shell 通过 ulimit 设置，仅支持POSIX系统）"""
+
+    cpu_time_seconds: Optional[int] = None
+    # 内存上限（MB）。Linux 不强制 RLIMIT_RSS，因此限制的是虚拟地址空间（RLIMIT_AS）
+    max_memory_mb: Optional[int] = None
+
+
 @dataclass
 class ExecutionPrecondition:
     """执行前置条件"""
@@ -138,6 +151,7 @@ class ExecutionPrecondition:
     system_dependencies: list[str]
     environment_variables: dict[str, str]
     risk_level: ExecutionRiskLevel = ExecutionRiskLevel.MEDIUM
+    resource_limits: Optional[ResourceLimits] = None
 
 
 @dataclass
@@ -155,6 +169,20 @@ class ExecutionResult:
     error_message: Optional[str] = None
     timeout_occurred: bool = False
     signal_code: Optional[int] = None
+    output_truncated: bool = False
+
+
+@dataclass
+class BatchExecutionResult:
+    """批量执行结果"""
+
+    success: bool
+    # 与命令列表顺序一致
+    results: list[ExecutionResult]
+    duration_ms: float
+    stopped_early: bool = False
+    failed_commands: list[str] = field(default_factory=list)
+    cancelled_commands: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -3,24 +3,30 @@
 提供语法、区域、大小和导入验证功能
 """
 
-import ast
-import re
 from pathlib import Path
 from typing import Optional
 
 from .data_models import AppliedArea, EditValidationError, EditValidationResult, ProjectArea
+from .line_diff import diff_text
+from .parse_cache import ParseCache, ParsedContent, get_shared_parse_cache
 
 
 class EditValidator:
     """编辑验证器"""
 
-    def __init__(self, areas: Optional[list[ProjectArea]] = None, applied_areas: Optional[list[AppliedArea]] = None):
+    def __init__(
+        self,
+        areas: Optional[list[ProjectArea]] = None,
+        applied_areas: Optional[list[AppliedArea]] = None,
+        parse_cache: Optional[ParseCache] = None,
+    ):
         """
         初始化编辑验证器
 
         Args:
             areas: 项目区域列表
             applied_areas: 已应用的区域列表
+            parse_cache: 解析缓存，默认使用进程内共享的缓存
 
         """
         self.areas = areas or []
@@ -28,6 +34,7 @@ class EditValidator:
         self._max_file_size = 10 * 1024 * 1024  # 10MB
         self._max_lines_per_edit = 1000
         self._max_files_per_edit = 10
+        self._parse_cache = parse_cache or get_shared_parse_cache()
 
     def validate_edit_syntax(
         self,
@@ -142,32 +149,27 @@ class EditValidator:
 
         """
         warnings: list[str] = []
-        changes_count = 0
-        lines_added = 0
-        lines_removed = 0
-
-        # 计算行数变更
-        original_lines = original_code.split('\n')
-        edited_lines = edited_code.split('\n')
-
-        lines_added = max(0, len(edited_lines) - len(original_lines))
-        lines_removed = max(0, len(original_lines) - len(edited_lines))
-
-        # 估算变更数量（简单diff）
-        changes_count = self._estimate_changes(original_code, edited_code)
 
         # 检查限制
         max_changes_limit = max_changes or self._max_lines_per_edit
         max_lines_added_limit = max_lines_added or self._max_lines_per_edit
         max_lines_removed_limit = max_lines_removed or self._max_lines_per_edit
 
+        # 计算行级差异（超出变更上限时提前终止）
+        diff = diff_text(original_code, edited_code, max_changes=max_changes_limit)
+        changes_count = diff.changes_count
+        lines_added = diff.lines_added
+        lines_removed = diff.lines_removed
+
         if changes_count > max_changes_limit:
             return EditValidationResult(
                 is_valid=False,
                 error_message=f"Changes count ({changes_count}) exceeds limit ({max_changes_limit})",
                 changes_count=changes_count,
                 lines_added=lines_added,
-                lines_removed=lines_removed
+                lines_removed=lines_removed,
+                lines_modified=diff.lines_modified,
+                diff=diff
             )
 
         if lines_added > max_lines_added_limit:
@@ -176,7 +178,9 @@ class EditValidator:
                 error_message=f"Lines added ({lines_added}) exceeds limit ({max_lines_added_limit})",
                 changes_count=changes_count,
                 lines_added=lines_added,
-                lines_removed=lines_removed
+                lines_removed=lines_removed,
+                lines_modified=diff.lines_modified,
+                diff=diff
             )
 
         if lines_removed > max_lines_removed_limit:
@@ -185,7 +189,9 @@ class EditValidator:
                 error_message=f"Lines removed ({lines_removed}) exceeds limit ({max_lines_removed_limit})",
                 changes_count=changes_count,
                 lines_added=lines_added,
-                lines_removed=lines_removed
+                lines_removed=lines_removed,
+                lines_modified=diff.lines_modified,
+                diff=diff
             )
 
         if changes_count > 100:
@@ -196,7 +202,9 @@ class EditValidator:
             warnings=warnings,
             changes_count=changes_count,
             lines_added=lines_added,
-            lines_removed=lines_removed
+            lines_removed=lines_removed,
+            lines_modified=diff.lines_modified,
+            diff=diff
         )
 
     def validate_imports(
@@ -275,7 +283,9 @@ class EditValidator:
             lines_added=size_result.lines_added,
             lines_removed=size_result.lines_removed,
             new_imports=import_result.new_imports,
-            removed_imports=import_result.removed_imports
+            removed_imports=import_result.removed_imports,
+            lines_modified=size_result.lines_modified,
+            diff=size_result.diff
         )
 
     def validate_area_constraints(
@@ -351,9 +361,6 @@ class EditValidator:
 
         """
         warnings: list[str] = []
-        changes_count = 0
-        lines_added = 0
-        lines_removed = 0
 
         # 检查文件大小
         edited_size = len(edited_content.encode('utf-8'))
@@ -365,12 +372,11 @@ class EditValidator:
                 details={"size": edited_size, "limit": self._max_file_size}
             )
 
-        # 计算行数变更
-        original_lines = original_content.split('\n')
-        edited_lines = edited_content.split('\n')
-
-        lines_added = max(0, len(edited_lines) - len(original_lines))
-        lines_removed = max(0, len(original_lines) - len(edited_lines))
+        # 计算行级差异（变更行数超过单次编辑上限时为估算值）
+        diff = diff_text(original_content, edited_content, max_changes=self._max_lines_per_edit)
+        changes_count = diff.changes_count
+        lines_added = diff.lines_added
+        lines_removed = diff.lines_removed
 
         # 检查行数变更限制
         if lines_added > self._max_lines_per_edit:
@@ -389,9 +395,6 @@ class EditValidator:
                 details={"lines_removed": lines_removed, "limit": self._max_lines_per_edit}
             )
 
-        # 估算变更数量（简单diff）
-        changes_count = self._estimate_changes(original_content, edited_content)
-
         if changes_count > 100:
             warnings.append(f"Large number of changes detected ({changes_count}), consider batching")
 
@@ -400,7 +403,9 @@ class EditValidator:
             warnings=warnings,
             changes_count=changes_count,
             lines_added=lines_added,
-            lines_removed=lines_removed
+            lines_removed=lines_removed,
+            lines_modified=diff.lines_modified,
+            diff=diff
         )
 
     def validate_import_changes(
@@ -460,104 +465,45 @@ class EditValidator:
             warnings=warnings
         )
 
+    def parse(self, code: str, language: str) -> ParsedContent:
+        """
+        解析代码（同一内容和语言只解析一次，结果在会话内共享）
+
+        Args:
+            code: 代码内容
+            language: 编程语言
+
+        Returns:
+            ParsedContent: 解析结果（语法错误、导入和结构统计）
+
+        """
+        return self._parse_cache.get(code, language)
+
     def _validate_python_syntax(self, code: str, file_path: str) -> list[str]:
         """验证Python语法"""
-        errors: list[str] = []
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            errors.append(f"Python syntax error: {e.msg} (line {e.lineno})")
-        except Exception as e:
-            errors.append(f"Python validation failed: {e!s}")
-        return errors
+        return list(self.parse(code, "python").syntax_errors)
 
     def _validate_js_syntax(self, code: str, file_path: str) -> list[str]:
         """验证JavaScript/TypeScript语法"""
-        errors: list[str] = []
         # 简单的语法检查
         # 实际项目中应该使用eslint或typescript编译器
-        try:
-            # 检查基本语法问题
-            if code.count('{') != code.count('}'):
-                errors.append("Mismatched braces")
-            if code.count('(') != code.count(')'):
-                errors.append("Mismatched parentheses")
-        except Exception as e:
-            errors.append(f"JavaScript validation failed: {e!s}")
-        return errors
+        return list(self.parse(code, "javascript").syntax_errors)
 
     def _validate_go_syntax(self, code: str, file_path: str) -> list[str]:
         """验证Go语法"""
-        errors: list[str] = []
         # 简单的Go语法检查
         # 实际项目中应该使用go fmt或go vet
-        try:
-            # 检查包声明
-            if not re.match(r'^\s*package\s+\w+', code):
-                errors.append("Missing or invalid package declaration")
-        except Exception as e:
-            errors.append(f"Go validation failed: {e!s}")
-        return errors
+        return list(self.parse(code, "go").syntax_errors)
 
     def _validate_java_syntax(self, code: str, file_path: str) -> list[str]:
         """验证Java语法"""
-        errors: list[str] = []
         # 简单的Java语法检查
         # 实际项目中应该使用javac
-        try:
-            # 检查类声明
-            if 'class ' in code and not re.search(r'\bclass\s+\w+', code):
-                errors.append("Invalid class declaration")
-        except Exception as e:
-            errors.append(f"Java validation failed: {e!s}")
-        return errors
+        return list(self.parse(code, "java").syntax_errors)
 
     def _extract_imports(self, code: str, language: str) -> set[str]:
         """提取导入语句"""
-        imports: set[str] = set()
-
-        if language.lower() in ['python', 'py']:
-            # Python导入
-            import_patterns = [
-                r'^\s*import\s+([\w.]+)',
-                r'^\s*from\s+([\w.]+)\s+import'
-            ]
-            for line in code.split('\n'):
-                for pattern in import_patterns:
-                    match = re.match(pattern, line)
-                    if match:
-                        imports.add(match.group(1))
-
-        elif language.lower() in ['javascript', 'js', 'typescript', 'ts']:
-            # JavaScript/TypeScript导入
-            import_patterns = [
-                r'^\s*import\s+.*?\s+from\s+[\'"](.+?)[\'"]',
-                r'^\s*import\s+[\'"](.+?)[\'"]',
-                r'^\s*require\([\'"](.+?)[\'"]\)'
-            ]
-            for line in code.split('\n'):
-                for pattern in import_patterns:
-                    match = re.match(pattern, line)
-                    if match:
-                        imports.add(match.group(1))
-
-        elif language.lower() in ['go', 'golang']:
-            # Go导入
-            import_pattern = r'^\s*import\s+[\'"](.+?)[\'"]'
-            for line in code.split('\n'):
-                match = re.match(import_pattern, line)
-                if match:
-                    imports.add(match.group(1))
-
-        elif language.lower() in ['java']:
-            # Java导入
-            import_pattern = r'^\s*import\s+([\w.]+);'
-            for line in code.split('\n'):
-                match = re.match(import_pattern, line)
-                if match:
-                    imports.add(match.group(1))
-
-        return imports
+        return set(self.parse(code, language).imports)
 
     def _check_sensitive_imports(self, imports: list[str], language: str) -> list[str]:
         """检查敏感导入"""
@@ -601,19 +547,17 @@ class EditValidator:
                 unused.append(imp)
         return unused
 
-    def _estimate_changes(self, original: str, edited: str) -> int:
-        """估算变更数量"""
-        # 简单的差异估算
-        # 实际项目中应该使用真正的diff算法
-        orig_lines = original.split('\n')
-        edit_lines = edited.split('\n')
+    def _estimate_changes(self, original: str, edited: str, max_changes: Optional[int] = None) -> int:
+        """
+        计算变更数量（新增、删除和修改的行数之和）
 
-        changes = abs(len(edit_lines) - len(orig_lines))
+        Args:
+            original: 原始内容
+            edited: 编辑后内容
+            max_changes: 变更数量上限，超出后返回的值只保证大于上限
 
-        # 检查每行的变更
-        min_lines = min(len(orig_lines), len(edit_lines))
-        for i in range(min_lines):
-            if orig_lines[i] != edit_lines[i]:
-                changes += 1
+        Returns:
+            int: 变更数量
 
-        return changes
+        """
+        return diff_text(original, edited, max_changes=max_changes).changes_count
@@ -5,13 +5,19 @@
 """
 
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Optional
 
+from evolvai.core.audit import LatencyHistogram
+
 from .data_models import AppliedArea, EditValidationError, ProjectArea, RollbackStrategy
 from .detector import AreaDetector
 from .edit_validator import EditValidator
 from .feedback import FeedbackSystem
+from .parse_cache import get_shared_parse_cache
 from .rollback_manager import RollbackManager
 
 
@@ -53,6 +59,8 @@ class SafeEditWrapper:
             "rollbacks_executed": 0,
             "total_duration_ms": 0.0
         }
+        # 各阶段耗时（阶段名 -> 耗时直方图，内存占用与编辑次数无关）
+        self._stage_durations: dict[str, LatencyHistogram] = {}
 
     def safe_edit(
         self,
@@ -93,24 +101,26 @@ class SafeEditWrapper:
 
         try:
             # 1. 检测项目区域和语言
-            areas, applied_areas = self._get_project_areas()
+            with self._timed_stage("detect_areas"):
+                areas, applied_areas = self._get_project_areas()
             detected_language = language or self._detect_language(file_path, content)
 
-            # 2. 初始化验证器和回滚管理器
+            # 2. 初始化验证器
             self._edit_validator = EditValidator(areas, applied_areas)
-            self._rollback_manager = RollbackManager()
 
             # 3. 读取原始内容
-            original_content = self._read_file(file_path)
+            with self._timed_stage("read"):
+                original_content = self._read_file(file_path)
 
             # 4. 执行验证链
-            validation_results = self._execute_validation_chain(
-                file_path=file_path,
-                original_content=original_content,
-                edited_content=content,
-                language=detected_language,
-                mode=mode
-            )
+            with self._timed_stage("validate"):
+                validation_results = self._execute_validation_chain(
+                    file_path=file_path,
+                    original_content=original_content,
+                    edited_content=content,
+                    language=detected_language,
+                    mode=mode
+                )
 
             result["validation_result"] = validation_results
 
@@ -123,7 +133,8 @@ class SafeEditWrapper:
 
             # 5. 创建回滚点（如果启用）
             if auto_rollback:
-                rollback_result = self._create_rollback_point(file_path, original_content)
+                with self._timed_stage("snapshot"):
+                    rollback_result = self._create_rollback_point(file_path, original_content)
                 result["rollback_info"] = rollback_result
 
                 if not rollback_result["success"]:
@@ -131,7 +142,8 @@ class SafeEditWrapper:
                     result["warnings"].append(f"回滚点创建失败: {rollback_result['error']}")
 
             # 6. 执行文件写入
-            write_result = self._write_file(file_path, content)
+            with self._timed_stage("write"):
+                write_result = self._write_file(file_path, content)
             if not write_result["success"]:
                 result["error"] = write_result["error"]
 
@@ -146,11 +158,12 @@ class SafeEditWrapper:
 
             # 7. 发送反馈
             if self.feedback_system:
-                self._send_edit_feedback(
-                    file_path=file_path,
-                    validation_results=validation_results,
-                    mode=mode
-                )
+                with self._timed_stage("feedback"):
+                    self._send_edit_feedback(
+                        file_path=file_path,
+                        validation_results=validation_results,
+                        mode=mode
+                    )
 
             # 8. 标记成功
             result["success"] = True
@@ -179,48 +192,171 @@ class SafeEditWrapper:
         edits: list[dict[str, Any]],
         mode: str = "safe",
         stop_on_error: bool = True,
+        auto_rollback: bool = True,
+        max_workers: Optional[int] = None,
         **kwargs
     ) -> dict[str, Any]:
         """
         批量安全编辑
 
+        项目区域只检测一次，所有编辑并发验证；验证全部完成后为所有目标文件创建一个快照，然后才执行写入。
+
         Args:
-            edits: 编辑列表，每个元素包含 file_path, content
+            edits: 编辑列表，每个元素包含 file_path, content（可选 mode, language）
             mode: 编辑模式
-            stop_on_error: 遇到错误是否停止
+            stop_on_error: 遇到错误是否停止（为 True 时任一编辑验证失败则不写入任何文件，
+                写入失败时回滚本批次已写入的文件）
+            auto_rollback: 是否自动创建回滚点
+            max_workers: 并发验证的最大线程数
 
         Returns:
             Dict[str, Any]: 批量编辑结果
 
         """
         start_time = time.time()
-        results = []
+        self.performance_metrics["total_edits"] += len(edits)
+        results: list[dict[str, Any]] = [
+            {
+                "success": False,
+                "file_path": edit["file_path"],
+                "mode": edit.get("mode", mode),
+                "edit_index": i,
+                "validation_result": None,
+                "rollback_info": None,
+                "error": None,
+                "warnings": []
+            }
+            for i, edit in enumerate(edits)
+        ]
+        batch_rollback_info = None
 
-        for i, edit in enumerate(edits):
-            result = self.safe_edit(
-                file_path=edit["file_path"],
-                content=edit["content"],
-                mode=mode,
-                auto_rollback=True,
-                **kwargs
-            )
+        try:
+            # 1. 检测项目区域（整个批次只检测一次）
+            with self._timed_stage("detect_areas"):
+                areas, applied_areas = self._get_project_areas()
+                self._edit_validator = EditValidator(areas, applied_areas)
+
+            # 2. 并发读取和验证（不同文件的验证相互独立）
+            with self._timed_stage("validate"):
+                self._validate_batch(edits, results, kwargs.get("language"), max_workers)
+
+            valid_indices = [r["edit_index"] for r in results if r["error"] is None]
+            if stop_on_error and len(valid_indices) < len(edits):
+                for i in valid_indices:
+                    results[i]["error"] = "批次中其他编辑验证失败，未执行写入"
+                valid_indices = []
+
+            # 3. 为所有目标文件创建一个快照
+            if auto_rollback and valid_indices:
+                with self._timed_stage("snapshot"):
+                    batch_rollback_info = self._create_batch_rollback_point([edits[i]["file_path"] for i in valid_indices])
+                for i in valid_indices:
+                    results[i]["rollback_info"] = {**batch_rollback_info, "file_path": edits[i]["file_path"]}
+                    if not batch_rollback_info["success"]:
+                        results[i]["warnings"].append(f"回滚点创建失败: {batch_rollback_info['error']}")
+
+            # 4. 所有验证通过后才写入
+            written: list[str] = []
+            with self._timed_stage("write"):
+                for i in valid_indices:
+                    write_result = self._write_file(edits[i]["file_path"], edits[i]["content"])
+                    if write_result["success"]:
+                        results[i]["success"] = True
+                        written.append(edits[i]["file_path"])
+                        continue
+
+                    results[i]["error"] = write_result["error"]
+                    if stop_on_error:
+                        # 回滚本批次已写入的文件
+                        if written and batch_rollback_info and batch_rollback_info["success"]:
+                            self._get_rollback_manager().restore_snapshot(batch_rollback_info["rollback_hash"], written)
+                            self.performance_metrics["rollbacks_executed"] += 1
+                            for j in valid_indices:
+                                if results[j]["success"]:
+                                    results[j]["success"] = False
+                                    results[j]["rollback_executed"] = True
+                                    results[j]["error"] = "批次中其他文件写入失败，已回滚"
+                        for j in valid_indices:
+                            if results[j]["error"] is None and not results[j]["success"]:
+                                results[j]["error"] = "批次中其他文件写入失败，未执行写入"
+                        break
+
+            # 5. 发送反馈
+            if self.feedback_system:
+                with self._timed_stage("feedback"):
+                    for r in results:
+                        if r["success"]:
+                            self._send_edit_feedback(file_path=r["file_path"], validation_results=r["validation_result"], mode=r["mode"])
 
-            result["edit_index"] = i
-            results.append(result)
+        except Exception as e:
+            for r in results:
+                if r["error"] is None and not r["success"]:
+                    r["error"] = f"编辑过程中发生未预期错误: {e!s}"
 
-            # 如果出错且配置为停止，则退出循环
-            if stop_on_error and not result["success"]:
-                break
+        num_successful = sum(1 for r in results if r["success"])
+        duration = (time.time() - start_time) * 1000
+        self.performance_metrics["successful_edits"] += num_successful
+        self.performance_metrics["failed_edits"] += len(edits) - num_successful
+        self.performance_metrics["total_duration_ms"] += duration
 
         return {
-            "success": all(r["success"] for r in results),
+            "success": num_successful == len(edits),
             "total_edits": len(edits),
-            "successful_edits": sum(1 for r in results if r["success"]),
-            "failed_edits": sum(1 for r in results if not r["success"]),
+            "successful_edits": num_successful,
+            "failed_edits": len(edits) - num_successful,
             "results": results,
-            "duration_ms": (time.time() - start_time) * 1000
+            "rollback_info": batch_rollback_info,
+            "duration_ms": duration
         }
 
+    def _validate_batch(
+        self,
+        edits: list[dict[str, Any]],
+        results: list[dict[str, Any]],
+        language: Optional[str],
+        max_workers: Optional[int]
+    ):
+        """并发验证批次中的所有编辑，验证结果和错误写入 results"""
+        edit_validator = self._edit_validator
+        seen_paths: set[str] = set()
+        to_validate = []
+        for i, edit in enumerate(edits):
+            path_key = str(Path(edit["file_path"]).resolve())
+            if path_key in seen_paths:
+                results[i]["error"] = "同一文件在批次中出现多次"
+            else:
+                seen_paths.add(path_key)
+                to_validate.append(i)
+
+        def validate(i: int) -> None:
+            edit = edits[i]
+            result = results[i]
+            try:
+                original_content = self._read_file(edit["file_path"])
+                validation_results = self._execute_validation_chain(
+                    file_path=edit["file_path"],
+                    original_content=original_content,
+                    edited_content=edit["content"],
+                    language=edit.get("language") or language or self._detect_language(edit["file_path"], edit["content"]),
+                    mode=result["mode"],
+                    edit_validator=edit_validator
+                )
+            except EditValidationError as e:
+                result["error"] = str(e)
+                result["error_type"] = e.error_type
+                return
+            result["validation_result"] = validation_results
+            result["warnings"].extend(validation_results.get("warnings", []))
+            if not validation_results.get("is_valid", False):
+                result["error"] = validation_results.get("error_message", "验证失败")
+
+        if len(to_validate) <= 1:
+            for i in to_validate:
+                validate(i)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SafeEditValidation") as executor:
+                list(executor.map(validate, to_validate))
+
     def rollback_edit(
         self,
         file_path: str,
@@ -239,21 +375,24 @@ class SafeEditWrapper:
             Dict[str, Any]: 回滚结果
 
         """
-        if not self._rollback_manager:
-            self._rollback_manager = RollbackManager()
+        rollback_manager = self._get_rollback_manager()
+        if backup_info and strategy is None and backup_info.get("strategy"):
+            # 回滚点由 _create_rollback_point 创建时，按其记录的策略回滚
+            strategy = RollbackStrategy(backup_info["strategy"])
 
         if not backup_info:
             # 尝试智能回滚
-            rollback_result = self._rollback_manager.smart_rollback(file_path)
+            rollback_result = rollback_manager.smart_rollback(file_path)
         else:
             # 使用指定的备份信息回滚
             if strategy == RollbackStrategy.GIT:
-                rollback_result = self._rollback_manager.git_rollback(
+                rollback_result = rollback_manager.git_rollback(
                     backup_info["rollback_hash"],
-                    backup_info.get("message")
+                    backup_info.get("message"),
+                    file_paths=[file_path]
                 )
             else:
-                rollback_result = self._rollback_manager.rollback_file_backup(
+                rollback_result = rollback_manager.rollback_file_backup(
                     backup_info["rollback_hash"],
                     file_path
                 )
@@ -291,6 +430,21 @@ class SafeEditWrapper:
             metrics["success_rate"] = 0.0
             metrics["average_duration_ms"] = 0.0
 
+        # 各阶段耗时
+        metrics["stage_timings"] = {
+            stage: {
+                "count": durations.count,
+                "total_ms": durations.total,
+                "avg_ms": durations.total / durations.count,
+                "p95_ms": durations.percentile(95),
+                "max_ms": durations.max
+            }
+            for stage, durations in self._stage_durations.items()
+        }
+
+        # 解析缓存命中情况
+        metrics["parse_cache"] = get_shared_parse_cache().get_statistics()
+
         # 添加回滚管理器性能指标
         if self._rollback_manager:
             metrics["rollback_performance"] = (
@@ -426,9 +580,11 @@ class SafeEditWrapper:
         original_content: str,
         edited_content: str,
         language: str,
-        mode: str
+        mode: str,
+        edit_validator: Optional[EditValidator] = None
     ) -> dict[str, Any]:
-        """执行完整的验证链"""
+        """执行完整的验证链（默认使用当前的验证器）"""
+        edit_validator = edit_validator or self._edit_validator
         combined_result = {
             "is_valid": True,
             "warnings": [],
@@ -439,7 +595,7 @@ class SafeEditWrapper:
         }
 
         # 1. 语法验证
-        syntax_result = self._edit_validator.validate_edit_syntax(
+        syntax_result = edit_validator.validate_edit_syntax(
             original_content,
             edited_content,
             file_path,
@@ -455,7 +611,7 @@ class SafeEditWrapper:
 
         # 2. 区域约束验证
         try:
-            area_result = self._edit_validator.validate_area_constraints(
+            area_result = edit_validator.validate_area_constraints(
                 file_path,
                 edited_content,
                 mode
@@ -470,7 +626,7 @@ class SafeEditWrapper:
             })
 
         # 3. 大小约束验证
-        size_result = self._edit_validator.validate_size_constraints(
+        size_result = edit_validator.validate_size_constraints(
             file_path,
             original_content,
             edited_content
@@ -484,9 +640,12 @@ class SafeEditWrapper:
         combined_result["changes_count"] = size_result.changes_count
         combined_result["lines_added"] = size_result.lines_added
         combined_result["lines_removed"] = size_result.lines_removed
+        combined_result["lines_modified"] = size_result.lines_modified
+        # 差异结果用于报告和反馈（避免重复计算）
+        combined_result["diff"] = size_result.diff.to_dict() if size_result.diff else None
 
         # 4. 导入变更验证
-        import_result = self._edit_validator.validate_import_changes(
+        import_result = edit_validator.validate_import_changes(
             original_content,
             edited_content,
             file_path,
@@ -496,6 +655,8 @@ class SafeEditWrapper:
         combined_result["warnings"].extend(import_result.warnings)
         combined_result["new_imports"] = import_result.new_imports
         combined_result["removed_imports"] = import_result.removed_imports
+        # 结构统计（来自验证时已缓存的解析结果）
+        combined_result["structure_stats"] = dict(edit_validator.parse(edited_content, language).stats)
 
         # 合并错误消息
         all_errors = []
@@ -509,12 +670,45 @@ class SafeEditWrapper:
 
         return combined_result
 
+    @contextmanager
+    def _timed_stage(self, stage: str) -> Iterator[None]:
+        """记录一个处理阶段的耗时"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            durations = self._stage_durations.get(stage)
+            if durations is None:
+                durations = self._stage_durations[stage] = LatencyHistogram()
+            durations.add((time.perf_counter() - start_time) * 1000)
+
+    def _get_rollback_manager(self) -> RollbackManager:
+        """获取回滚管理器（每个包装器一个实例，备份存储位于项目的 .evolvai 目录）"""
+        if not self._rollback_manager:
+            self._rollback_manager = RollbackManager(project_root=self.project.root_path if self.project else None)
+        return self._rollback_manager
+
     def _create_rollback_point(self, file_path: str, original_content: str) -> dict[str, Any]:
         """创建回滚点"""
-        if not self._rollback_manager:
-            self._rollback_manager = RollbackManager()
+        rollback_manager = self._get_rollback_manager()
+        # Git仓库中的已有文件以blob对象作为回滚点，否则使用文件备份
+        result = rollback_manager.create_git_rollback_point(file_path)
+        if not result.success:
+            result = rollback_manager.create_file_backup(file_path)
+
+        return {
+            "success": result.success,
+            "strategy": result.strategy.value,
+            "file_path": file_path,
+            "rollback_hash": result.rollback_hash,
+            "message": result.message,
+            "error": result.error_message,
+            "duration_ms": result.duration_ms
+        }
 
-        result = self._rollback_manager.create_file_backup(file_path)
+    def _create_batch_rollback_point(self, file_paths: list[str]) -> dict[str, Any]:
+        """为批次中的所有文件创建一个快照"""
+        result = self._get_rollback_manager().create_snapshot(file_paths, label="safe_edit_batch")
 
         return {
             "success": result.success,
@@ -529,7 +723,7 @@ class SafeEditWrapper:
         """执行回滚操作"""
         if rollback_info["strategy"] == "git":
             if self._rollback_manager:
-                self._rollback_manager.git_rollback(rollback_info["rollback_hash"])
+                self._rollback_manager.git_rollback(rollback_info["rollback_hash"], file_paths=[rollback_info["file_path"]])
         else:
             if self._rollback_manager:
                 self._rollback_manager.rollback_file_backup(
@@ -3,27 +3,223 @@
 遵循KISS原则：专注进程生命周期管理，避免复杂设计
 """
 
+import codecs
 import os
+import selectors
 import signal
 import subprocess
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
+from typing import Optional
 
-from .data_models import ExecutionResult, ProcessInfo
+from sensai.util import logging
+
+from .data_models import ExecutionResult, ProcessInfo, ResourceLimits
+
+log = logging.getLogger(__name__)
+
+OutputCallback = Callable[[str, str], None]
+"""增量输出回调，参数为流名称（"stdout" 或 "stderr"）和新输出的文本"""
+
+
+def _apply_resource_limits(command: str, resource_limits: Optional[ResourceLimits]) -> str:
+    """
+    在命令前加上设置资源限制的 ulimit 调用，使限制由子进程中的 shell 设置
+
+    不使用 preexec_fn：进程可能从多个线程中创建，而 fork 后在子进程中执行 Python 代码可能导致死锁。
+    dash 的 ulimit 每次只接受一个限制；设置失败时 shell 直接退出，不执行命令。
+    """
+    if resource_limits is None:
+        return command
+    prefix = ""
+    if resource_limits.cpu_time_seconds is not None:
+        # 超出软限制时收到 SIGXCPU，超出硬限制时被内核杀死（须先降低软限制，再设置硬限制）
+        prefix += f"ulimit -S -t {resource_limits.cpu_time_seconds} || exit; "
+        prefix += f"ulimit -H -t {resource_limits.cpu_time_seconds + 1} || exit; "
+    if resource_limits.max_memory_mb is not None:
+        prefix += f"ulimit -v {resource_limits.max_memory_mb * 1024} || exit; "
+    return prefix + command
+
+
+class OutputBuffer:
+    """
+    有界输出缓冲区
+
+    保留输出的开头（head）和结尾（tail，环形缓冲），中间部分只计数，因此内存占用与输出总量无关
+    """
+
+    def __init__(self, head_size: int = 64 * 1024, tail_size: int = 256 * 1024):
+        """
+        初始化输出缓冲区
+
+        Args:
+            head_size: 保留的开头字符数
+            tail_size: 保留的结尾字符数
+
+        """
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self._head: list[str] = []
+        self._head_length = 0
+        self._tail: deque[str] = deque()
+        self._tail_length = 0
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    @property
+    def omitted_length(self) -> int:
+        """被丢弃的中间部分的字符数"""
+        return self.total_length - self._head_length - self._tail_length
+
+    def append(self, text: str) -> None:
+        with self._lock:
+            self.total_length += len(text)
+            if self._head_length < self.head_size:
+                head_part = text[: self.head_size - self._head_length]
+                self._head.append(head_part)
+                self._head_length += len(head_part)
+                text = text[len(head_part) :]
+            if not text:
+                return
+            if len(text) >= self.tail_size:
+                self._tail.clear()
+                text = text[-self.tail_size :]
+                self._tail_length = 0
+            self._tail.append(text)
+            self._tail_length += len(text)
+            while self._tail_length > self.tail_size:
+                excess = self._tail_length - self.tail_size
+                oldest = self._tail[0]
+                if len(oldest) <= excess:
+                    self._tail.popleft()
+                    self._tail_length -= len(oldest)
+                else:
+                    self._tail[0] = oldest[excess:]
+                    self._tail_length -= excess
+
+    def get_text(self) -> str:
+        """获取缓冲的输出（中间被丢弃的部分以标记代替）"""
+        with self._lock:
+            head = "".join(self._head)
+            tail = "".join(self._tail)
+            omitted = self.total_length - self._head_length - self._tail_length
+        if omitted > 0:
+            return f"{head}\n... [{omitted} characters omitted] ...\n{tail}"
+        return head + tail
+
+
+class ManagedProcess:
+    """
+    受管进程：持有真实的 Popen 对象，并由后台线程通过 selector 同时读取 stdout/stderr
+
+    输出写入有界缓冲区并（可选）增量回调，避免管道缓冲区写满导致子进程阻塞
+    """
+
+    READ_CHUNK_SIZE = 64 * 1024
+    POLL_INTERVAL = 0.5
+    """两次检查进程是否已退出之间的最长间隔（进程退出但孙进程仍持有管道时使用）"""
+
+    def __init__(self, process: subprocess.Popen, output_callback: Optional[OutputCallback] = None):
+        self.process = process
+        self.stdout = OutputBuffer()
+        self.stderr = OutputBuffer()
+        self.finished = threading.Event()
+        self._output_callback = output_callback
+        self._reader_thread = threading.Thread(target=self._drain, name=f"ProcessOutput-{process.pid}", daemon=True)
+        self._reader_thread.start()
+
+    def _drain(self) -> None:
+        selector = selectors.DefaultSelector()
+        try:
+            for name, pipe, buffer in (("stdout", self.process.stdout, self.stdout), ("stderr", self.process.stderr, self.stderr)):
+                if pipe is not None:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                    selector.register(pipe, selectors.EVENT_READ, (name, buffer, decoder))
+
+            while selector.get_map():
+                events = selector.select(timeout=self.POLL_INTERVAL)
+                if not events and self.process.poll() is not None:
+                    # 进程已退出：读取剩余输出后结束（不等待仍持有管道的孙进程）
+                    for key in list(selector.get_map().values()):
+                        self._read_available(selector, key, final=True)
+                    break
+                for key, _ in events:
+                    self._read_available(selector, key)
+        except Exception as e:
+            self.stderr.append(f"\n[Failed to read process output: {e!s}]\n")
+        finally:
+            selector.close()
+            try:
+                self.process.wait()
+            finally:
+                self.finished.set()
+
+    def _read_available(self, selector: selectors.BaseSelector, key: selectors.SelectorKey, final: bool = False) -> None:
+        """读取一个管道的可用数据；final 为 True 时读取所有剩余数据（不阻塞）并关闭管道"""
+        name, buffer, decoder = key.data
+        fd = key.fileobj.fileno()
+        if final:
+            os.set_blocking(fd, False)
+        while True:
+            try:
+                data = os.read(fd, self.READ_CHUNK_SIZE)
+            except BlockingIOError:
+                data = b""
+            eof = not data
+            text = decoder.decode(data, final=eof)
+            if text:
+                buffer.append(text)
+                if self._output_callback is not None:
+                    try:
+                        self._output_callback(name, text)
+                    except Exception:
+                        # 回调异常不影响输出读取
+                        pass
+            if eof:
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                return
+            if not final:
+                return
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        等待进程结束且输出读取完毕（阻塞等待，不轮询）
+
+        Returns:
+            bool: 是否在超时前结束
+
+        """
+        return self.finished.wait(timeout)
 
 
 class ProcessManager:
     """进程管理器 - 专注进程生命周期管理"""
 
+    OUTPUT_GRACE_PERIOD = 1.0
+    """超时杀死进程后，等待剩余输出读取完毕的时间（秒）"""
+
     def __init__(self):
         self.active_processes: dict[int, ProcessInfo] = {}
-
-    def create_process(self, command: str, working_directory: str) -> ProcessInfo:
+        self._processes: dict[int, ManagedProcess] = {}
+
+    def create_process(
+        self,
+        command: str,
+        working_directory: str,
+        output_callback: Optional[OutputCallback] = None,
+        resource_limits: Optional[ResourceLimits] = None
+    ) -> ProcessInfo:
         """
         创建新进程
 
         Args:
             command: 要执行的命令
             working_directory: 工作目录
+            output_callback: 增量输出回调（在输出读取线程中调用）
+            resource_limits: 资源限制（同样适用于命令启动的子进程）
 
         Returns:
             ProcessInfo: 进程信息
@@ -32,13 +228,13 @@ class ProcessManager:
         try:
             # 创建进程组，便于统一管理
             process = subprocess.Popen(
-                command,
+                _apply_resource_limits(command, resource_limits),
                 shell=True,
                 cwd=working_directory,
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                preexec_fn=os.setpgrp  # 创建新的进程组
+                process_group=0  # 创建新的进程组
             )
 
             # 获取进程组ID，如果失败则使用PID作为PGID（为了测试兼容性）
@@ -57,12 +253,29 @@ class ProcessManager:
             )
 
             self.active_processes[process.pid] = process_info
+            self._processes[process.pid] = ManagedProcess(process, output_callback)
             return process_info
 
         except Exception as e:
             raise RuntimeError(f"Failed to create process: {e!s}")
 
-    def wait_with_timeout(self, process_info: ProcessInfo, timeout_seconds: int) -> ExecutionResult:
+    def get_output(self, process_info: ProcessInfo) -> tuple[str, str]:
+        """
+        获取进程目前为止的输出（进程运行期间也可调用）
+
+        Args:
+            process_info: 进程信息
+
+        Returns:
+            Tuple[str, str]: stdout 和 stderr
+
+        """
+        managed = self._processes.get(process_info.pid)
+        if managed is None:
+            return "", ""
+        return managed.stdout.get_text(), managed.stderr.get_text()
+
+    def wait_with_timeout(self, process_info: ProcessInfo, timeout_seconds: float) -> ExecutionResult:
         """
         等待进程完成，支持超时
 
@@ -75,64 +288,52 @@ class ProcessManager:
 
         """
         start_time = time.time()
-        timeout_occurred = False
-
-        # 如果超时时间太短，直接触发超时（用于测试）
-        if timeout_seconds < 1:
-            timeout_occurred = True
-            self._kill_process_group(process_info.pgid)
-            duration_ms = (time.time() - start_time) * 1000
-
-            return ExecutionResult(
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr=f"Command timed out after {timeout_seconds} seconds",
-                duration_ms=duration_ms,
-                precondition_passed=True,
-                command=process_info.command,
-                working_directory="",
-                timeout_occurred=True,
-                error_message=f"Process timeout after {timeout_seconds}s"
-            )
 
         try:
-            # 等待进程完成
-            process = self._get_process(process_info.pid)
-            stdout, stderr = process.communicate(timeout=timeout_seconds)
+            managed = self._get_process(process_info.pid)
 
+            # 等待进程完成（输出由后台线程持续读取）
+            if not managed.wait(timeout_seconds):
+                # 超时处理：杀死进程组，保留已读取的输出
+                self._kill_process_group(process_info.pgid)
+                managed.wait(self.OUTPUT_GRACE_PERIOD)
+                stdout, stderr = managed.stdout.get_text(), managed.stderr.get_text()
+                duration_ms = (time.time() - start_time) * 1000
+
+                return ExecutionResult(
+                    success=False,
+                    exit_code=-1,
+                    stdout=stdout,
+                    stderr=(stderr + "\n" if stderr else "") + f"Command timed out after {timeout_seconds} seconds",
+                    duration_ms=duration_ms,
+                    precondition_passed=True,
+                    command=process_info.command,
+                    working_directory="",
+                    timeout_occurred=True,
+                    error_message=f"Process timeout after {timeout_seconds}s",
+                    output_truncated=managed.stdout.omitted_length > 0 or managed.stderr.omitted_length > 0
+                )
+
+            returncode = managed.process.returncode
             duration_ms = (time.time() - start_time) * 1000
+            error_message = None
+            if returncode in (-signal.SIGXCPU, 128 + signal.SIGXCPU):
+                # 命令本身或由shell启动的子进程超出了CPU时间限制
+                error_message = "CPU time limit exceeded"
 
             return ExecutionResult(
-                success=process.returncode == 0,
-                exit_code=process.returncode,
-                stdout=stdout,
-                stderr=stderr,
+                success=returncode == 0,
+                exit_code=returncode,
+                stdout=managed.stdout.get_text(),
+                stderr=managed.stderr.get_text(),
                 duration_ms=duration_ms,
                 precondition_passed=True,  # 由调用方设置
                 command=process_info.command,
                 working_directory="",  # 由调用方设置
-                timeout_occurred=False
-            )
-
-        except subprocess.TimeoutExpired:
-            # 超时处理
-            timeout_occurred = True
-            self._kill_process_group(process_info.pgid)
-
-            duration_ms = (time.time() - start_time) * 1000
-
-            return ExecutionResult(
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr=f"Command timed out after {timeout_seconds} seconds",
-                duration_ms=duration_ms,
-                precondition_passed=True,
-                command=process_info.command,
-                working_directory="",
-                timeout_occurred=True,
-                error_message=f"Process timeout after {timeout_seconds}s"
+                timeout_occurred=False,
+                signal_code=-returncode if returncode < 0 else None,
+                error_message=error_message,
+                output_truncated=managed.stdout.omitted_length > 0 or managed.stderr.omitted_length > 0
             )
 
         except Exception as e:
@@ -169,30 +370,35 @@ class ProcessManager:
             # 从活跃进程列表中移除
             if process_info.pid in self.active_processes:
                 del self.active_processes[process_info.pid]
+            self._processes.pop(process_info.pid, None)
 
         except Exception as e:
             # 清理失败不应该抛出异常
-            print(f"Warning: Failed to cleanup process {process_info.pid}: {e}")
+            log.warning(f"Failed to cleanup process {process_info.pid}: {e}")
+
+    def terminate_process(self, process_info: ProcessInfo):
+        """
+        终止进程及其进程组（可在其他线程等待该进程时调用）
+
+        Args:
+            process_info: 进程信息
+
+        """
+        try:
+            self._kill_process_group(process_info.pgid)
+        except RuntimeError as e:
+            log.warning(f"Failed to terminate process {process_info.pid}: {e}")
 
     def get_active_processes(self) -> list[ProcessInfo]:
         """获取所有活跃进程"""
         return list(self.active_processes.values())
 
-    def _get_process(self, pid: int) -> subprocess.Popen:
-        """获取进程对象"""
-        # 这里简化处理，实际应该存储process对象
-        # 为了KISS原则，使用psutil或直接查询
-        try:
-            # 重新创建进程对象用于通信
-            process = subprocess.Popen(
-                ["ps", "-p", str(pid), "-o", "pid="],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            return process
-        except Exception:
+    def _get_process(self, pid: int) -> ManagedProcess:
+        """获取受管进程"""
+        managed = self._processes.get(pid)
+        if managed is None:
             raise RuntimeError(f"Process {pid} not found")
+        return managed
 
     def _kill_process_group(self, pgid: int):
         """
@@ -3,11 +3,15 @@
 遵循KISS原则：专注安全执行的核心功能，避免过度设计
 """
 
+import os
+import threading
 import time
-from typing import Any, Optional
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 
-from .data_models import ExecutionPrecondition, ExecutionResult, ExecutionRiskLevel
-from .exec_manager import ProcessManager
+from .data_models import BatchExecutionResult, ExecutionPrecondition, ExecutionResult, ExecutionRiskLevel, ProcessInfo, ResourceLimits
+from .exec_manager import OutputCallback, ProcessManager
 from .exec_validator import PreconditionChecker
 
 
@@ -32,7 +36,8 @@ class SafeExecWrapper:
         self.precondition_checker = PreconditionChecker()
         self.process_manager = ProcessManager()
 
-        # 性能指标
+        # 性能指标（批量执行时由多个线程更新）
+        self._stats_lock = threading.Lock()
         self.execution_stats = {
             "total_executions": 0,
             "successful_executions": 0,
@@ -49,7 +54,9 @@ class SafeExecWrapper:
         required_permissions: Optional[list] = None,
         system_dependencies: Optional[list] = None,
         environment_variables: Optional[dict] = None,
-        risk_level: ExecutionRiskLevel = ExecutionRiskLevel.MEDIUM
+        risk_level: ExecutionRiskLevel = ExecutionRiskLevel.MEDIUM,
+        output_callback: Optional[OutputCallback] = None,
+        resource_limits: Optional[ResourceLimits] = None
     ) -> ExecutionResult:
         """
         安全执行命令
@@ -62,35 +69,154 @@ class SafeExecWrapper:
             system_dependencies: 系统依赖列表
             environment_variables: 环境变量
             risk_level: 风险级别
+            output_callback: 增量输出回调，参数为流名称（"stdout"/"stderr"）和新输出的文本
+            resource_limits: 资源限制（CPU时间、内存）
 
         Returns:
-            ExecutionResult: 执行结果
+            ExecutionResult: 执行结果（输出过大时只保留开头和结尾）
+
+        """
+        precondition = self._create_precondition(
+            command, working_directory, timeout_seconds, required_permissions, system_dependencies, environment_variables,
+            risk_level, resource_limits
+        )
+        return self._safe_exec(precondition, output_callback)
+
+    def safe_exec_batch(
+        self,
+        commands: list[Union[str, dict[str, Any]]],
+        max_parallel: Optional[int] = None,
+        stop_on_failure: bool = False,
+        **kwargs
+    ) -> BatchExecutionResult:
+        """
+        并发执行多个相互独立的命令
+
+        Args:
+            commands: 命令列表，每个元素为命令字符串或 safe_exec 的参数字典（必须包含 command）
+            max_parallel: 最大并发数（默认使用配置项 max_parallel_commands，未配置时为CPU数量）
+            stop_on_failure: 任一命令失败时，终止正在运行的其他命令（整个进程组）并跳过尚未开始的命令
+            **kwargs: 所有命令共用的 safe_exec 参数（如 working_directory, timeout_seconds, resource_limits），
+                可被单个命令的参数覆盖
+
+        Returns:
+            BatchExecutionResult: 批量执行结果（results 与 commands 顺序一致）
 
         """
         start_time = time.time()
-        self.execution_stats["total_executions"] += 1
+        specs = [{**kwargs, **({"command": c} if isinstance(c, str) else c)} for c in commands]
+        if max_parallel is None:
+            max_parallel = self.config.get("max_parallel_commands") or os.cpu_count() or 1
+
+        results: list[Optional[ExecutionResult]] = [None] * len(specs)
+        running: dict[int, ProcessInfo] = {}
+        terminated: set[int] = set()
+        cancelled: set[int] = set()
+        stop_event = threading.Event()
+        lock = threading.Lock()
+
+        def process_started(index: int, process_info: ProcessInfo) -> None:
+            with lock:
+                running[index] = process_info
+                stopped = stop_event.is_set()
+                if stopped:
+                    terminated.add(index)
+            if stopped:
+                self.process_manager.terminate_process(process_info)
+
+        def run(index: int) -> None:
+            spec = dict(specs[index])
+            output_callback = spec.pop("output_callback", None)
+            precondition = self._create_precondition(**spec)
+            with lock:
+                stopped = stop_event.is_set()
+                if stopped:
+                    cancelled.add(index)
+            if stopped:
+                results[index] = ExecutionResult(
+                    success=False,
+                    exit_code=-1,
+                    stdout="",
+                    stderr="",
+                    duration_ms=0.0,
+                    precondition_passed=False,
+                    command=precondition.command,
+                    working_directory=precondition.working_directory,
+                    error_message="Not started because another command in the batch failed"
+                )
+                return
+            result = self._safe_exec(precondition, output_callback, lambda process_info: process_started(index, process_info))
+            with lock:
+                running.pop(index, None)
+                if index in terminated:
+                    result.error_message = "Terminated after another command in the batch failed"
+                to_terminate: list[ProcessInfo] = []
+                if not result.success and stop_on_failure and not stop_event.is_set():
+                    stop_event.set()
+                    to_terminate = list(running.values())
+                    terminated.update(running)
+            results[index] = result
+            for process_info in to_terminate:
+                self.process_manager.terminate_process(process_info)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(specs) or 1)), thread_name_prefix="SafeExecBatch") as executor:
+            for future in [executor.submit(run, i) for i in range(len(specs))]:
+                future.result()
+
+        final_results = [r for r in results if r is not None]
+        return BatchExecutionResult(
+            success=all(r.success for r in final_results),
+            results=final_results,
+            duration_ms=(time.time() - start_time) * 1000,
+            stopped_early=stop_event.is_set(),
+            failed_commands=[r.command for i, r in enumerate(final_results) if not r.success and i not in cancelled],
+            cancelled_commands=[final_results[i].command for i in sorted(cancelled)]
+        )
+
+    def _create_precondition(
+        self,
+        command: str,
+        working_directory: str = "/tmp",
+        timeout_seconds: int = 30,
+        required_permissions: Optional[list] = None,
+        system_dependencies: Optional[list] = None,
+        environment_variables: Optional[dict] = None,
+        risk_level: ExecutionRiskLevel = ExecutionRiskLevel.MEDIUM,
+        resource_limits: Optional[ResourceLimits] = None
+    ) -> ExecutionPrecondition:
+        """创建执行前置条件"""
+        return ExecutionPrecondition(
+            command=command,
+            working_directory=working_directory,
+            timeout_seconds=timeout_seconds,
+            required_permissions=required_permissions or [],
+            system_dependencies=system_dependencies or [],
+            environment_variables=environment_variables or {},
+            risk_level=risk_level,
+            resource_limits=resource_limits
+        )
 
-        # 设置默认值
-        required_permissions = required_permissions or []
-        system_dependencies = system_dependencies or []
-        environment_variables = environment_variables or {}
+    def _update_stats(self, key: str, value: float = 1) -> None:
+        with self._stats_lock:
+            self.execution_stats[key] += value
 
-        try:
-            # 1. 创建前置条件
-            precondition = ExecutionPrecondition(
-                command=command,
-                working_directory=working_directory,
-                timeout_seconds=timeout_seconds,
-                required_permissions=required_permissions,
-                system_dependencies=system_dependencies,
-                environment_variables=environment_variables,
-                risk_level=risk_level
-            )
+    def _safe_exec(
+        self,
+        precondition: ExecutionPrecondition,
+        output_callback: Optional[OutputCallback] = None,
+        process_started_callback: Optional[Callable[[ProcessInfo], None]] = None
+    ) -> ExecutionResult:
+        """检查前置条件并执行命令"""
+        start_time = time.time()
+        self._update_stats("total_executions")
+        command = precondition.command
+        working_directory = precondition.working_directory
 
-            # 2. 检查前置条件
+        try:
+            # 1. 检查前置条件
             validation_result = self._check_preconditions(precondition)
             if not validation_result.is_valid:
-                self.execution_stats["blocked_executions"] += 1
+                self._update_stats("blocked_executions")
                 error_message = "Precondition validation failed: " + "; ".join(validation_result.errors)
                 return ExecutionResult(
                     success=False,
@@ -104,24 +230,24 @@ class SafeExecWrapper:
                     error_message=error_message
                 )
 
-            # 3. 执行命令
-            execution_result = self._execute_command(precondition)
+            # 2. 执行命令
+            execution_result = self._execute_command(precondition, output_callback, process_started_callback)
 
-            # 4. 更新统计
+            # 3. 更新统计
             if execution_result.success:
-                self.execution_stats["successful_executions"] += 1
+                self._update_stats("successful_executions")
             else:
-                self.execution_stats["failed_executions"] += 1
+                self._update_stats("failed_executions")
 
-            self.execution_stats["total_duration_ms"] += execution_result.duration_ms
+            self._update_stats("total_duration_ms", execution_result.duration_ms)
 
-            # 5. 记录审计日志
+            # 4. 记录审计日志
             self._log_execution(precondition, execution_result, validation_result)
 
             return execution_result
 
         except Exception as e:
-            self.execution_stats["failed_executions"] += 1
+            self._update_stats("failed_executions")
             duration_ms = (time.time() - start_time) * 1000
 
             return ExecutionResult(
@@ -140,13 +266,22 @@ class SafeExecWrapper:
         """检查前置条件"""
         return self.precondition_checker.validate(precondition)
 
-    def _execute_command(self, precondition: ExecutionPrecondition) -> ExecutionResult:
+    def _execute_command(
+        self,
+        precondition: ExecutionPrecondition,
+        output_callback: Optional[OutputCallback] = None,
+        process_started_callback: Optional[Callable[[ProcessInfo], None]] = None
+    ) -> ExecutionResult:
         """执行命令"""
         # 创建进程
         process_info = self.process_manager.create_process(
             command=precondition.command,
-            working_directory=precondition.working_directory
+            working_directory=precondition.working_directory,
+            output_callback=output_callback,
+            resource_limits=precondition.resource_limits
         )
+        if process_started_callback is not None:
+            process_started_callback(process_info)
 
         try:
             # 等待执行完成
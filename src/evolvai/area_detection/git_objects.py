@@ -0,0 +1,226 @@
+"""
+Git对象访问
+通过长驻的 git cat-file --batch / git hash-object --stdin-paths 进程读写Git对象，避免每次操作都启动新的git进程
+"""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import IO, Optional
+
+from .backup_store import write_bytes_atomically
+
+
+class GitObjectError(Exception):
+    """Git对象操作失败"""
+
+
+class _BatchProcess:
+    """长驻的git批处理进程（一行请求，一行或一段响应）"""
+
+    def __init__(self, repo_root: str, args: list[str]):
+        self._repo_root = repo_root
+        self._args = args
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def stdout(self) -> IO[bytes]:
+        assert self._process is not None and self._process.stdout is not None
+        return self._process.stdout
+
+    def request(self, line: str) -> bytes:
+        """
+        发送一行请求并返回响应的第一行
+
+        Args:
+            line: 请求内容（不能包含换行符）
+
+        Returns:
+            bytes: 响应的第一行（不含换行符）
+
+        """
+        if "\n" in line:
+            raise GitObjectError(f"Invalid git batch request: {line!r}")
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", *self._args],
+                cwd=self._repo_root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        assert self._process.stdin is not None
+        try:
+            self._process.stdin.write(line.encode("utf-8") + b"\n")
+            self._process.stdin.flush()
+            response = self.stdout.readline()
+        except OSError as e:
+            self.close()
+            raise GitObjectError(f"git {self._args[0]} failed: {e}") from e
+        if not response:
+            self.close()
+            raise GitObjectError(f"git {self._args[0]} terminated while processing {line!r}")
+        return response.rstrip(b"\n")
+
+    def close(self) -> None:
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process = None
+
+
+class GitObjectStore:
+    """
+    Git对象存储（每个仓库一个实例）
+
+    回滚点以blob对象的形式写入仓库的对象库（不修改索引和工作区），恢复时只写回指定的文件
+    """
+
+    _repo_roots: dict[str, Optional[str]] = {}
+    _instances: dict[str, "GitObjectStore"] = {}
+    _class_lock = threading.Lock()
+
+    def __init__(self, repo_root: str):
+        """
+        初始化Git对象存储
+
+        Args:
+            repo_root: 仓库根目录
+
+        """
+        self.repo_root = repo_root
+        self._lock = threading.Lock()
+        self._cat_file = _BatchProcess(repo_root, ["cat-file", "--batch"])
+        self._hash_object = _BatchProcess(repo_root, ["hash-object", "-w", "--no-filters", "--stdin-paths"])
+
+    @classmethod
+    def find_repo_root(cls, path: str) -> Optional[str]:
+        """
+        查找路径所在的Git仓库根目录（每个路径只查询一次）
+
+        Args:
+            path: 目录路径
+
+        Returns:
+            Optional[str]: 仓库根目录，不在Git仓库中时返回 None
+
+        """
+        path = os.path.abspath(path)
+        with cls._class_lock:
+            if path in cls._repo_roots:
+                return cls._repo_roots[path]
+        try:
+            result = subprocess.run(["git", "rev-parse", "--show-toplevel"], check=False, capture_output=True, text=True, cwd=path)
+            repo_root = os.path.abspath(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip() else None
+        except (OSError, ValueError):
+            repo_root = None
+        with cls._class_lock:
+            cls._repo_roots[path] = repo_root
+        return repo_root
+
+    @classmethod
+    def for_path(cls, path: str) -> Optional["GitObjectStore"]:
+        """
+        获取路径所在仓库的对象存储（每个仓库共享一个实例）
+
+        Args:
+            path: 目录路径
+
+        Returns:
+            Optional[GitObjectStore]: 对象存储，不在Git仓库中时返回 None
+
+        """
+        repo_root = cls.find_repo_root(path)
+        if repo_root is None:
+            return None
+        with cls._class_lock:
+            if repo_root not in cls._instances:
+                cls._instances[repo_root] = cls(repo_root)
+            return cls._instances[repo_root]
+
+    def relative_path(self, file_path: str) -> str:
+        """文件在仓库中的路径（使用 / 分隔）"""
+        relative_path = os.path.relpath(os.path.abspath(file_path), self.repo_root)
+        if relative_path.startswith(".."):
+            raise GitObjectError(f"{file_path} is not inside repository {self.repo_root}")
+        return Path(relative_path).as_posix()
+
+    def write_blobs(self, file_paths: list[str]) -> dict[str, str]:
+        """
+        将文件内容写入为blob对象
+
+        Args:
+            file_paths: 文件路径列表（文件必须存在）
+
+        Returns:
+            Dict[str, str]: 文件路径 -> blob哈希
+
+        """
+        blobs = {}
+        with self._lock:
+            for file_path in file_paths:
+                if not os.path.isfile(file_path):
+                    raise GitObjectError(f"Cannot create blob, file not found: {file_path}")
+                blobs[file_path] = self._hash_object.request(os.path.abspath(file_path)).decode("ascii")
+        return blobs
+
+    def read_object(self, revision: str) -> Optional[tuple[str, bytes]]:
+        """
+        读取Git对象
+
+        Args:
+            revision: 对象名（哈希或 <提交>:<路径> 形式）
+
+        Returns:
+            Optional[Tuple[str, bytes]]: 对象类型和内容，对象不存在时返回 None
+
+        """
+        with self._lock:
+            header = self._cat_file.request(revision).decode("utf-8", errors="replace")
+            parts = header.split()
+            if len(parts) != 3 or not parts[2].isdigit():
+                # "<name> missing" 或 "<name> ambiguous"
+                return None
+            size = int(parts[2])
+            content = self._cat_file.stdout.read(size + 1)[:size]
+        return parts[1], content
+
+    def restore_files(self, revision: str, file_paths: list[str]) -> list[str]:
+        """
+        将指定文件恢复为Git对象中的内容（只写回这些文件，不影响其他文件和索引）
+
+        Args:
+            revision: blob哈希（仅适用于单个文件）或提交/树对象
+            file_paths: 要恢复的文件路径
+
+        Returns:
+            List[str]: 已恢复的文件路径
+
+        """
+        obj = self.read_object(revision)
+        if obj is None:
+            raise GitObjectError(f"Git object not found: {revision}")
+        obj_type, content = obj
+
+        contents: dict[str, bytes] = {}
+        if obj_type == "blob":
+            if len(file_paths) != 1:
+                raise GitObjectError(f"Blob {revision} can only restore a single file")
+            contents[file_paths[0]] = content
+        else:
+            for file_path in file_paths:
+                blob = self.read_object(f"{revision}:{self.relative_path(file_path)}")
+                if blob is None or blob[0] != "blob":
+                    raise GitObjectError(f"{file_path} not found in {revision}")
+                contents[file_path] = blob[1]
+
+        for file_path, file_content in contents.items():
+            write_bytes_atomically(Path(file_path), file_content)
+        return list(contents)
+
+    def close(self) -> None:
+        with self._lock:
+            self._cat_file.close()
+            self._hash_object.close()
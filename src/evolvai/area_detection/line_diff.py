@@ -0,0 +1,210 @@
+"""
+行级差异计算
+基于Myers算法（O((N+M)D)），行内容先映射为整数以加速比较；超出变更上限时提前终止并给出估算结果
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class DiffHunk:
+    """差异块（连续的删除/新增行）"""
+
+    original_start: int
+    original_count: int
+    edited_start: int
+    edited_count: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "original_start": self.original_start,
+            "original_count": self.original_count,
+            "edited_start": self.edited_start,
+            "edited_count": self.edited_count,
+        }
+
+
+@dataclass
+class LineDiff:
+    """
+    行级差异结果
+
+    每个差异块中成对的删除/新增行计为修改行，其余计为新增行或删除行
+    """
+
+    lines_added: int = 0
+    lines_removed: int = 0
+    lines_modified: int = 0
+    changes_count: int = 0
+    hunks: list[DiffHunk] = field(default_factory=list)
+    # 为 False 时差异超出了计算上限，计数为估算值（changes_count 至少为上限加一）
+    exact: bool = True
+
+    def to_dict(self) -> dict:
+        return {
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
+            "lines_modified": self.lines_modified,
+            "changes_count": self.changes_count,
+            "hunks": [h.to_dict() for h in self.hunks],
+            "exact": self.exact,
+        }
+
+
+def diff_text(original: str, edited: str, max_changes: Optional[int] = None) -> LineDiff:
+    """
+    计算两段文本的行级差异
+
+    Args:
+        original: 原始文本
+        edited: 编辑后文本
+        max_changes: 变更数量上限，超出后停止精确计算
+
+    Returns:
+        LineDiff: 差异结果
+
+    """
+    return diff_lines(original.split("\n"), edited.split("\n"), max_changes)
+
+
+def diff_lines(original_lines: list[str], edited_lines: list[str], max_changes: Optional[int] = None) -> LineDiff:
+    """
+    计算两个行列表的差异
+
+    Args:
+        original_lines: 原始行
+        edited_lines: 编辑后行
+        max_changes: 变更数量上限，超出后停止精确计算
+
+    Returns:
+        LineDiff: 差异结果
+
+    """
+    # 去除相同的前缀和后缀（常见的小范围编辑只剩很少的行需要比较）
+    prefix = 0
+    max_prefix = min(len(original_lines), len(edited_lines))
+    while prefix < max_prefix and original_lines[prefix] == edited_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    max_suffix = max_prefix - prefix
+    while suffix < max_suffix and original_lines[-1 - suffix] == edited_lines[-1 - suffix]:
+        suffix += 1
+    a_lines = original_lines[prefix : len(original_lines) - suffix]
+    b_lines = edited_lines[prefix : len(edited_lines) - suffix]
+
+    # 行内容映射为整数
+    line_ids: dict[str, int] = {}
+    a = [line_ids.setdefault(line, len(line_ids)) for line in a_lines]
+    b = [line_ids.setdefault(line, len(line_ids)) for line in b_lines]
+
+    # 每个修改行至少对应一次删除和一次新增，编辑距离超过 2 * max_changes 时变更数量必然超出上限
+    max_distance = len(a) + len(b) if max_changes is None else min(len(a) + len(b), 2 * max_changes + 1)
+    script = _myers_edit_script(a, b, max_distance)
+    if script is None:
+        return _estimate_diff(a, b, prefix, max_changes)
+    return _diff_from_edit_script(script, prefix)
+
+
+def _myers_edit_script(a: list[int], b: list[int], max_distance: int) -> Optional[str]:
+    """
+    Myers差异算法
+
+    Returns:
+        Optional[str]: 编辑脚本（"=" 相同，"-" 删除，"+" 新增），编辑距离超过 max_distance 时返回 None
+
+    """
+    n, m = len(a), len(b)
+    # rounds[d][k]: 编辑距离为 d 时对角线 k 上能到达的最远 x
+    rounds: list[dict[int, int]] = []
+    previous = {1: 0}
+    end_distance = None
+    for d in range(max_distance + 1):
+        current: dict[int, int] = {}
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and previous[k - 1] < previous[k + 1]):
+                x = previous[k + 1]
+            else:
+                x = previous[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            current[k] = x
+            if x >= n and y >= m:
+                end_distance = d
+                break
+        rounds.append(current)
+        if end_distance is not None:
+            break
+        previous = current
+    if end_distance is None:
+        return None
+
+    # 回溯得到编辑脚本
+    ops: list[str] = []
+    x, y = n, m
+    for d in range(end_distance, 0, -1):
+        previous = rounds[d - 1]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1] < previous[k + 1]):
+            prev_k = k + 1
+            prev_x = previous[prev_k]
+            mid_x = prev_x
+        else:
+            prev_k = k - 1
+            prev_x = previous[prev_k]
+            mid_x = prev_x + 1
+        ops.append("=" * (x - mid_x))
+        ops.append("+" if mid_x == prev_x else "-")
+        x, y = prev_x, prev_x - prev_k
+    ops.append("=" * x)
+    return "".join(reversed(ops))
+
+
+def _diff_from_edit_script(script: str, offset: int) -> LineDiff:
+    """根据编辑脚本统计差异块和计数"""
+    diff = LineDiff()
+    x = y = 0
+    i = 0
+    while i < len(script):
+        if script[i] == "=":
+            x += 1
+            y += 1
+            i += 1
+            continue
+        start_x, start_y = x, y
+        while i < len(script) and script[i] != "=":
+            if script[i] == "-":
+                x += 1
+            else:
+                y += 1
+            i += 1
+        removed, added = x - start_x, y - start_y
+        diff.hunks.append(DiffHunk(offset + start_x, removed, offset + start_y, added))
+        modified = min(removed, added)
+        diff.lines_modified += modified
+        diff.lines_removed += removed - modified
+        diff.lines_added += added - modified
+    diff.changes_count = diff.lines_modified + diff.lines_removed + diff.lines_added
+    return diff
+
+
+def _estimate_diff(a: list[int], b: list[int], offset: int, max_changes: Optional[int]) -> LineDiff:
+    """超出计算上限时，按行内容的多重集合差估算计数（线性时间）"""
+    a_counts, b_counts = Counter(a), Counter(b)
+    removed = sum((a_counts - b_counts).values())
+    added = sum((b_counts - a_counts).values())
+    modified = min(removed, added)
+    changes_count = removed + added - modified
+    if max_changes is not None:
+        changes_count = max(changes_count, max_changes + 1)
+    return LineDiff(
+        lines_added=added - modified,
+        lines_removed=removed - modified,
+        lines_modified=modified,
+        changes_count=changes_count,
+        hunks=[DiffHunk(offset, len(a), offset, len(b))],
+        exact=False,
+    )
@@ -0,0 +1,202 @@
+"""
+解析缓存
+同一内容（按内容哈希和语言）只解析一次，语法错误、导入和结构统计都从同一次解析结果中得到
+"""
+
+import ast
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+LANGUAGE_ALIASES = {
+    "python": "python",
+    "py": "python",
+    "javascript": "javascript",
+    "js": "javascript",
+    "typescript": "javascript",
+    "ts": "javascript",
+    "go": "go",
+    "golang": "go",
+    "java": "java",
+}
+
+_IMPORT_PATTERNS = {
+    "python": [re.compile(r"^\s*import\s+([\w.]+)"), re.compile(r"^\s*from\s+([\w.]+)\s+import")],
+    "javascript": [
+        re.compile(r"^\s*import\s+.*?\s+from\s+['\"](.+?)['\"]"),
+        re.compile(r"^\s*import\s+['\"](.+?)['\"]"),
+        re.compile(r"^\s*require\(['\"](.+?)['\"]\)"),
+    ],
+    "go": [re.compile(r"^\s*import\s+['\"](.+?)['\"]")],
+    "java": [re.compile(r"^\s*import\s+([\w.]+);")],
+}
+
+
+def normalize_language(language: str) -> str:
+    """规范化语言名称（未知语言原样返回小写形式）"""
+    language = language.lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+
+@dataclass(frozen=True)
+class ParsedContent:
+    """一次解析的结果"""
+
+    language: str
+    syntax_errors: tuple[str, ...] = ()
+    imports: frozenset[str] = frozenset()
+    stats: dict[str, int] = field(default_factory=dict)
+
+
+class ParseCache:
+    """
+    解析结果缓存（线程安全，LRU淘汰）
+
+    默认使用进程内共享的实例，因此同一会话中对相同内容的多次验证（包括批量编辑）只解析一次
+    """
+
+    DEFAULT_MAX_ENTRIES = 512
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], ParsedContent] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content: str, language: str) -> ParsedContent:
+        """
+        获取内容的解析结果（未缓存时解析）
+
+        Args:
+            content: 代码内容
+            language: 编程语言
+
+        Returns:
+            ParsedContent: 解析结果
+
+        """
+        language = normalize_language(language)
+        key = (hashlib.blake2b(content.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest(), language)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        parsed = parse_content(content, language)
+
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_statistics(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_shared_parse_cache = ParseCache()
+
+
+def get_shared_parse_cache() -> ParseCache:
+    """获取进程内共享的解析缓存"""
+    return _shared_parse_cache
+
+
+def parse_content(content: str, language: str) -> ParsedContent:
+    """
+    解析内容（不使用缓存）
+
+    Args:
+        content: 代码内容
+        language: 规范化的语言名称
+
+    Returns:
+        ParsedContent: 解析结果
+
+    """
+    lines = content.split("\n")
+    if language == "python":
+        return _parse_python(content, lines)
+
+    syntax_errors: list[str] = []
+    if language == "javascript":
+        if content.count("{") != content.count("}"):
+            syntax_errors.append("Mismatched braces")
+        if content.count("(") != content.count(")"):
+            syntax_errors.append("Mismatched parentheses")
+    elif language == "go":
+        if not re.match(r"^\s*package\s+\w+", content):
+            syntax_errors.append("Missing or invalid package declaration")
+    elif language == "java":
+        if "class " in content and not re.search(r"\bclass\s+\w+", content):
+            syntax_errors.append("Invalid class declaration")
+
+    imports = _extract_imports_by_pattern(lines, language)
+    return ParsedContent(
+        language=language,
+        syntax_errors=tuple(syntax_errors),
+        imports=frozenset(imports),
+        stats={"lines": len(lines), "imports": len(imports)},
+    )
+
+
+def _parse_python(content: str, lines: list[str]) -> ParsedContent:
+    """解析Python代码（一次 ast.parse，导入和结构统计从AST中提取）"""
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        # 无法解析时按行匹配导入
+        imports = _extract_imports_by_pattern(lines, "python")
+        return ParsedContent(
+            language="python",
+            syntax_errors=(f"Python syntax error: {e.msg} (line {e.lineno})",),
+            imports=frozenset(imports),
+            stats={"lines": len(lines), "imports": len(imports)},
+        )
+    except Exception as e:
+        return ParsedContent(language="python", syntax_errors=(f"Python validation failed: {e!s}",), stats={"lines": len(lines)})
+
+    imports: set[str] = set()
+    num_functions = 0
+    num_classes = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.add("." * node.level + (node.module or ""))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            num_functions += 1
+        elif isinstance(node, ast.ClassDef):
+            num_classes += 1
+
+    return ParsedContent(
+        language="python",
+        imports=frozenset(imports),
+        stats={"lines": len(lines), "imports": len(imports), "functions": num_functions, "classes": num_classes},
+    )
+
+
+def _extract_imports_by_pattern(lines: list[str], language: str) -> set[str]:
+    """按行匹配导入语句"""
+    imports: set[str] = set()
+    patterns = _IMPORT_PATTERNS.get(language, [])
+    for line in lines:
+        for pattern in patterns:
+            match = pattern.match(line)
+            if match:
+                imports.add(match.group(1))
+    return imports
@@ -12,57 +12,58 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from .backup_store import BackupStore
 from .data_models import RollbackResult, RollbackStrategy
+from .git_objects import GitObjectError, GitObjectStore
 
 
 class RollbackManager:
     """回滚管理器"""
 
-    def __init__(self, backup_dir: Optional[str] = None):
+    def __init__(self, backup_dir: Optional[str] = None, project_root: Optional[str] = None):
         """
         初始化回滚管理器
 
         Args:
             backup_dir: 备份目录路径，默认使用临时目录
+            project_root: 项目根目录，指定时备份存储位于 <项目>/.evolvai/backups
 
         """
         self.backup_dir = backup_dir or self._create_backup_dir()
+        self.project_root = project_root
         self.rollback_history: list[dict] = []
         self.performance_metrics: dict[str, list[float]] = {}
+        self._backup_store: Optional[BackupStore] = None
+        # 每个文件最近的Git回滚点：绝对路径 -> (创建时间, blob哈希)
+        self._git_rollback_points: dict[str, tuple[float, str]] = {}
+
+    @property
+    def backup_store(self) -> BackupStore:
+        """内容寻址备份存储（首次使用时创建）"""
+        if self._backup_store is None:
+            if self.project_root is not None:
+                store_dir = os.path.join(self.project_root, ".evolvai", "backups")
+            else:
+                store_dir = os.path.join(self.backup_dir, "store")
+            self._backup_store = BackupStore(store_dir)
+        return self._backup_store
 
-    def create_file_backup(self, file_path: str) -> RollbackResult:
+    def create_snapshot(self, file_paths: list[str], label: str = "") -> RollbackResult:
         """
-        创建文件备份
+        为一批文件创建快照（一次操作，内容相同的文件只存储一次）
 
         Args:
-            file_path: 要备份的文件路径
+            file_paths: 要备份的文件路径列表
+            label: 快照描述
 
         Returns:
-            RollbackResult: 备份结果
+            RollbackResult: 备份结果，rollback_hash 为快照ID
 
         """
         start_time = time.time()
 
         try:
-            path_obj = Path(file_path)
-
-            # 生成备份文件路径
-            backup_name = f"{path_obj.name}.backup"
-            backup_path = Path(self.backup_dir) / backup_name
-
-            # 确保备份目录存在
-            import os
-            os.makedirs(str(backup_path.parent), exist_ok=True)
-
-            # 总是尝试复制文件（即使原始文件不存在，也会复制空内容或失败）
-            try:
-                shutil.copy2(file_path, backup_path)
-            except FileNotFoundError:
-                # 如果原始文件不存在，创建空备份文件
-                backup_path.write_text("", encoding='utf-8')
-            except Exception as e:
-                # 其他错误也创建空备份文件
-                backup_path.write_text("", encoding='utf-8')
+            snapshot = self.backup_store.snapshot(file_paths, label=label)
 
             duration = (time.time() - start_time) * 1000
             self._record_performance("file_backup", duration)
@@ -70,8 +71,8 @@ class RollbackManager:
             # 记录回滚历史
             self.rollback_history.append({
                 "type": "file_backup",
-                "original_path": file_path,
-                "backup_path": str(backup_path),
+                "original_paths": list(file_paths),
+                "snapshot_id": snapshot.snapshot_id,
                 "timestamp": datetime.now().isoformat(),
                 "strategy": RollbackStrategy.FILE_BACKUP
             })
@@ -79,8 +80,8 @@ class RollbackManager:
             return RollbackResult(
                 success=True,
                 strategy=RollbackStrategy.FILE_BACKUP,
-                message=f"File backup successful: {backup_path}",
-                rollback_hash=str(backup_path),
+                message=f"File backup successful: {snapshot.snapshot_id} ({len(file_paths)} files)",
+                rollback_hash=snapshot.snapshot_id,
                 duration_ms=duration
             )
 
@@ -93,18 +94,71 @@ class RollbackManager:
                 duration_ms=duration
             )
 
+    def create_file_backup(self, file_path: str) -> RollbackResult:
+        """
+        创建文件备份
+
+        Args:
+            file_path: 要备份的文件路径
+
+        Returns:
+            RollbackResult: 备份结果，rollback_hash 为快照ID
+
+        """
+        return self.create_snapshot([file_path])
+
+    def restore_snapshot(self, snapshot_id: str, file_paths: Optional[list[str]] = None) -> RollbackResult:
+        """
+        从快照回滚
+
+        Args:
+            snapshot_id: 快照ID
+            file_paths: 要恢复的文件（默认恢复快照中的所有文件）
+
+        Returns:
+            RollbackResult: 回滚结果
+
+        """
+        start_time = time.time()
+
+        try:
+            restored = self.backup_store.restore(snapshot_id, file_paths)
+
+            duration = (time.time() - start_time) * 1000
+            self._record_performance("file_rollback", duration)
+
+            return RollbackResult(
+                success=True,
+                strategy=RollbackStrategy.FILE_BACKUP,
+                message=f"File rollback successful: {', '.join(restored)}",
+                rollback_hash=snapshot_id,
+                duration_ms=duration
+            )
+
+        except Exception as e:
+            duration = (time.time() - start_time) * 1000
+            return RollbackResult(
+                success=False,
+                strategy=RollbackStrategy.FILE_BACKUP,
+                error_message=f"File rollback failed: {e!s}",
+                duration_ms=duration
+            )
+
     def rollback_file_backup(self, backup_path: str, original_path: str) -> RollbackResult:
         """
         从文件备份回滚
 
         Args:
-            backup_path: 备份文件路径
+            backup_path: 备份文件路径或快照ID
             original_path: 原始文件路径
 
         Returns:
             RollbackResult: 回滚结果
 
         """
+        if BackupStore.is_snapshot_id(backup_path):
+            return self.restore_snapshot(backup_path, [original_path])
+
         start_time = time.time()
 
         try:
@@ -230,13 +284,55 @@ class RollbackManager:
         else:
             raise Exception(f"Backup creation failed: {result.error_message}")
 
-    def git_rollback(self, commit_hash: str, message: Optional[str] = None) -> RollbackResult:
+    def create_git_rollback_point(self, file_path: str) -> RollbackResult:
+        """
+        创建Git回滚点（将文件内容写入为blob对象，不修改索引和工作区）
+
+        Args:
+            file_path: 要备份的文件路径（必须存在）
+
+        Returns:
+            RollbackResult: 备份结果，rollback_hash 为blob哈希
+
+        """
+        start_time = time.time()
+
+        try:
+            git_objects = self._get_git_object_store(file_path)
+            if git_objects is None:
+                raise GitObjectError(f"{file_path} is not in a git repository")
+            blob_hash = git_objects.write_blobs([file_path])[file_path]
+            self._git_rollback_points[os.path.abspath(file_path)] = (time.time(), blob_hash)
+
+            duration = (time.time() - start_time) * 1000
+            self._record_performance("git_backup", duration)
+
+            return RollbackResult(
+                success=True,
+                strategy=RollbackStrategy.GIT,
+                message=f"Git rollback point created: {blob_hash}",
+                rollback_hash=blob_hash,
+                duration_ms=duration
+            )
+
+        except Exception as e:
+            duration = (time.time() - start_time) * 1000
+            return RollbackResult(
+                success=False,
+                strategy=RollbackStrategy.GIT,
+                error_message=f"Git rollback point creation failed: {e!s}",
+                duration_ms=duration
+            )
+
+    def git_rollback(self, commit_hash: str, message: Optional[str] = None, file_paths: Optional[list[str]] = None) -> RollbackResult:
         """
         Git回滚到指定提交
 
         Args:
-            commit_hash: Git提交哈希
+            commit_hash: Git提交哈希（指定 file_paths 时也可以是单个文件的blob哈希）
             message: 回滚消息
+            file_paths: 要恢复的文件，指定时只写回这些文件（不影响其他文件和索引），
+                否则对整个工作区执行 git reset --hard
 
         Returns:
             RollbackResult: Git回滚结果
@@ -244,6 +340,9 @@ class RollbackManager:
         """
         start_time = time.time()
 
+        if file_paths:
+            return self._git_restore_files(commit_hash, file_paths, message, start_time)
+
         try:
             # 执行回滚
             cmd = ['git', 'reset', '--hard', commit_hash]
@@ -253,7 +352,8 @@ class RollbackManager:
             result = subprocess.run(
                 cmd,
                 check=False, capture_output=True,
-                text=True
+                text=True,
+                cwd=self.project_root
             )
 
             if result.returncode != 0:
@@ -292,6 +392,44 @@ class RollbackManager:
                 duration_ms=duration
             )
 
+    def _git_restore_files(self, revision: str, file_paths: list[str], message: Optional[str], start_time: float) -> RollbackResult:
+        """只将指定文件恢复为Git对象中的内容"""
+        try:
+            git_objects = self._get_git_object_store(file_paths[0])
+            if git_objects is None:
+                raise GitObjectError(f"{file_paths[0]} is not in a git repository")
+            restored = git_objects.restore_files(revision, file_paths)
+
+            duration = (time.time() - start_time) * 1000
+            self._record_performance("git_rollback", duration)
+
+            # 记录回滚历史
+            self.rollback_history.append({
+                "type": "git_rollback",
+                "commit_hash": revision,
+                "file_paths": restored,
+                "message": message,
+                "timestamp": datetime.now().isoformat(),
+                "strategy": RollbackStrategy.GIT
+            })
+
+            return RollbackResult(
+                success=True,
+                strategy=RollbackStrategy.GIT,
+                message=f"Git rollback successful to {revision}: {', '.join(restored)}",
+                rollback_hash=revision,
+                duration_ms=duration
+            )
+
+        except Exception as e:
+            duration = (time.time() - start_time) * 1000
+            return RollbackResult(
+                success=False,
+                strategy=RollbackStrategy.GIT,
+                error_message=f"Git rollback failed: {e!s}",
+                duration_ms=duration
+            )
+
     def git_revert(self, commit_hash: str, message: Optional[str] = None) -> RollbackResult:
         """
         Git revert到指定提交（撤销变更）
@@ -314,7 +452,8 @@ class RollbackManager:
             result = subprocess.run(
                 cmd,
                 check=False, capture_output=True,
-                text=True
+                text=True,
+                cwd=self.project_root
             )
 
             if result.returncode != 0:
@@ -367,7 +506,7 @@ class RollbackManager:
                 strategy = self._select_rollback_strategy(backup_path_or_hash)
 
             if strategy == RollbackStrategy.GIT:
-                result = self.git_rollback(backup_path_or_hash)
+                result = self.git_rollback(backup_path_or_hash, file_paths=[original_path])
             else:
                 result = self.rollback_file_backup(backup_path_or_hash, original_path)
 
@@ -387,6 +526,9 @@ class RollbackManager:
         """
         智能回滚（自动选择最佳策略）
 
+        将文件恢复到该文件最近的回滚点（Git blob 回滚点或包含该文件的快照，取较新者），
+        从而保留编辑前未提交的修改；只有不存在回滚点时才恢复为最近提交（HEAD）中的内容
+
         Args:
             file_path: 文件路径
             operation_type: 操作类型 (edit, create, delete)
@@ -395,31 +537,27 @@ class RollbackManager:
             RollbackResult: 回滚结果
 
         """
-        # 尝试Git回滚
-        if self._is_git_repo():
-            try:
-                # 检查最近的提交
-                result = subprocess.run(
-                    ['git', 'log', '-1', '--oneline'],
-                    check=False, capture_output=True,
-                    text=True
-                )
-
-                if result.returncode == 0:
-                    commit_hash = result.stdout.split()[0]
-                    return self.git_rollback(commit_hash, f"智能回滚: {operation_type}")
-            except Exception:
-                pass  # Git回滚失败，尝试文件备份
-
-        # 尝试文件备份回滚
-        # 查找最新的备份文件
-        backup_pattern = f"{Path(file_path).name}.*.backup"
-        backup_files = list(Path(self.backup_dir).glob(backup_pattern))
-
-        if backup_files:
-            # 按时间排序，选择最新的
-            latest_backup = sorted(backup_files, key=lambda x: x.stat().st_mtime)[-1]
-            return self.rollback_file_backup(str(latest_backup), file_path)
+        message = f"智能回滚: {operation_type}"
+        git_rollback_point = self._git_rollback_points.get(os.path.abspath(file_path))
+        latest_snapshot = self.backup_store.find_latest_snapshot(file_path)
+
+        # 尝试恢复到Git回滚点（除非之后又创建了包含该文件的快照）
+        if git_rollback_point is not None and (latest_snapshot is None or git_rollback_point[0] >= latest_snapshot.created_at):
+            result = self.git_rollback(git_rollback_point[1], message, file_paths=[file_path])
+            if result.success:
+                return result
+
+        # 尝试文件备份回滚（查找包含该文件的最新快照）
+        if latest_snapshot is not None:
+            result = self.restore_snapshot(latest_snapshot.snapshot_id, [file_path])
+            if result.success:
+                return result
+
+        # 没有回滚点时，只将该文件恢复为最近提交中的内容
+        if self._is_git_repo(file_path):
+            result = self.git_rollback("HEAD", message, file_paths=[file_path])
+            if result.success:
+                return result
 
         # 没有找到回滚策略
         return RollbackResult(
@@ -475,17 +613,25 @@ class RollbackManager:
         backup_dir.mkdir(parents=True, exist_ok=True)
         return str(backup_dir)
 
-    def _is_git_repo(self) -> bool:
-        """检查当前目录是否为Git仓库"""
-        try:
-            result = subprocess.run(
-                ['git', 'rev-parse', '--is-inside-work-tree'],
-                check=False, capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+    def _get_git_object_store(self, file_path: Optional[str] = None) -> Optional[GitObjectStore]:
+        """
+        获取文件所在仓库的Git对象存储（仓库检测结果按目录缓存，对象存储按仓库根目录共享）
+
+        Args:
+            file_path: 文件路径，未指定时使用项目目录（默认为当前目录）
+
+        """
+        if file_path is None:
+            return GitObjectStore.for_path(self.project_root or os.getcwd())
+        # 文件所在目录可能已被删除，此时使用最近的已存在的上级目录
+        directory = os.path.dirname(os.path.abspath(file_path))
+        while not os.path.isdir(directory) and os.path.dirname(directory) != directory:
+            directory = os.path.dirname(directory)
+        return GitObjectStore.for_path(directory)
+
+    def _is_git_repo(self, file_path: Optional[str] = None) -> bool:
+        """检查文件（未指定时为项目目录，默认为当前目录）是否在Git仓库中"""
+        return self._get_git_object_store(file_path) is not None
 
     def _is_git_repository(self) -> bool:
             """检查当前目录是否为Git仓库（别名方法，为了测试兼容性）"""
@@ -520,13 +666,20 @@ class RollbackManager:
         清理旧备份文件
 
         Args:
-            backup_dir: 备份目录路径，默认使用实例的backup_dir
+            backup_dir: 备份目录路径，默认使用实例的backup_dir（同时清理备份存储中的旧快照）
             max_age_days: 最大保留天数
-            max_backups: 最大保留文件数量
+            max_backups: 最大保留文件（快照）数量
 
         """
         import glob
-        
+
+        if backup_dir is None:
+            if max_backups is not None:
+                self.backup_store.collect_garbage(max_snapshots=max_backups)
+            else:
+                self.backup_store.collect_garbage(max_age_days=max_age_days)
+
+        # 清理旧版本的 *.backup 文件
         target_backup_dir = backup_dir or self.backup_dir
         
         if max_backups is not None:
@@ -557,14 +710,10 @@ class RollbackManager:
 
     def get_backup_size(self) -> int:
         """
-        获取备份目录大小
+        获取备份大小（基于备份存储的索引，不遍历目录）
 
         Returns:
-            int: 备份目录大小（字节）
+            int: 备份大小（字节）
 
         """
-        total_size = 0
-        for backup_file in Path(self.backup_dir).glob("**/*"):
-            if backup_file.is_file():
-                total_size += backup_file.stat().st_size
-        return total_size
+        return self.backup_store.get_total_size()
@@ -0,0 +1,276 @@
+"""Bounded audit log with streaming per-tool aggregates.
+
+Recent audit records are kept in a ring buffer, while per-tool aggregates (call counts, error rates,
+latency percentiles, token totals) are updated incrementally, such that memory use is fixed and
+queries do not need to rescan the history. Records can optionally be appended to a JSON lines file
+for cross-session analysis.
+"""
+
+import heapq
+import itertools
+import json
+import math
+import threading
+from collections import deque
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+from sensai.util import logging
+
+log = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (HDR-style).
+
+    Values are assigned to buckets whose bounds grow geometrically, so percentiles are reported with a bounded
+    relative error (half the growth factor) using a number of buckets that grows only logarithmically with the
+    range of values. Count, sum, minimum and maximum are tracked exactly.
+    """
+
+    def __init__(self, min_value: float = 1e-6, growth_factor: float = 1.05):
+        """Initialize histogram.
+
+        :param min_value: values up to this value share the first bucket
+        :param growth_factor: ratio of the upper and lower bound of each bucket
+        """
+        self._min_value = min_value
+        self._growth_factor = growth_factor
+        self._log_growth = math.log(growth_factor)
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        bucket = 0 if value <= self._min_value else int(math.log(value / self._min_value) / self._log_growth) + 1
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Get the approximate value at the given percentile.
+
+        :param q: percentile in [0, 100]
+        :return: approximate value (0.0 if the histogram is empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                value = self._min_value if bucket == 0 else self._min_value * self._growth_factor ** (bucket - 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class ToolAggregate:
+    """Streaming aggregate of the executions of a single tool."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_tokens = 0
+        self.constraint_violations = 0
+        self.latency = LatencyHistogram()
+
+    def add(self, record: dict[str, Any]) -> None:
+        self.count += 1
+        if not record.get("success", True):
+            self.errors += 1
+        self.total_tokens += record.get("tokens", 0)
+        self.constraint_violations += len(record.get("constraints") or [])
+        self.latency.add(record.get("duration", 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "total_tokens": self.total_tokens,
+            "average_tokens": self.total_tokens / self.count if self.count else 0.0,
+            "constraint_violations": self.constraint_violations,
+            "total_duration": self.latency.total,
+            "average_duration": self.latency.total / self.count if self.count else 0.0,
+            "p50_duration": self.latency.percentile(50),
+            "p90_duration": self.latency.percentile(90),
+            "p99_duration": self.latency.percentile(99),
+            "max_duration": self.latency.max if self.count else 0.0,
+        }
+
+
+class AuditLog(Sequence):
+    """Fixed-memory audit log.
+
+    Behaves as a sequence of the most recent audit records (oldest first). Aggregates cover all records
+    added since creation (or the last `clear`), including records which were evicted from the ring buffer.
+    The most recent records of each tool are additionally kept in small per-tool ring buffers, such that the
+    number of retained records is bounded by `max_records + number of tools * max_records_per_tool`.
+    """
+
+    DEFAULT_MAX_RECORDS = 10_000
+    DEFAULT_MAX_SLOW_RECORDS = 100
+
+    def __init__(
+        self,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        persist_path: Optional[str | Path] = None,
+        max_slow_records: int = DEFAULT_MAX_SLOW_RECORDS,
+        max_records_per_tool: Optional[int] = None,
+    ):
+        """Initialize audit log.
+
+        :param max_records: number of recent records to retain overall
+        :param persist_path: optional JSON lines file to which every record is appended
+        :param max_slow_records: number of slowest records to retain for `get_slow_records`
+        :param max_records_per_tool: number of recent records to retain per tool (default: a tenth of `max_records`)
+        """
+        self._max_records = max_records
+        self._max_records_per_tool = max_records_per_tool if max_records_per_tool is not None else max(1, max_records // 10)
+        self._max_slow_records = max_slow_records
+        self._records: deque[dict[str, Any]] = deque(maxlen=max_records)
+        self._records_by_tool: dict[str, deque[dict[str, Any]]] = {}
+        self._aggregates: dict[str, ToolAggregate] = {}
+        # min-heap of (duration, sequence number, record) holding the slowest records
+        self._slow_records: list[tuple[float, int, dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._persist_path = Path(persist_path) if persist_path is not None else None
+        self._persist_file = None
+        if self._persist_path is not None:
+            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self._persist_file = open(self._persist_path, "a", encoding="utf-8")  # noqa: SIM115
+
+    @classmethod
+    def from_file(cls, path: str | Path, max_records: int = DEFAULT_MAX_RECORDS) -> "AuditLog":
+        """Load records persisted by one or more previous sessions (for cross-session analysis).
+
+        :param path: JSON lines file written via `persist_path`
+        :param max_records: number of recent records to retain
+        :return: audit log with aggregates over all records in the file (not persisting further records)
+        """
+        audit_log = cls(max_records=max_records)
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    audit_log._add(json.loads(line))
+                except ValueError:
+                    log.warning(f"Skipping invalid audit record in {path}, line {line_number}")
+        return audit_log
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Add a record (must contain the key "tool")."""
+        with self._lock:
+            self._add(record)
+            if self._persist_file is not None:
+                try:
+                    self._persist_file.write(json.dumps(record, default=str) + "\n")
+                    self._persist_file.flush()
+                except OSError as e:
+                    log.error(f"Failed to persist audit record to {self._persist_path}: {e}")
+
+    def _add(self, record: dict[str, Any]) -> None:
+        tool_name = record["tool"]
+        self._records.append(record)
+        tool_records = self._records_by_tool.get(tool_name)
+        if tool_records is None:
+            tool_records = self._records_by_tool[tool_name] = deque(maxlen=self._max_records_per_tool)
+        tool_records.append(record)
+
+        aggregate = self._aggregates.get(tool_name)
+        if aggregate is None:
+            aggregate = self._aggregates[tool_name] = ToolAggregate()
+        aggregate.add(record)
+
+        entry = (record.get("duration", 0.0), next(self._sequence), record)
+        if len(self._slow_records) < self._max_slow_records:
+            heapq.heappush(self._slow_records, entry)
+        elif entry[0] > self._slow_records[0][0]:
+            heapq.heapreplace(self._slow_records, entry)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        with self._lock:
+            if isinstance(index, slice):
+                return list(self._records)[index]
+            return self._records[index]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.get_records())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (AuditLog, list)):
+            return self.get_records() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def get_records(self, tool_name: Optional[str] = None, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Get recent records (oldest first).
+
+        :param tool_name: optional tool name to filter by (at most `max_records_per_tool` records are retained per tool)
+        :param limit: optional maximum number of (most recent) records to return
+        :return: list of records
+        """
+        with self._lock:
+            records = self._records if tool_name is None else self._records_by_tool.get(tool_name, ())
+            if limit is None or limit >= len(records):
+                return list(records)
+            return list(itertools.islice(reversed(records), limit))[::-1]
+
+    def get_slow_records(self, threshold_seconds: float) -> list[dict[str, Any]]:
+        """Get the slowest records exceeding the given duration (slowest first).
+
+        Only the `max_slow_records` slowest records since creation (or the last `clear`) are considered.
+
+        :param threshold_seconds: duration threshold in seconds
+        :return: list of records
+        """
+        with self._lock:
+            slow = [entry for entry in self._slow_records if entry[0] > threshold_seconds]
+        slow.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        return [record for _, _, record in slow]
+
+    def get_tool_stats(self) -> dict[str, dict[str, Any]]:
+        """Get per-tool aggregates (count, error rate, latency percentiles, token totals)."""
+        with self._lock:
+            return {tool_name: aggregate.to_dict() for tool_name, aggregate in self._aggregates.items()}
+
+    def get_summary(self) -> dict[str, Any]:
+        """Get totals over all tools."""
+        with self._lock:
+            total = sum(a.count for a in self._aggregates.values())
+            errors = sum(a.errors for a in self._aggregates.values())
+            tokens = sum(a.total_tokens for a in self._aggregates.values())
+        return {
+            "total_executions": total,
+            "total_tokens": tokens,
+            "average_tokens": tokens / total if total else 0,
+            "successful_executions": total - errors,
+            "failed_executions": errors,
+            "success_rate": (total - errors) / total if total else 0,
+        }
+
+    def clear(self) -> None:
+        """Clear records and aggregates (persisted records are kept)."""
+        with self._lock:
+            self._records.clear()
+            self._records_by_tool.clear()
+            self._aggregates.clear()
+            self._slow_records.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._persist_file is not None:
+                self._persist_file.close()
+                self._persist_file = None
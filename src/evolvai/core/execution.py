@@ -1,5 +1,6 @@
 """Core execution engine components."""
 
+import os
 import time
 from dataclasses import dataclass
 from enum import Enum
@@ -7,6 +8,7 @@ from typing import TYPE_CHECKING, Any
 
 from sensai.util import logging
 
+from evolvai.core.audit import AuditLog
 from evolvai.core.constraint_exceptions import (
     ChangeLimitExceededError,
     FileLimitExceededError,
@@ -14,6 +16,9 @@ from evolvai.core.constraint_exceptions import (
 )
 from evolvai.core.exceptions import ConstraintViolationError
 from evolvai.core.plan_validator import PlanValidator
+from evolvai.core.profiling import ToolProfiler
+from serena.util.metrics import metrics
+from serena.util.tracing import tracer
 
 if TYPE_CHECKING:
     from serena.agent import SerenaAgent
@@ -21,6 +26,9 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+_tool_duration = metrics.histogram("serena_tool_duration_seconds", "Duration of tool executions", ["tool"])
+_tool_errors = metrics.counter("serena_tool_errors_total", "Number of failed tool executions", ["tool"])
+
 
 class ExecutionPhase(Enum):
     """Execution phases for tool execution."""
@@ -61,6 +69,12 @@ class ExecutionContext:
     estimated_tokens: int = 0
     actual_tokens: int = 0
 
+    # Tracing (id of the trace recorded for the execution, if tracing is enabled)
+    trace_id: str | None = None
+
+    # Profiling (profile path and hotspots, if the tool was profiled)
+    profile: dict[str, Any] | None = None
+
     def check_limits(self) -> None:
         """Check runtime constraints against execution plan limits.
 
@@ -117,6 +131,8 @@ class ExecutionContext:
             "success": self.error is None,
             "constraints": self.constraint_violations or [],
             "batched": self.should_batch,
+            "trace_id": self.trace_id,
+            "profile": self.profile,
         }
 
 
@@ -130,15 +146,26 @@ class ToolExecutionEngine:
     4. TPST analysis support
     """
 
-    def __init__(self, agent: "SerenaAgent", enable_constraints: bool = False):
+    def __init__(
+        self,
+        agent: "SerenaAgent",
+        enable_constraints: bool = False,
+        audit_log: AuditLog | None = None,
+        profiler: ToolProfiler | None = None,
+    ):
         """Initialize execution engine.
 
         :param agent: SerenaAgent instance
         :param enable_constraints: Enable Epic-001 constraints
+        :param audit_log: Audit log to record executions in (e.g. one persisting records to disk);
+            if None, an in-memory audit log with default capacity is used
+        :param profiler: Profiler selecting the tools whose executions are profiled;
+            if None, no tools are profiled (until selected via `profiler`)
         """
         self._agent = agent
         self._constraints_enabled = enable_constraints
-        self._audit_log: list[dict[str, Any]] = []
+        self._audit_log = audit_log if audit_log is not None else AuditLog()
+        self.profiler = profiler if profiler is not None else ToolProfiler()
 
     def execute(self, tool: "Tool", **kwargs: Any) -> str:
         """Execute tool with full 4-phase flow.
@@ -158,23 +185,43 @@ class ToolExecutionEngine:
             start_time=time.time(),
         )
 
+        with tracer.span(f"tool/{ctx.tool_name}", {"tool.name": ctx.tool_name}) as root_span:
+            if root_span is None:
+                return self._execute_phases(tool, ctx)
+            ctx.trace_id = root_span.trace_id
+            try:
+                return self._execute_phases(tool, ctx)
+            finally:
+                # errors are mostly reported via the result, so they are recorded explicitly
+                if ctx.error is not None:
+                    root_span.is_error = True
+                    root_span.status_message = f"{type(ctx.error).__name__}: {ctx.error}"
+
+    def _execute_phases(self, tool: "Tool", ctx: ExecutionContext) -> str:
         try:
             # Phase 1: Pre-validation
             ctx.phase = ExecutionPhase.PRE_VALIDATION
-            self._pre_validation(tool, ctx)
+            with tracer.span(ctx.phase.value):
+                self._pre_validation(tool, ctx)
 
             # Phase 2: Pre-execution (Epic-001)
             if self._constraints_enabled:
                 ctx.phase = ExecutionPhase.PRE_EXECUTION
-                self._pre_execution_with_constraints(tool, ctx)
+                with tracer.span(ctx.phase.value):
+                    self._pre_execution_with_constraints(tool, ctx)
 
             # Phase 3: Execution
             ctx.phase = ExecutionPhase.EXECUTION
-            ctx.result = self._execute_tool(tool, ctx)
+            with tracer.span(ctx.phase.value):
+                if self.profiler.enabled and self.profiler.is_profiled(ctx.tool_name):
+                    ctx.result = self._execute_tool_profiled(tool, ctx)
+                else:
+                    ctx.result = self._execute_tool(tool, ctx)
 
             # Phase 4: Post-execution
             ctx.phase = ExecutionPhase.POST_EXECUTION
-            self._post_execution(tool, ctx)
+            with tracer.span(ctx.phase.value):
+                self._post_execution(tool, ctx)
 
             return ctx.result
 
@@ -196,6 +243,9 @@ class ToolExecutionEngine:
         finally:
             ctx.end_time = time.time()
             self._audit_log.append(ctx.to_audit_record())
+            _tool_duration.observe(ctx.end_time - ctx.start_time, ctx.tool_name)
+            if ctx.error is not None:
+                _tool_errors.inc(ctx.tool_name)
 
     def _pre_validation(self, tool: "Tool", ctx: ExecutionContext) -> None:
         """Phase 1: Pre-validation checks.
@@ -203,10 +253,15 @@ class ToolExecutionEngine:
         Checks:
         1. Tool activation status
         2. Active project requirement
-        3. Language server status
+        3. Language server readiness (symbolic tools only)
         """
         # Import here to avoid circular dependency
-        from serena.tools.tools_base import ToolMarkerDoesNotRequireActiveProject
+        from serena.tools.tools_base import (
+            ToolMarkerDoesNotRequireActiveProject,
+            ToolMarkerSymbolicEdit,
+            ToolMarkerSymbolicRead,
+            ToolMarkerSymbolicReadWithIndexFallback,
+        )
 
         # Check 1: Tool activation
         try:
@@ -225,10 +280,13 @@ class ToolExecutionEngine:
                     f"or to select a project from this list of known projects: {project_names}"
                 )
 
-            # Check 3: Language server status
-            if self._agent.is_using_language_server() and not self._agent.is_language_server_running():
-                log.info("Language server is not running. Starting it ...")
-                self._agent.reset_language_server()
+            # Check 3: Language server status (only symbolic tools need to wait for the language server;
+            # other tools requiring it, as well as tools which can fall back to the symbol index, will wait lazily upon accessing it)
+            requires_language_server = isinstance(tool, (ToolMarkerSymbolicRead, ToolMarkerSymbolicEdit)) and not isinstance(
+                tool, ToolMarkerSymbolicReadWithIndexFallback
+            )
+            if self._agent.is_using_language_server() and requires_language_server:
+                self._agent.wait_for_language_server()
 
     def _pre_execution_with_constraints(self, tool: "Tool", ctx: ExecutionContext) -> None:
         """Phase 2: Pre-execution with constraints (Epic-001).
@@ -284,7 +342,8 @@ class ToolExecutionEngine:
             # Handle LSP termination with retry
             if e.is_language_server_terminated():
                 log.error(f"Language server terminated while executing tool ({e}). Restarting the language server and retrying ...")
-                self._agent.reset_language_server()
+                with tracer.span("ls.restart"):
+                    self._agent.reset_language_server()
                 # Retry execution
                 result = apply_fn(**ctx.kwargs)
             else:
@@ -296,6 +355,23 @@ class ToolExecutionEngine:
 
         return result
 
+    def _execute_tool_profiled(self, tool: "Tool", ctx: ExecutionContext) -> str:
+        """Phase 3 under the profiler; the profile is written to the project's `.serena/profiles` directory."""
+        capture = None
+        try:
+            with self.profiler.profile(ctx.tool_name, self._get_profile_dir()) as capture:
+                return self._execute_tool(tool, ctx)
+        finally:
+            if capture is not None:
+                ctx.profile = capture.to_dict()
+
+    def _get_profile_dir(self) -> str:
+        from serena.config.serena_config import SerenaPaths
+
+        project = self._agent._active_project
+        data_dir = project.path_to_serena_data_folder() if project is not None else SerenaPaths().user_config_dir
+        return os.path.join(data_dir, "profiles")
+
     def _post_execution(self, tool: "Tool", ctx: ExecutionContext) -> None:
         """Phase 4: Post-execution cleanup.
 
@@ -305,7 +381,8 @@ class ToolExecutionEngine:
         """
         # Record tool usage for statistics
         if hasattr(self._agent, "record_tool_usage_if_enabled") and ctx.result is not None:
-            self._agent.record_tool_usage_if_enabled(ctx.kwargs, ctx.result, tool)
+            with tracer.span("record_tool_usage"):
+                self._agent.record_tool_usage_if_enabled(ctx.kwargs, ctx.result, tool)
 
         # Save language server cache
         if self._agent.language_server is not None:
@@ -316,20 +393,38 @@ class ToolExecutionEngine:
 
     # Audit Log Interface (Cycle 6)
 
-    def get_audit_log(self, tool_name: str | None = None) -> list[dict[str, Any]]:
-        """Get audit log with optional filtering.
+    def get_audit_log(self, tool_name: str | None = None, limit: int | None = None) -> list[dict[str, Any]]:
+        """Get recent audit records with optional filtering.
 
         :param tool_name: Optional tool name to filter by
-        :return: List of audit records
+        :param limit: Optional maximum number of (most recent) records
+        :return: List of audit records (oldest first)
         """
-        if tool_name is None:
-            return self._audit_log.copy()
-        return [record for record in self._audit_log if record["tool"] == tool_name]
+        return self._audit_log.get_records(tool_name, limit)
+
+    def log_execution(self, record: dict[str, Any]) -> None:
+        """Record an execution which did not pass through the engine (e.g. a command run by SafeExecWrapper).
+
+        :param record: Audit record; if it has no "tool" key, its "type" is used as the tool name
+        """
+        record = {"tool": record.get("type", "unknown"), **record}
+        if "success" not in record and "execution_success" in record:
+            record["success"] = record["execution_success"]
+        if "duration" not in record and "duration_ms" in record:
+            record["duration"] = record["duration_ms"] / 1000
+        self._audit_log.append(record)
 
     def clear_audit_log(self) -> None:
         """Clear the audit log."""
         self._audit_log.clear()
 
+    def get_tool_stats(self) -> dict[str, dict[str, Any]]:
+        """Get per-tool aggregates: count, error rate, latency percentiles and token totals.
+
+        :return: Dictionary mapping tool names to their statistics
+        """
+        return self._audit_log.get_tool_stats()
+
     # TPST Analysis Interface (Cycle 7)
 
     def analyze_tpst(self) -> dict[str, Any]:
@@ -337,35 +432,14 @@ class ToolExecutionEngine:
 
         :return: Dictionary with token statistics
         """
-        if not self._audit_log:
-            return {
-                "total_executions": 0,
-                "total_tokens": 0,
-                "average_tokens": 0,
-                "successful_executions": 0,
-                "failed_executions": 0,
-            }
-
-        total_tokens = sum(record["tokens"] for record in self._audit_log)
-        successful = [record for record in self._audit_log if record["success"]]
-        failed = [record for record in self._audit_log if not record["success"]]
-
-        return {
-            "total_executions": len(self._audit_log),
-            "total_tokens": total_tokens,
-            "average_tokens": (total_tokens / len(self._audit_log) if self._audit_log else 0),
-            "successful_executions": len(successful),
-            "failed_executions": len(failed),
-            "success_rate": (len(successful) / len(self._audit_log) if self._audit_log else 0),
-        }
+        return self._audit_log.get_summary()
 
     def get_slow_tools(self, threshold_seconds: float = 1.0) -> list[dict[str, Any]]:
         """Get tools that exceeded duration threshold.
 
+        Only the slowest executions are retained for this query (see `AuditLog.get_slow_records`).
+
         :param threshold_seconds: Duration threshold in seconds
-        :return: List of slow tool executions
+        :return: List of slow tool executions (slowest first)
         """
-        slow_tools = [record for record in self._audit_log if record["duration"] > threshold_seconds]
-        # Sort by duration (slowest first)
-        slow_tools.sort(key=lambda x: x["duration"], reverse=True)
-        return slow_tools
+        return self._audit_log.get_slow_records(threshold_seconds)
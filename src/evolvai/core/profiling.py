@@ -0,0 +1,131 @@
+"""On-demand profiling of tool executions.
+
+Selected tools are executed under cProfile. Each profile is written to a file (loadable with `pstats`
+or viewers such as snakeviz) and summarised by its top hotspots, which are attached to the audit record.
+Tools which are not selected are executed without any profiling overhead.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sensai.util import logging
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileCapture:
+    """Result of profiling a single tool execution."""
+
+    path: str | None = None
+    """path of the profile file (None if it could not be written)"""
+    hotspots: list[dict[str, Any]] = field(default_factory=list)
+    """the functions with the highest internal time, most expensive first"""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"path": self.path, "hotspots": self.hotspots}
+
+
+class ToolProfiler:
+    """Decides which tool executions to profile and captures their profiles."""
+
+    ALL_TOOLS = "*"
+    """tool name selecting all tools"""
+
+    def __init__(self, tool_names: Iterable[str] = (), top_n: int = 15):
+        """Initialize profiler.
+
+        :param tool_names: names of the tools to profile (`ALL_TOOLS` selects all tools)
+        :param top_n: number of hotspots to include in the summary
+        """
+        self._top_n = top_n
+        self._tool_names: frozenset[str] = frozenset()
+        self._all_tools = False
+        self.enabled = False
+        # cProfile cannot profile nested invocations, so only one execution is profiled at a time
+        self._lock = threading.Lock()
+        self.set_tool_names(tool_names)
+
+    def set_tool_names(self, tool_names: Iterable[str]) -> None:
+        """Set the tools to profile, replacing the previous selection (an empty selection disables profiling).
+
+        :param tool_names: names of the tools to profile (`ALL_TOOLS` selects all tools)
+        """
+        self._tool_names = frozenset(name.strip() for name in tool_names if name.strip())
+        self._all_tools = self.ALL_TOOLS in self._tool_names
+        self.enabled = len(self._tool_names) > 0
+        log.info(f"Profiled tools: {sorted(self._tool_names) if self.enabled else 'none'}")
+
+    def get_tool_names(self) -> list[str]:
+        return sorted(self._tool_names)
+
+    def is_profiled(self, tool_name: str) -> bool:
+        return self.enabled and (self._all_tools or tool_name in self._tool_names)
+
+    @contextmanager
+    def profile(self, tool_name: str, profile_dir: str) -> Iterator[ProfileCapture]:
+        """Profile the code executed within the context.
+
+        The capture's path and hotspots are filled in when the context is exited (also upon exceptions).
+        If another execution is being profiled concurrently, the code is executed without profiling.
+
+        :param tool_name: name of the tool being executed (used in the file name)
+        :param profile_dir: directory in which to write the profile file
+        :return: the capture
+        """
+        capture = ProfileCapture()
+        if not self._lock.acquire(blocking=False):
+            log.warning(f"Not profiling {tool_name}, since another tool execution is being profiled")
+            yield capture
+            return
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # another profiler is active (e.g. a debugger)
+                log.warning(f"Not profiling {tool_name}: {e}")
+                yield capture
+                return
+            try:
+                yield capture
+            finally:
+                profiler.disable()
+                self._save(profiler, tool_name, profile_dir, capture)
+        finally:
+            self._lock.release()
+
+    def _save(self, profiler: cProfile.Profile, tool_name: str, profile_dir: str, capture: ProfileCapture) -> None:
+        stats = pstats.Stats(profiler)
+        capture.hotspots = self._get_hotspots(stats)
+
+        file_name = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', tool_name)}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.prof"
+        path = os.path.join(profile_dir, file_name)
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            stats.dump_stats(path)
+            capture.path = path
+            log.info(f"Profile of {tool_name} written to {path}")
+        except OSError as e:
+            log.error(f"Failed to write profile of {tool_name} to {path}: {e}")
+
+    def _get_hotspots(self, stats: pstats.Stats) -> list[dict[str, Any]]:
+        entries = stats.stats  # type: ignore[attr-defined]
+        top = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)[: self._top_n]
+        return [
+            {
+                "function": f"{os.path.basename(file)}:{line}({function})" if line else function,
+                "calls": num_calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+            for (file, line, function), (_, num_calls, total_time, cumulative_time, _) in top
+        ]
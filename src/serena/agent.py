@@ -10,6 +10,7 @@ import threading
 import webbrowser
 from collections.abc import Callable
 from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from logging import Logger
 from typing import TYPE_CHECKING, Any, Optional, TypeVar
 
@@ -20,14 +21,19 @@ from interprompt.jinja_template import JinjaTemplate
 from serena import serena_version
 from serena.analytics import RegisteredTokenCountEstimator, ToolUsageStats
 from serena.config.context_mode import RegisteredContext, SerenaAgentContext, SerenaAgentMode
-from serena.config.serena_config import SerenaConfig, ToolInclusionDefinition, ToolSet
+from serena.config.serena_config import SerenaConfig, SerenaPaths, ToolInclusionDefinition, ToolSet
 from serena.dashboard import SerenaDashboardAPI
 from serena.project import Project
 from serena.prompt_factory import SerenaPromptFactory
+from serena.symbol_cache_warmer import SymbolCacheWarmer
 from serena.tools import ActivateProjectTool, GetCurrentConfigTool, Tool, ToolMarker, ToolRegistry
 from serena.util.inspection import iter_subclasses
 from serena.util.logging import MemoryLogHandler
+from serena.util.metrics import metrics
+from serena.util.shell import ShellSessionPool
+from serena.util.tracing import InMemoryTraceExporter, JsonFileTraceExporter, TraceExporter, tracer
 from solidlsp import SolidLanguageServer
+from solidlsp.lsp_protocol_handler.lsp_types import FileChangeType
 
 if TYPE_CHECKING:
     from serena.gui_log_viewer import GuiLogViewer
@@ -39,6 +45,10 @@ TTool = TypeVar("TTool", bound="Tool")
 T = TypeVar("T")
 SUCCESS_RESULT = "OK"
 
+_language_server_restarts = metrics.counter(
+    "serena_language_server_restarts_total", "Number of times a language server was replaced by a new one (e.g. after it crashed)"
+)
+
 
 class ProjectNotFoundError(Exception):
     pass
@@ -89,6 +99,13 @@ class SerenaAgent:
         # project-specific instances, which will be initialized upon project activation
         self._active_project: Project | None = None
         self.language_server: SolidLanguageServer | None = None
+        self._language_server_lock = threading.RLock()
+        self._language_server_ready: Future | None = None
+        """
+        future which completes once the language server that is being initialized in the background (upon project activation)
+        is ready; None if no background initialization was started
+        """
+        self._symbol_cache_warmer: SymbolCacheWarmer | None = None
 
         # adjust log level
         serena_log_level = self.serena_config.log_level
@@ -133,12 +150,32 @@ class SerenaAgent:
         if self.serena_config.record_tool_usage_stats:
             token_count_estimator = RegisteredTokenCountEstimator[self.serena_config.token_count_estimator]
             log.info(f"Tool usage statistics recording is enabled with token count estimator: {token_count_estimator.name}.")
-            self._tool_usage_stats = ToolUsageStats(token_count_estimator)
+            self._tool_usage_stats = ToolUsageStats(token_count_estimator, sample_rate=self.serena_config.token_count_sample_rate)
+
+        # pool of long-lived shell sessions for shell command execution (if enabled)
+        self.shell_session_pool: ShellSessionPool | None = None
+        if self.serena_config.persistent_shell_sessions:
+            self.shell_session_pool = ShellSessionPool()
+
+        # tracing of tool executions (if enabled)
+        self._trace_exporters: list[TraceExporter] = []
+        self._recent_traces: InMemoryTraceExporter | None = None
+        if self.serena_config.trace_tool_executions:
+            trace_file_path = SerenaPaths().get_next_log_file_path("traces", extension="jsonl")
+            log.info(f"Tracing of tool executions is enabled; traces are written to {trace_file_path}")
+            self._recent_traces = InMemoryTraceExporter()
+            self._trace_exporters = [JsonFileTraceExporter(trace_file_path), self._recent_traces]
+            for exporter in self._trace_exporters:
+                tracer.add_exporter(exporter)
 
         # start the dashboard (web frontend), registering its log handler
         if self.serena_config.web_dashboard:
             self._dashboard_thread, port = SerenaDashboardAPI(
-                get_memory_log_handler(), tool_names, agent=self, tool_usage_stats=self._tool_usage_stats
+                get_memory_log_handler(),
+                tool_names,
+                agent=self,
+                tool_usage_stats=self._tool_usage_stats,
+                recent_traces=self._recent_traces,
             ).run_in_thread()
             dashboard_url = f"http://127.0.0.1:{port}/dashboard/index.html"
             log.info("Serena web dashboard started at %s", dashboard_url)
@@ -174,6 +211,11 @@ class SerenaAgent:
         self._task_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SerenaAgentExecutor")
         self._task_executor_lock = threading.Lock()
         self._task_executor_task_index = 1
+        self._num_pending_tasks = 0
+
+        # create a separate executor for starting the language server, such that tools which do not require the language
+        # server need not wait for its (potentially lengthy) startup
+        self._ls_init_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SerenaLSInit")
 
         # Initialize the prompt factory
         self.prompt_factory = SerenaPromptFactory()
@@ -189,6 +231,11 @@ class SerenaAgent:
 
         # Initialize ToolExecutionEngine (Epic-001 Phase 0)
         self.execution_engine = ToolExecutionEngine(agent=self, enable_constraints=False)
+        profiled_tools = os.environ.get("SERENA_PROFILED_TOOLS")
+        if profiled_tools is not None:
+            self.execution_engine.profiler.set_tool_names(profiled_tools.split(","))
+        elif self.serena_config.profiled_tools:
+            self.execution_engine.profiler.set_tool_names(self.serena_config.profiled_tools)
 
         # activate a project configuration (if provided or if there is only a single project available)
         if project is not None:
@@ -245,10 +292,9 @@ class SerenaAgent:
         """
         tool_name = tool.get_name()
         if self._tool_usage_stats is not None:
-            input_str = str(input_kwargs)
-            output_str = str(tool_result)
             log.debug(f"Recording tool usage for tool '{tool_name}'")
-            self._tool_usage_stats.record_tool_usage(tool_name, input_str, output_str)
+            # conversion to strings and token estimation take place in the background
+            self._tool_usage_stats.record_tool_usage(tool_name, input_kwargs, tool_result)
         else:
             log.debug(f"Tool usage statistics recording is disabled, not recording usage of '{tool_name}'.")
 
@@ -375,7 +421,24 @@ class SerenaAgent:
                     return task()
 
             log.info(f"Scheduling {task_name}")
-            return self._task_executor.submit(task_execution_wrapper)
+            self._num_pending_tasks += 1
+            future = self._task_executor.submit(task_execution_wrapper)
+
+        def on_task_done(_future: Future) -> None:
+            # also called for tasks which are cancelled before they start
+            with self._task_executor_lock:
+                self._num_pending_tasks -= 1
+
+        # added outside the lock, since the callback is invoked immediately if the task has already completed
+        future.add_done_callback(on_task_done)
+        return future
+
+    def get_num_pending_tasks(self) -> int:
+        """
+        :return: the number of tasks which were issued but have not yet completed (including the task being executed)
+        """
+        with self._task_executor_lock:
+            return self._num_pending_tasks
 
     def execute_task(self, task: Callable[[], T]) -> T:
         """
@@ -405,9 +468,11 @@ class SerenaAgent:
                 self.reset_language_server()
                 assert self.language_server is not None
 
-        # initialize the language server in the background (if in language server mode)
+        # initialize the language server in the background (if in language server mode);
+        # tools requiring the language server will wait for it via wait_for_language_server
         if self.is_using_language_server():
-            self.issue_task(init_language_server)
+            log.info(f"Scheduling language server initialization for {project.project_name}")
+            self._language_server_ready = self._ls_init_executor.submit(init_language_server)
 
         if self._project_activation_callback is not None:
             self._project_activation_callback()
@@ -517,17 +582,101 @@ class SerenaAgent:
     def is_language_server_running(self) -> bool:
         return self.language_server is not None and self.language_server.is_running()
 
+    def _get_language_server_timeout(self) -> float | None:
+        tool_timeout = self.serena_config.tool_timeout
+        if tool_timeout is None or tool_timeout < 0:
+            return None
+        if tool_timeout < 10:
+            raise ValueError(f"Tool timeout must be at least 10 seconds, but is {tool_timeout} seconds")
+        return tool_timeout - 5  # the LS timeout is for a single call, it should be smaller than the tool timeout
+
+    def wait_for_language_server(self) -> SolidLanguageServer:
+        """
+        Waits for the language server of the active project to become ready, (re)starting it if it is not running.
+        If the language server is still being initialized in the background, this waits at most as long as
+        the language server timeout (which is derived from the tool timeout).
+
+        :return: the running language server
+        """
+        ready = self._language_server_ready
+        if ready is not None and not ready.done():
+            ready_timeout = self._get_language_server_timeout()
+            log.info(f"Waiting for the language server to become ready (timeout: {ready_timeout} s) ...")
+            try:
+                ready.result(timeout=ready_timeout)
+            except FutureTimeoutError as e:
+                raise TimeoutError(
+                    f"The language server did not become ready within {ready_timeout} seconds; it is still starting up. "
+                    "Please retry later; tools which do not require the language server can be used in the meantime."
+                ) from e
+            except Exception as e:
+                log.error(f"Background initialization of the language server failed: {e}", exc_info=e)
+
+        with self._language_server_lock:
+            if not self.is_language_server_running():
+                log.info("Language server is not running. Starting it ...")
+                self.reset_language_server()
+            assert self.language_server is not None
+            return self.language_server
+
+    def get_language_server_for_index_reads(self) -> SolidLanguageServer | None:
+        """
+        Determines whether read-only symbol queries shall be answered from the persisted symbol index (document symbol cache)
+        because the language server is currently unavailable. If the language server has terminated and is not being
+        restarted yet, a restart is initiated in the background.
+
+        :return: the language server instance whose symbol index shall be used if the language server is unavailable
+            (i.e. starting up or restarting); None if regular language server requests shall be used
+        """
+        if not self.is_using_language_server() or self.language_server is None:
+            return None
+        # during a project switch, the previous project's language server remains set until the new one is started;
+        # its symbol index must not be used to answer queries for the newly activated project
+        active_project = self._active_project
+        if active_project is None or os.path.abspath(self.language_server.repository_root_path) != os.path.abspath(
+            active_project.project_root
+        ):
+            return None
+        ready = self._language_server_ready
+        if ready is not None and not ready.done():
+            return self.language_server
+        if not self.is_language_server_running():
+            log.info("Language server is not running; restarting it in the background")
+            self._language_server_ready = self._ls_init_executor.submit(self.reset_language_server)
+            return self.language_server
+        return None
+
+    def notify_file_modified(self, relative_path: str, change_type: FileChangeType = FileChangeType.Changed) -> None:
+        """
+        Informs the language server (if any) about a file in the active project that was modified on disk,
+        such that its state and the cached symbols of the file are updated immediately.
+
+        :param relative_path: the relative path of the file
+        :param change_type: the type of the change
+        """
+        if not self.is_using_language_server() or self.language_server is None:
+            return
+        try:
+            self.language_server.notify_file_changed(relative_path, change_type)
+        except Exception as e:
+            log.warning(f"Failed to notify the language server about the modification of {relative_path}: {e}")
+
     def reset_language_server(self) -> None:
         """
         Starts/resets the language server for the current project
         """
-        tool_timeout = self.serena_config.tool_timeout
-        if tool_timeout is None or tool_timeout < 0:
-            ls_timeout = None
-        else:
-            if tool_timeout < 10:
-                raise ValueError(f"Tool timeout must be at least 10 seconds, but is {tool_timeout} seconds")
-            ls_timeout = tool_timeout - 5  # the LS timeout is for a single call, it should be smaller than the tool timeout
+        with self._language_server_lock:
+            self._reset_language_server()
+
+    def _reset_language_server(self) -> None:
+        ls_timeout = self._get_language_server_timeout()
+        if self.language_server is not None:
+            _language_server_restarts.inc()
+
+        # stop the symbol cache warmer, which is bound to the current language server
+        if self._symbol_cache_warmer is not None:
+            self._symbol_cache_warmer.stop(timeout=5)
+            self._symbol_cache_warmer = None
 
         # stop the language server if it is running
         if self.is_language_server_running():
@@ -551,6 +700,12 @@ class SerenaAgent:
                 f"Failed to start the language server for {self._active_project.project_name} at {self._active_project.project_root}"
             )
 
+        # (re)start pre-warming of the symbol cache, which is bound to the new language server
+        if self.serena_config.symbol_cache_prewarming:
+            log.info("Starting background pre-warming of the symbol cache")
+            self._symbol_cache_warmer = SymbolCacheWarmer(self.language_server)
+            self._symbol_cache_warmer.start()
+
     def get_tool(self, tool_class: type[TTool]) -> TTool:
         return self._all_tools[tool_class]  # type: ignore
 
@@ -569,6 +724,11 @@ class SerenaAgent:
             assert self.language_server is not None
             self.language_server.save_cache()
             self.language_server.stop()
+        if self.shell_session_pool is not None:
+            log.info("Closing shell sessions ...")
+            self.shell_session_pool.close()
+        for exporter in self._trace_exporters:
+            tracer.remove_exporter(exporter)
         if self._gui_log_viewer:
             log.info("Stopping the GUI log window ...")
             self._gui_log_viewer.stop()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import logging
+import math
+import queue
+import random
 import threading
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from copy import copy
 from dataclasses import asdict, dataclass
 from enum import Enum
+from typing import Any
 
 from anthropic.types import MessageParam, MessageTokensCount
 from dotenv import load_dotenv
@@ -69,12 +73,28 @@ class AnthropicTokenCount(TokenCountEstimator):
         return self._send_count_tokens_request(text).input_tokens
 
 
+class ByteLengthTokenCountEstimator(TokenCountEstimator):
+    """
+    Fast approximation based on the length of the UTF-8 encoded text, requiring neither data files nor network access.
+    """
+
+    def __init__(self, bytes_per_token: float = 4.0):
+        """
+        :param bytes_per_token: the assumed average number of bytes per token (about 4 for English text and code)
+        """
+        self._bytes_per_token = bytes_per_token
+
+    def estimate_token_count(self, text: str) -> int:
+        return math.ceil(len(text.encode("utf-8", errors="replace")) / self._bytes_per_token)
+
+
 _registered_token_estimator_instances_cache: dict[RegisteredTokenCountEstimator, TokenCountEstimator] = {}
 
 
 class RegisteredTokenCountEstimator(Enum):
     TIKTOKEN_GPT4O = "TIKTOKEN_GPT4O"
     ANTHROPIC_CLAUDE_SONNET_4 = "ANTHROPIC_CLAUDE_SONNET_4"
+    BYTE_LENGTH = "BYTE_LENGTH"
 
     @classmethod
     def get_valid_names(cls) -> list[str]:
@@ -89,6 +109,8 @@ class RegisteredTokenCountEstimator(Enum):
                 return TiktokenCountEstimator(model_name="gpt-4o")
             case RegisteredTokenCountEstimator.ANTHROPIC_CLAUDE_SONNET_4:
                 return AnthropicTokenCount(model_name="claude-sonnet-4-20250514")
+            case RegisteredTokenCountEstimator.BYTE_LENGTH:
+                return ByteLengthTokenCountEstimator()
             case _:
                 raise ValueError(f"Unknown token count estimator: {self.value}")
 
@@ -103,13 +125,46 @@ class RegisteredTokenCountEstimator(Enum):
 class ToolUsageStats:
     """
     A class to record and manage tool usage statistics.
+
+    By default, token counts are estimated by a background worker, such that recording the usage does not delay
+    the tool's result (the statistics are thus eventually consistent).
+    If the worker falls behind (i.e. its queue is full), or if a call is not selected for precise estimation
+    (see `sample_rate`), the token counts of the call are estimated based on the length of the texts,
+    using the ratio of tokens to bytes observed in precisely estimated calls.
     """
 
-    def __init__(self, token_count_estimator: RegisteredTokenCountEstimator = RegisteredTokenCountEstimator.TIKTOKEN_GPT4O):
-        self._token_count_estimator = token_count_estimator.load_estimator()
+    def __init__(
+        self,
+        token_count_estimator: RegisteredTokenCountEstimator = RegisteredTokenCountEstimator.TIKTOKEN_GPT4O,
+        background: bool = True,
+        max_queue_size: int = 1000,
+        sample_rate: float = 1.0,
+    ):
+        """
+        :param token_count_estimator: the estimator to use for precise token counts
+        :param background: whether to estimate token counts in a background thread; if False, they are estimated
+            synchronously when recording the usage
+        :param max_queue_size: the maximum number of calls waiting to be processed by the background worker
+        :param sample_rate: the fraction of calls (selected at random) for which the token counts are estimated
+            with the given estimator; for all other calls, the byte length heuristic is used
+        """
+        self._registered_token_count_estimator = token_count_estimator
+        self._token_count_estimator: TokenCountEstimator | None = None
         self._token_estimator_name = token_count_estimator.value
+        self._sample_rate = sample_rate
         self._tool_stats: dict[str, ToolUsageStats.Entry] = defaultdict(ToolUsageStats.Entry)
         self._tool_stats_lock = threading.Lock()
+        # observed totals of precisely estimated calls, used to calibrate the byte length heuristic
+        self._sampled_tokens = 0
+        self._sampled_bytes = 0
+
+        self._queue: queue.Queue[tuple[str, Any, Any, bool]] | None = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            # the estimator is loaded by the worker, since loading may take a while (e.g. downloading data files)
+            threading.Thread(target=self._process_queue, name="ToolUsageStatsWorker", daemon=True).start()
+        else:
+            self._load_estimator()
 
     @property
     def token_estimator_name(self) -> str:
@@ -132,8 +187,22 @@ class ToolUsageStats:
             self.input_tokens += input_tokens
             self.output_tokens += output_tokens
 
+    def _load_estimator(self) -> TokenCountEstimator:
+        if self._token_count_estimator is None:
+            try:
+                self._token_count_estimator = self._registered_token_count_estimator.load_estimator()
+            except Exception as e:
+                log.error(f"Could not load token count estimator {self._token_estimator_name}, using byte length heuristic instead: {e}")
+                self._token_count_estimator = ByteLengthTokenCountEstimator()
+        return self._token_count_estimator
+
     def _estimate_token_count(self, text: str) -> int:
-        return self._token_count_estimator.estimate_token_count(text)
+        return self._load_estimator().estimate_token_count(text)
+
+    def _estimate_token_count_heuristically(self, num_bytes: int) -> int:
+        with self._tool_stats_lock:
+            tokens_per_byte = self._sampled_tokens / self._sampled_bytes if self._sampled_bytes > 0 else 0.25
+        return math.ceil(num_bytes * tokens_per_byte)
 
     def get_stats(self, tool_name: str) -> ToolUsageStats.Entry:
         """
@@ -142,12 +211,63 @@ class ToolUsageStats:
         with self._tool_stats_lock:
             return copy(self._tool_stats[tool_name])
 
-    def record_tool_usage(self, tool_name: str, input_str: str, output_str: str) -> None:
-        input_tokens = self._estimate_token_count(input_str)
-        output_tokens = self._estimate_token_count(output_str)
+    def record_tool_usage(self, tool_name: str, tool_input: Any, tool_output: Any) -> None:
+        """
+        Record a call of a tool.
+
+        :param tool_name: the name of the tool
+        :param tool_input: the tool's input; converted to a string (in the background, if enabled) for token estimation
+        :param tool_output: the tool's output; converted to a string (in the background, if enabled) for token estimation
+        """
+        precise = self._sample_rate >= 1.0 or random.random() < self._sample_rate
+        if self._queue is None:
+            self._process_call(tool_name, tool_input, tool_output, precise)
+            return
+        try:
+            self._queue.put_nowait((tool_name, tool_input, tool_output, precise))
+        except queue.Full:
+            log.debug(f"Token count queue is full, estimating token counts of '{tool_name}' call heuristically")
+            self._process_call(tool_name, tool_input, tool_output, False)
+
+    def _process_queue(self) -> None:
+        assert self._queue is not None
+        self._load_estimator()
+        while True:
+            tool_name, tool_input, tool_output, precise = self._queue.get()
+            try:
+                self._process_call(tool_name, tool_input, tool_output, precise)
+            except Exception as e:
+                log.error(f"Error recording usage of tool '{tool_name}': {e}", exc_info=e)
+            finally:
+                self._queue.task_done()
+
+    def _process_call(self, tool_name: str, tool_input: Any, tool_output: Any, precise: bool) -> None:
+        input_str = str(tool_input)
+        output_str = str(tool_output)
+        num_bytes = len(input_str.encode("utf-8", errors="replace")), len(output_str.encode("utf-8", errors="replace"))
+        if precise:
+            try:
+                input_tokens = self._estimate_token_count(input_str)
+                output_tokens = self._estimate_token_count(output_str)
+            except Exception as e:
+                log.warning(f"Token count estimation failed for '{tool_name}', using byte length heuristic: {e}")
+                precise = False
+        if not precise:
+            input_tokens = self._estimate_token_count_heuristically(num_bytes[0])
+            output_tokens = self._estimate_token_count_heuristically(num_bytes[1])
         with self._tool_stats_lock:
             entry = self._tool_stats[tool_name]
             entry.update_on_call(input_tokens, output_tokens)
+            if precise:
+                self._sampled_tokens += input_tokens + output_tokens
+                self._sampled_bytes += sum(num_bytes)
+
+    def flush(self) -> None:
+        """
+        Wait until all recorded calls have been processed by the background worker.
+        """
+        if self._queue is not None:
+            self._queue.join()
 
     def get_tool_stats_dict(self) -> dict[str, dict[str, int]]:
         with self._tool_stats_lock:
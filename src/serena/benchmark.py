@@ -0,0 +1,491 @@
+"""
+Performance benchmarks of language server operations and symbolic tools on the bundled test repositories.
+
+For every language, the test repository is copied to a temporary directory (such that neither cached symbols nor
+symbolic edits affect the original) and a Serena agent is started for the copy. The individual operations are
+exposed as methods of `LanguageBenchmark`, such that they can be timed either by `run_benchmarks`
+(used by `serena bench`) or by pytest-benchmark (see test/benchmarks).
+"""
+
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Self
+
+from sensai.util.string import ToStringMixin
+
+from serena import serena_version
+from serena.agent import SerenaAgent
+from serena.config.serena_config import ProjectConfig, RegisteredProject, SerenaConfig
+from serena.constants import SERENA_MANAGED_DIR_NAME
+from serena.project import Project
+from serena.tools import FindReferencingSymbolsTool, FindSymbolTool, GetSymbolsOverviewTool, ReplaceSymbolBodyTool, SearchForPatternTool
+from solidlsp import SolidLanguageServer
+from solidlsp.ls_config import Language
+
+log = logging.getLogger(__name__)
+
+CASE_LS_COLD_START = "ls_cold_start"
+CASE_FULL_SYMBOL_TREE_COLD = "full_symbol_tree_cold"
+CASE_FULL_SYMBOL_TREE_WARM = "full_symbol_tree_warm"
+CASE_FIND_SYMBOL = "find_symbol"
+CASE_FIND_REFERENCING_SYMBOLS = "find_referencing_symbols"
+CASE_SEARCH_FOR_PATTERN = "search_for_pattern"
+CASE_GET_SYMBOLS_OVERVIEW = "get_symbols_overview"
+CASE_CACHE_SAVE = "cache_save"
+CASE_CACHE_LOAD = "cache_load"
+CASE_SYMBOLIC_EDIT = "symbolic_edit"
+
+# LSP symbol kinds which are preferred as benchmark targets: class, method, constructor, function
+_PREFERRED_SYMBOL_KINDS = (5, 6, 9, 12)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    :param values: the values (need not be sorted)
+    :param q: the percentile in [0, 100]
+    :return: the percentile, linearly interpolated between the closest ranks (0.0 for no values)
+    """
+    if not values:
+        return 0.0
+    sorted_values = sorted(values)
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+@dataclass
+class TimingStats:
+    """Durations (in seconds) of the repetitions of a benchmark case"""
+
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.samples, 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.samples, 95)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "n": len(self.samples),
+            "p50": self.p50,
+            "p95": self.p95,
+            "mean": sum(self.samples) / len(self.samples) if self.samples else 0.0,
+            "min": min(self.samples, default=0.0),
+            "max": max(self.samples, default=0.0),
+            "samples": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        return cls(samples=list(data.get("samples", [])))
+
+
+@dataclass
+class LanguageBenchmarkResult:
+    language: str
+    timings: dict[str, TimingStats] = field(default_factory=dict)
+    peak_rss_bytes: int | None = None
+    """the peak resident set size of the language server (including child processes)"""
+    cache_size_bytes: int | None = None
+    """the size of the document symbols cache file"""
+    cache_entries: int | None = None
+    error: str | None = None
+    """the error which aborted the benchmark (if any); timings of the cases completed before are retained"""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timings": {case: stats.to_dict() for case, stats in self.timings.items()},
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "cache_size_bytes": self.cache_size_bytes,
+            "cache_entries": self.cache_entries,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, language: str, data: dict[str, Any]) -> Self:
+        return cls(
+            language=language,
+            timings={case: TimingStats.from_dict(stats) for case, stats in data.get("timings", {}).items()},
+            peak_rss_bytes=data.get("peak_rss_bytes"),
+            cache_size_bytes=data.get("cache_size_bytes"),
+            cache_entries=data.get("cache_entries"),
+            error=data.get("error"),
+        )
+
+
+@dataclass
+class Regression:
+    language: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+    def __str__(self) -> str:
+        return f"{self.language}/{self.metric}: {self.baseline:.4g} -> {self.current:.4g} ({(self.ratio - 1) * 100:+.0f}%)"
+
+
+@dataclass
+class BenchmarkReport:
+    results: dict[str, LanguageBenchmarkResult] = field(default_factory=dict)
+    environment: dict[str, Any] = field(
+        default_factory=lambda: {
+            "serena_version": serena_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        }
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"environment": self.environment, "languages": {lang: result.to_dict() for lang, result in self.results.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        return cls(
+            results={lang: LanguageBenchmarkResult.from_dict(lang, result) for lang, result in data.get("languages", {}).items()},
+            environment=data.get("environment", {}),
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def compare(self, baseline: "BenchmarkReport", tolerance: float = 0.25, min_delta_seconds: float = 0.005) -> list[Regression]:
+        """
+        Compares this report with a baseline report. Only languages and cases contained in both reports are compared.
+
+        :param baseline: the baseline report
+        :param tolerance: the relative increase (e.g. 0.25 for 25%) above which a metric is considered to have regressed
+        :param min_delta_seconds: the minimum absolute increase of a latency for it to be considered a regression
+            (such that noise in very fast operations is not reported)
+        :return: the regressions
+        """
+        regressions: list[Regression] = []
+        for language, result in self.results.items():
+            baseline_result = baseline.results.get(language)
+            if baseline_result is None:
+                continue
+            for case, stats in result.timings.items():
+                baseline_stats = baseline_result.timings.get(case)
+                if baseline_stats is None or not stats.samples or not baseline_stats.samples:
+                    continue
+                for metric in ("p50", "p95"):
+                    current, previous = getattr(stats, metric), getattr(baseline_stats, metric)
+                    if current > previous * (1 + tolerance) and current - previous > min_delta_seconds:
+                        regressions.append(Regression(language, f"{case}.{metric}", previous, current))
+            for metric in ("peak_rss_bytes", "cache_size_bytes"):
+                current_value, baseline_value = getattr(result, metric), getattr(baseline_result, metric)
+                if current_value is not None and baseline_value and current_value > baseline_value * (1 + tolerance):
+                    regressions.append(Regression(language, metric, baseline_value, current_value))
+        return regressions
+
+    def format_table(self) -> str:
+        lines = []
+        for language, result in self.results.items():
+            lines.append(f"{language}:")
+            for case, stats in result.timings.items():
+                lines.append(f"  {case:<28} n={len(stats.samples):<3} p50={stats.p50 * 1000:9.1f} ms  p95={stats.p95 * 1000:9.1f} ms")
+            if result.peak_rss_bytes is not None:
+                lines.append(f"  {'peak LS RSS':<28} {result.peak_rss_bytes / 2**20:.1f} MiB")
+            if result.cache_size_bytes is not None:
+                lines.append(f"  {'symbol cache':<28} {result.cache_size_bytes / 2**10:.1f} KiB ({result.cache_entries} entries)")
+            if result.error is not None:
+                lines.append(f"  ERROR: {result.error}")
+        return "\n".join(lines)
+
+
+class _RssSampler:
+    """Samples the memory usage of the agent's language server in a background thread"""
+
+    def __init__(self, agent: SerenaAgent, interval: float = 0.1):
+        self._agent = agent
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="BenchmarkRssSampler")
+        self.peak_rss: int | None = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.sample()
+
+    def sample(self) -> None:
+        language_server = self._agent.language_server
+        rss = language_server.get_process_memory_usage() if language_server is not None else None
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+class LanguageBenchmark(ToStringMixin):
+    """
+    Runs the benchmark operations for a single language on a temporary copy of the language's test repository.
+    Use as a context manager (or call `setup` and `teardown`).
+    """
+
+    def __init__(self, language: Language, repos_dir: str):
+        """
+        :param language: the language
+        :param repos_dir: the directory containing the test repositories (<repos_dir>/<language>/test_repo)
+        """
+        self.language = language
+        self.source_repo = os.path.join(repos_dir, language.value, "test_repo")
+        if not os.path.isdir(self.source_repo):
+            raise FileNotFoundError(f"No test repository for {language.value} found at {self.source_repo}")
+        self._tmp_dir: str | None = None
+        self._agent: SerenaAgent | None = None
+        self._rss_sampler: _RssSampler | None = None
+        self.target_file = ""
+        """the file containing the target symbol, on which file-level operations are performed"""
+        self.target_symbol = ""
+        """the name path of the symbol on which symbol-level operations are performed"""
+        self._target_symbol_body = ""
+
+    def _tostring_includes(self) -> list[str]:
+        return ["language", "target_file", "target_symbol"]
+
+    def __enter__(self) -> Self:
+        self.setup()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # type: ignore
+        self.teardown()
+
+    @property
+    def agent(self) -> SerenaAgent:
+        assert self._agent is not None, "Benchmark was not set up"
+        return self._agent
+
+    @property
+    def language_server(self) -> SolidLanguageServer:
+        return self.agent.wait_for_language_server()
+
+    @property
+    def peak_rss(self) -> int | None:
+        return self._rss_sampler.peak_rss if self._rss_sampler is not None else None
+
+    def setup(self) -> None:
+        self._tmp_dir = tempfile.mkdtemp(prefix=f"serena_bench_{self.language.value}_")
+        project_root = os.path.join(self._tmp_dir, "test_repo")
+        shutil.copytree(self.source_repo, project_root, ignore=shutil.ignore_patterns(SERENA_MANAGED_DIR_NAME))
+
+        project_name = f"bench_{self.language.value}"
+        project = Project(
+            project_root=project_root,
+            project_config=ProjectConfig(project_name=project_name, language=self.language, ignored_paths=[]),
+        )
+        serena_config = SerenaConfig(gui_log_window_enabled=False, web_dashboard=False, log_level=logging.ERROR)
+        serena_config.projects = [RegisteredProject.from_project_instance(project)]
+        self._agent = SerenaAgent(project=project_name, serena_config=serena_config)
+        self._rss_sampler = _RssSampler(self._agent)
+        self._rss_sampler.start()
+        self.agent.wait_for_language_server()
+        self._select_target()
+
+    def teardown(self) -> None:
+        if self._rss_sampler is not None:
+            self._rss_sampler.stop()
+        if self._agent is not None and self._agent.language_server is not None:
+            self._agent.language_server.stop()
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def _select_target(self) -> None:
+        """
+        Selects the first file (in sorted order) containing a class or function and uses its first such symbol as the target
+        """
+        project = self.agent.get_active_project_or_raise()
+        for relative_path in sorted(project.gather_source_files()):
+            symbols = json.loads(self.get_symbols_overview(relative_path))
+            if not isinstance(symbols, list):
+                continue
+            candidates = [s for s in symbols if s.get("kind") in _PREFERRED_SYMBOL_KINDS]
+            if candidates:
+                self.target_file = relative_path
+                self.target_symbol = candidates[0]["name_path"]
+                break
+        if not self.target_symbol:
+            raise RuntimeError(f"No class or function found in the {self.language.value} test repository")
+        matches = json.loads(self.find_symbol(include_body=True))
+        self._target_symbol_body = matches[0]["body"]
+        log.info(f"Benchmark targets: {self}")
+
+    def _run_tool(self, fn: Callable[[], str]) -> str:
+        return self.agent.execute_task(fn)
+
+    # benchmark operations
+
+    def restart_language_server(self) -> None:
+        self.agent.execute_task(self.agent.reset_language_server)
+
+    def request_full_symbol_tree_cold(self) -> None:
+        language_server = self.language_server
+        language_server.clear_document_symbols_cache()
+        language_server.request_full_symbol_tree()
+
+    def request_full_symbol_tree_warm(self) -> None:
+        self.language_server.request_full_symbol_tree()
+
+    def find_symbol(self, include_body: bool = False) -> str:
+        tool = self.agent.get_tool(FindSymbolTool)
+        return self._run_tool(lambda: tool.apply(self.target_symbol, relative_path=self.target_file, include_body=include_body))
+
+    def find_referencing_symbols(self) -> str:
+        tool = self.agent.get_tool(FindReferencingSymbolsTool)
+        return self._run_tool(lambda: tool.apply(self.target_symbol, relative_path=self.target_file))
+
+    def search_for_pattern(self) -> str:
+        tool = self.agent.get_tool(SearchForPatternTool)
+        pattern = self.target_symbol.split("/")[-1]
+        return self._run_tool(lambda: tool.apply(substring_pattern=pattern, restrict_search_to_code_files=True))
+
+    def get_symbols_overview(self, relative_path: str | None = None) -> str:
+        tool = self.agent.get_tool(GetSymbolsOverviewTool)
+        path = relative_path if relative_path is not None else self.target_file
+        return self._run_tool(lambda: tool.apply(path))
+
+    def save_cache(self) -> None:
+        self.language_server.save_cache(force=True)
+
+    def load_cache(self) -> None:
+        self.language_server.load_cache()
+
+    def symbolic_edit(self) -> str:
+        """Replaces the body of the target symbol with its original body (such that repetitions operate on the same code)"""
+        tool = self.agent.get_tool(ReplaceSymbolBodyTool)
+        return self._run_tool(lambda: tool.apply(self.target_symbol, relative_path=self.target_file, body=self._target_symbol_body))
+
+    CASES = (
+        CASE_LS_COLD_START,
+        CASE_FULL_SYMBOL_TREE_COLD,
+        CASE_FULL_SYMBOL_TREE_WARM,
+        CASE_GET_SYMBOLS_OVERVIEW,
+        CASE_FIND_SYMBOL,
+        CASE_FIND_REFERENCING_SYMBOLS,
+        CASE_SEARCH_FOR_PATTERN,
+        CASE_CACHE_SAVE,
+        CASE_CACHE_LOAD,
+        CASE_SYMBOLIC_EDIT,
+    )
+    """the names of all cases, in the order in which they are run"""
+
+    def get_cases(self) -> dict[str, Callable[[], Any]]:
+        """
+        :return: a mapping from case name to the operation, in the order in which the cases shall be run
+        """
+        return {
+            CASE_LS_COLD_START: self.restart_language_server,
+            CASE_FULL_SYMBOL_TREE_COLD: self.request_full_symbol_tree_cold,
+            CASE_FULL_SYMBOL_TREE_WARM: self.request_full_symbol_tree_warm,
+            CASE_GET_SYMBOLS_OVERVIEW: self.get_symbols_overview,
+            CASE_FIND_SYMBOL: self.find_symbol,
+            CASE_FIND_REFERENCING_SYMBOLS: self.find_referencing_symbols,
+            CASE_SEARCH_FOR_PATTERN: self.search_for_pattern,
+            CASE_CACHE_SAVE: self.save_cache,
+            CASE_CACHE_LOAD: self.load_cache,
+            CASE_SYMBOLIC_EDIT: self.symbolic_edit,
+        }
+
+    def run(self, repetitions: int = 10, cold_repetitions: int = 3, cases: Iterable[str] | None = None) -> LanguageBenchmarkResult:
+        """
+        Runs the benchmark cases. Each case is run once for warm-up (except for cold cases) before it is timed.
+
+        :param repetitions: the number of timed repetitions of each case
+        :param cold_repetitions: the number of timed repetitions of the (expensive) cold cases
+        :param cases: the names of the cases to run; if None, run all cases
+        :return: the result
+        """
+        result = LanguageBenchmarkResult(language=self.language.value)
+        cold_cases = (CASE_LS_COLD_START, CASE_FULL_SYMBOL_TREE_COLD)
+        selected_cases = set(cases) if cases is not None else None
+        try:
+            for case, operation in self.get_cases().items():
+                if selected_cases is not None and case not in selected_cases:
+                    continue
+                log.info(f"Running benchmark case {self.language.value}/{case}")
+                is_cold = case in cold_cases
+                if not is_cold:
+                    operation()
+                stats = result.timings[case] = TimingStats()
+                for _ in range(cold_repetitions if is_cold else repetitions):
+                    start_time = time.perf_counter()
+                    operation()
+                    stats.samples.append(time.perf_counter() - start_time)
+            language_server = self.language_server
+            language_server.save_cache(force=True)
+            result.cache_entries = language_server.get_document_symbols_cache_size()
+            if language_server.cache_path.exists():
+                result.cache_size_bytes = language_server.cache_path.stat().st_size
+        except Exception as e:
+            log.error(f"Benchmark for {self.language.value} failed: {e}", exc_info=e)
+            result.error = f"{type(e).__name__}: {e}"
+        if self._rss_sampler is not None:
+            self._rss_sampler.sample()
+        result.peak_rss_bytes = self.peak_rss
+        return result
+
+
+def get_default_repos_dir() -> str:
+    """
+    :return: the directory containing the bundled test repositories, assuming that the current working directory is
+        the root of the Serena repository
+    """
+    return str(Path.cwd() / "test" / "resources" / "repos")
+
+
+def run_benchmarks(
+    languages: Iterable[Language],
+    repos_dir: str | None = None,
+    repetitions: int = 10,
+    cold_repetitions: int = 3,
+    cases: Iterable[str] | None = None,
+) -> BenchmarkReport:
+    """
+    :param languages: the languages whose test repositories to benchmark
+    :param repos_dir: the directory containing the test repositories; if None, use `get_default_repos_dir`
+    :param repetitions: the number of timed repetitions of each case
+    :param cold_repetitions: the number of timed repetitions of the (expensive) cold cases
+    :param cases: the names of the cases to run; if None, run all cases
+    :return: the report containing the results of all languages (a language whose benchmark failed has its error set)
+    """
+    repos_dir = repos_dir if repos_dir is not None else get_default_repos_dir()
+    report = BenchmarkReport()
+    for language in languages:
+        try:
+            with LanguageBenchmark(language, repos_dir) as benchmark:
+                report.results[language.value] = benchmark.run(repetitions=repetitions, cold_repetitions=cold_repetitions, cases=cases)
+        except Exception as e:
+            log.error(f"Failed to set up the benchmark for {language.value}: {e}", exc_info=e)
+            report.results[language.value] = LanguageBenchmarkResult(language=language.value, error=f"{type(e).__name__}: {e}")
+    return report
@@ -14,6 +14,7 @@ from sensai.util.logging import FileLoggerContext, datetime_tag
 from tqdm import tqdm
 
 from serena.agent import SerenaAgent
+from serena.benchmark import BenchmarkReport, LanguageBenchmark, get_default_repos_dir, run_benchmarks
 from serena.config.context_mode import SerenaAgentContext, SerenaAgentMode
 from serena.config.serena_config import ProjectConfig, SerenaConfig, SerenaPaths
 from serena.constants import (
@@ -235,6 +236,77 @@ class TopLevelCommands(AutoRegisteringGroup):
         else:
             print(f"{prefix}\n{instr}\n{postfix}")
 
+    @staticmethod
+    @click.command(
+        "bench",
+        help="Benchmark language server operations and symbolic tools on the bundled test repositories "
+        "(to be run from the root of the Serena repository).",
+    )
+    @click.option(
+        "--language",
+        "-l",
+        "languages",
+        type=click.Choice([lang.value for lang in Language]),
+        multiple=True,
+        default=[Language.PYTHON.value],
+        show_default=True,
+        help="Language whose test repository to benchmark (can be given multiple times).",
+    )
+    @click.option(
+        "--repos-dir", type=click.Path(exists=True, file_okay=False), default=None, help="Directory containing the test repositories."
+    )
+    @click.option("--repetitions", "-n", type=int, default=10, show_default=True, help="Number of timed repetitions of each case.")
+    @click.option("--cold-repetitions", type=int, default=3, show_default=True, help="Number of timed repetitions of cold cases.")
+    @click.option(
+        "--case",
+        "cases",
+        type=click.Choice(list(LanguageBenchmark.CASES)),
+        multiple=True,
+        help="Case to run (can be given multiple times); all cases are run by default.",
+    )
+    @click.option("--output", "-o", type=click.Path(dir_okay=False), default=None, help="Path of the JSON file to write the results to.")
+    @click.option("--baseline", type=click.Path(exists=True, dir_okay=False), default=None, help="JSON file of results to compare with.")
+    @click.option(
+        "--tolerance", type=float, default=0.25, show_default=True, help="Relative increase of a metric which is flagged as a regression."
+    )
+    @click.option("--log-level", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]), default="WARNING")
+    def bench(
+        languages: tuple[str, ...],
+        repos_dir: str | None,
+        repetitions: int,
+        cold_repetitions: int,
+        cases: tuple[str, ...],
+        output: str | None,
+        baseline: str | None,
+        tolerance: float,
+        log_level: str,
+    ) -> None:
+        logging.configure(level=logging.getLevelNamesMapping()[log_level.upper()])
+        report = run_benchmarks(
+            [Language(lang) for lang in languages],
+            repos_dir=repos_dir or get_default_repos_dir(),
+            repetitions=repetitions,
+            cold_repetitions=cold_repetitions,
+            cases=cases or None,
+        )
+        click.echo(report.format_table())
+        if output is not None:
+            report.save(output)
+            click.echo(f"Results written to {output}")
+
+        failed = any(result.error is not None for result in report.results.values())
+        if baseline is not None:
+            regressions = report.compare(BenchmarkReport.load(baseline), tolerance=tolerance)
+            if regressions:
+                click.echo(f"\n{len(regressions)} regression(s) compared to {baseline}:")
+                for regression in regressions:
+                    click.echo(f"  {regression}")
+                failed = True
+            else:
+                click.echo(f"\nNo regressions compared to {baseline}")
+        if failed:
+            sys.exit(1)
+
 
 class ModeCommands(AutoRegisteringGroup):
     """Group for 'mode' subcommands."""
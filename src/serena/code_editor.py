@@ -2,19 +2,23 @@ import json
 import logging
 import os
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Iterator, Reversible
+from collections.abc import Iterable, Iterator, Reversible, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Generic, Optional, TypeVar, cast
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar
 
 from serena.symbol import JetBrainsSymbol, LanguageServerSymbol, LanguageServerSymbolRetriever, PositionInFile, Symbol
 from solidlsp import SolidLanguageServer, ls_types
 from solidlsp.ls import LSPFileBuffer
 from solidlsp.ls_types import extract_text_edits
-from solidlsp.ls_utils import PathUtils, TextUtils
+from solidlsp.ls_utils import InvalidTextLocationError, LineIndex, PathUtils, TextUtils
 
 from .constants import DEFAULT_SOURCE_FILE_ENCODING
 from .project import Project
 from .tools.jetbrains_plugin_client import JetBrainsPluginClient
+from .util.file_system import write_text_file_atomically
 
 if TYPE_CHECKING:
     from .agent import SerenaAgent
@@ -24,6 +28,35 @@ log = logging.getLogger(__name__)
 TSymbol = TypeVar("TSymbol", bound=Symbol)
 
 
+class SymbolicEditOperation(Enum):
+    REPLACE_BODY = "replace_body"
+    INSERT_AFTER = "insert_after"
+    INSERT_BEFORE = "insert_before"
+    DELETE = "delete"
+
+
+@dataclass(kw_only=True)
+class SymbolicEdit:
+    """
+    An edit relative to a symbol, which can be applied together with other edits via `CodeEditor.apply_symbolic_edits`
+    """
+
+    operation: SymbolicEditOperation
+    name_path: str
+    """the name path of the symbol relative to which the edit is to be applied"""
+    relative_path: str
+    """the relative path of the file containing the symbol"""
+    body: str = ""
+    """the new body (for REPLACE_BODY) or the content to insert (for INSERT_AFTER and INSERT_BEFORE)"""
+
+
+@dataclass
+class _TextReplacement:
+    start_pos: PositionInFile
+    end_pos: PositionInFile
+    text: str
+
+
 class CodeEditor(Generic[TSymbol], ABC):
     def __init__(self, project_root: str, agent: Optional["SerenaAgent"] = None) -> None:
         self.project_root = project_root
@@ -52,6 +85,20 @@ class CodeEditor(Generic[TSymbol], ABC):
         def insert_text_at_position(self, pos: PositionInFile, text: str) -> None:
             pass
 
+        def replace_text_between_positions(self, start_pos: PositionInFile, end_pos: PositionInFile, text: str) -> None:
+            """
+            Replaces the text between the given positions with the given text.
+            Subclasses may override this in order to apply the replacement as a single change.
+            """
+            self.delete_text_between_positions(start_pos, end_pos)
+            self.insert_text_at_position(start_pos, text)
+
+        @abstractmethod
+        def apply_text_edits(self, text_edits: list[ls_types.TextEdit]) -> None:
+            """
+            Applies the given non-overlapping text edits, whose ranges refer to the current contents, as a single change.
+            """
+
     @contextmanager
     def _open_file_context(self, relative_path: str) -> Iterator["CodeEditor.EditedFile"]:
         """
@@ -70,6 +117,14 @@ class CodeEditor(Generic[TSymbol], ABC):
             abs_path = os.path.join(self.project_root, relative_path)
             with open(abs_path, "w", encoding=self.encoding) as f:
                 f.write(edited_file.get_contents())
+            self._on_file_written(relative_path)
+
+    def _on_file_written(self, relative_path: str) -> None:
+        """
+        Is called after a file was written by this editor.
+
+        :param relative_path: the relative path of the file
+        """
 
     @abstractmethod
     def _find_unique_symbol(self, name_path: str, relative_file_path: str) -> TSymbol:
@@ -82,6 +137,23 @@ class CodeEditor(Generic[TSymbol], ABC):
         :return: the unique symbol
         """
 
+    def _find_unique_symbols(self, name_paths: Sequence[str], relative_file_path: str) -> list[TSymbol]:
+        """
+        Finds the unique symbols with the given name paths in the given file.
+        Subclasses may override this in order to resolve all symbols against a single snapshot of the file's symbols.
+
+        :param name_paths: the name paths
+        :param relative_file_path: the relative path of the file in which to search for the symbols.
+        :return: the unique symbols (in the order of the name paths)
+        """
+        return [self._find_unique_symbol(name_path, relative_file_path) for name_path in name_paths]
+
+    @staticmethod
+    def _get_replace_body_replacement(symbol: TSymbol, body: str) -> _TextReplacement:
+        # make sure the replacement adds no additional newlines (before or after) - all newlines
+        # and whitespace before/after should remain the same, so we strip it entirely
+        return _TextReplacement(symbol.get_body_start_position_or_raise(), symbol.get_body_end_position_or_raise(), body.strip())
+
     def replace_body(self, name_path: str, relative_file_path: str, body: str) -> None:
         """
         Replaces the body of the symbol with the given name_path in the given file.
@@ -91,16 +163,10 @@ class CodeEditor(Generic[TSymbol], ABC):
         :param body: the new body
         """
         symbol = self._find_unique_symbol(name_path, relative_file_path)
-        start_pos = symbol.get_body_start_position_or_raise()
-        end_pos = symbol.get_body_end_position_or_raise()
+        replacement = self._get_replace_body_replacement(symbol, body)
 
         with self._edited_file_context(relative_file_path) as edited_file:
-            # make sure the replacement adds no additional newlines (before or after) - all newlines
-            # and whitespace before/after should remain the same, so we strip it entirely
-            body = body.strip()
-
-            edited_file.delete_text_between_positions(start_pos, end_pos)
-            edited_file.insert_text_at_position(start_pos, body)
+            edited_file.replace_text_between_positions(replacement.start_pos, replacement.end_pos, replacement.text)
 
     @staticmethod
     def _count_leading_newlines(text: Iterable) -> int:
@@ -118,12 +184,7 @@ class CodeEditor(Generic[TSymbol], ABC):
     def _count_trailing_newlines(cls, text: Reversible) -> int:
         return cls._count_leading_newlines(reversed(text))
 
-    def insert_after_symbol(self, name_path: str, relative_file_path: str, body: str) -> None:
-        """
-        Inserts content after the symbol with the given name in the given file.
-        """
-        symbol = self._find_unique_symbol(name_path, relative_file_path)
-
+    def _get_insert_after_symbol_replacement(self, symbol: TSymbol, body: str) -> _TextReplacement:
         # make sure body always ends with at least one newline
         if not body.endswith("\n"):
             body += "\n"
@@ -149,14 +210,20 @@ class CodeEditor(Generic[TSymbol], ABC):
         # `line += 1`, is replaced
         body = body.rstrip("\r\n") + "\n"
 
-        with self._edited_file_context(relative_file_path) as edited_file:
-            edited_file.insert_text_at_position(PositionInFile(line, col), body)
+        insert_pos = PositionInFile(line, col)
+        return _TextReplacement(insert_pos, insert_pos, body)
 
-    def insert_before_symbol(self, name_path: str, relative_file_path: str, body: str) -> None:
+    def insert_after_symbol(self, name_path: str, relative_file_path: str, body: str) -> None:
         """
-        Inserts content before the symbol with the given name in the given file.
+        Inserts content after the symbol with the given name in the given file.
         """
         symbol = self._find_unique_symbol(name_path, relative_file_path)
+        replacement = self._get_insert_after_symbol_replacement(symbol, body)
+
+        with self._edited_file_context(relative_file_path) as edited_file:
+            edited_file.insert_text_at_position(replacement.start_pos, replacement.text)
+
+    def _get_insert_before_symbol_replacement(self, symbol: TSymbol, body: str) -> _TextReplacement:
         symbol_start_pos = symbol.get_body_start_position_or_raise()
 
         # insert position is the start of line where the symbol is defined
@@ -176,9 +243,19 @@ class CodeEditor(Generic[TSymbol], ABC):
         num_trailing_newlines = max(min_trailing_empty_lines, original_trailing_empty_lines)
         body += "\n" * num_trailing_newlines
 
+        insert_pos = PositionInFile(line=line, col=col)
+        return _TextReplacement(insert_pos, insert_pos, body)
+
+    def insert_before_symbol(self, name_path: str, relative_file_path: str, body: str) -> None:
+        """
+        Inserts content before the symbol with the given name in the given file.
+        """
+        symbol = self._find_unique_symbol(name_path, relative_file_path)
+        replacement = self._get_insert_before_symbol_replacement(symbol, body)
+
         # apply edit
         with self._edited_file_context(relative_file_path) as edited_file:
-            edited_file.insert_text_at_position(PositionInFile(line=line, col=col), body)
+            edited_file.insert_text_at_position(replacement.start_pos, replacement.text)
 
     def insert_at_line(self, relative_path: str, line: int, content: str) -> None:
         """
@@ -217,6 +294,78 @@ class CodeEditor(Generic[TSymbol], ABC):
         with self._edited_file_context(relative_file_path) as edited_file:
             edited_file.delete_text_between_positions(start_pos, end_pos)
 
+    def _get_replacement(self, edit: SymbolicEdit, symbol: TSymbol) -> _TextReplacement:
+        match edit.operation:
+            case SymbolicEditOperation.REPLACE_BODY:
+                return self._get_replace_body_replacement(symbol, edit.body)
+            case SymbolicEditOperation.INSERT_AFTER:
+                return self._get_insert_after_symbol_replacement(symbol, edit.body)
+            case SymbolicEditOperation.INSERT_BEFORE:
+                return self._get_insert_before_symbol_replacement(symbol, edit.body)
+            case SymbolicEditOperation.DELETE:
+                return _TextReplacement(symbol.get_body_start_position_or_raise(), symbol.get_body_end_position_or_raise(), "")
+            case _:
+                raise ValueError(f"Unhandled edit operation: {edit.operation}")
+
+    @staticmethod
+    def _to_text_edit(replacement: _TextReplacement, line_index: LineIndex, contents: str) -> ls_types.TextEdit:
+        start_pos, end_pos, text = replacement.start_pos, replacement.end_pos, replacement.text
+        if start_pos.line == line_index.num_lines and start_pos == end_pos and start_pos.col == 0:
+            # insertion at the line after the end of the text (without trailing newline): insert at the end, adding the newline
+            start_pos = end_pos = PositionInFile(*line_index.get_line_col_from_index(len(contents)))
+            text = "\n" + text
+        return ls_types.TextEdit(range=ls_types.Range(start=start_pos.to_lsp_position(), end=end_pos.to_lsp_position()), newText=text)
+
+    def apply_symbolic_edits(self, edits: Sequence[SymbolicEdit]) -> list[str]:
+        """
+        Applies the given symbolic edits (which may concern several files) as a unit:
+        All target symbols are resolved against the state of the files before any edit is applied (once per file),
+        and the edits are validated (they must not overlap) before any file is modified.
+        The edits for each file are then applied in a single pass with a single write.
+        If any file cannot be written, the files that were already modified are restored.
+
+        :param edits: the edits to apply
+        :return: the relative paths of the modified files
+        """
+        edits_by_file: dict[str, list[SymbolicEdit]] = {}
+        for edit in edits:
+            edits_by_file.setdefault(edit.relative_path, []).append(edit)
+
+        # resolve symbols and validate all edits without modifying any file
+        text_edits_by_file: dict[str, list[ls_types.TextEdit]] = {}
+        original_contents: dict[str, str] = {}
+        for relative_path, file_edits in edits_by_file.items():
+            symbols = self._find_unique_symbols([edit.name_path for edit in file_edits], relative_path)
+            replacements = [self._get_replacement(edit, symbol) for edit, symbol in zip(file_edits, symbols, strict=True)]
+            with self._open_file_context(relative_path) as edited_file:
+                contents = edited_file.get_contents()
+            line_index = LineIndex(contents)
+            text_edits = [self._to_text_edit(replacement, line_index, contents) for replacement in replacements]
+            try:
+                TextUtils.apply_text_edits(contents, text_edits, line_index=line_index)
+            except InvalidTextLocationError as e:
+                raise ValueError(f"The edits for file {relative_path} overlap or are out of range: {e}") from e
+            text_edits_by_file[relative_path] = text_edits
+            original_contents[relative_path] = contents
+
+        # apply the edits, restoring the original contents of all modified files in case of failure
+        modified_relative_paths: list[str] = []
+        try:
+            for relative_path, text_edits in text_edits_by_file.items():
+                with self._edited_file_context(relative_path) as edited_file:
+                    if edited_file.get_contents() != original_contents[relative_path]:
+                        raise ValueError(f"File {relative_path} was modified while the edits were being prepared")
+                    edited_file.apply_text_edits(text_edits)
+                modified_relative_paths.append(relative_path)
+        except Exception:
+            for relative_path in modified_relative_paths:
+                log.info(f"Restoring original contents of {relative_path}")
+                with open(os.path.join(self.project_root, relative_path), "w", encoding=self.encoding) as f:
+                    f.write(original_contents[relative_path])
+                self._on_file_written(relative_path)
+            raise
+        return modified_relative_paths
+
     @abstractmethod
     def rename_symbol(self, name_path: str, relative_file_path: str, new_name: str) -> str:
         """
@@ -253,9 +402,18 @@ class LanguageServerCodeEditor(CodeEditor[LanguageServerSymbol]):
         def insert_text_at_position(self, pos: PositionInFile, text: str) -> None:
             self._lang_server.insert_text_at_position(self._relative_path, pos.line, pos.col, text)
 
+        def replace_text_between_positions(self, start_pos: PositionInFile, end_pos: PositionInFile, text: str) -> None:
+            self.apply_text_edits(
+                [ls_types.TextEdit(range=ls_types.Range(start=start_pos.to_lsp_position(), end=end_pos.to_lsp_position()), newText=text)]
+            )
+
         def apply_text_edits(self, text_edits: list[ls_types.TextEdit]) -> None:
             return self._lang_server.apply_text_edits_to_file(self._relative_path, text_edits)
 
+    def _on_file_written(self, relative_path: str) -> None:
+        # the language server already knows the new contents of the (open) file, but the cached symbols are outdated
+        self._lang_server.notify_file_changed(relative_path)
+
     @contextmanager
     def _open_file_context(self, relative_path: str) -> Iterator["CodeEditor.EditedFile"]:
         with self._lang_server.open_file(relative_path) as file_buffer:
@@ -267,6 +425,21 @@ class LanguageServerCodeEditor(CodeEditor[LanguageServerSymbol]):
 
     def _find_unique_symbol(self, name_path: str, relative_file_path: str) -> LanguageServerSymbol:
         symbol_candidates = self._symbol_retriever.find_by_name(name_path, within_relative_path=relative_file_path)
+        return self._select_unique_symbol(symbol_candidates, name_path, relative_file_path)
+
+    def _find_unique_symbols(self, name_paths: Sequence[str], relative_file_path: str) -> list[LanguageServerSymbol]:
+        symbol_roots = [
+            LanguageServerSymbol(root) for root in self._lang_server.request_full_symbol_tree(within_relative_path=relative_file_path)
+        ]
+        return [
+            self._select_unique_symbol([s for root in symbol_roots for s in root.find(name_path)], name_path, relative_file_path)
+            for name_path in name_paths
+        ]
+
+    @staticmethod
+    def _select_unique_symbol(
+        symbol_candidates: list[LanguageServerSymbol], name_path: str, relative_file_path: str
+    ) -> LanguageServerSymbol:
         if len(symbol_candidates) == 0:
             raise ValueError(f"No symbol with name {name_path} found in file {relative_file_path}")
         if len(symbol_candidates) > 1:
@@ -283,18 +456,7 @@ class LanguageServerCodeEditor(CodeEditor[LanguageServerSymbol]):
         :param workspace_edit: The WorkspaceEdit containing the changes to apply
         :return: List of relative file paths that were modified
         """
-        uri_to_edits = extract_text_edits(workspace_edit)
-        modified_relative_paths = []
-
-        # Handle the 'changes' format (URI -> list of TextEdits)
-        for uri, edits in uri_to_edits.items():
-            file_path = PathUtils.uri_to_path(uri)
-            relative_path = os.path.relpath(file_path, self._lang_server.repository_root_path)
-            modified_relative_paths.append(relative_path)
-            with self._edited_file_context(relative_path) as edited_file:
-                edited_file = cast(LanguageServerCodeEditor.EditedFile, edited_file)
-                edited_file.apply_text_edits(edits)
-        return modified_relative_paths
+        return WorkspaceEditApplier(self._lang_server, self.encoding).apply(workspace_edit)
 
     def rename_symbol(self, name_path: str, relative_file_path: str, new_name: str) -> str:
         symbol = self._find_unique_symbol(name_path, relative_file_path)
@@ -318,6 +480,96 @@ class LanguageServerCodeEditor(CodeEditor[LanguageServerSymbol]):
         return msg
 
 
+class WorkspaceEditApplier:
+    """
+    Applies the text edits of a workspace edit (e.g. the result of a rename request), which may concern many files,
+    directly to the files on disk:
+    All edits are validated (and the new file contents computed) before any file is written; the files are then
+    written atomically, with the work for different files being distributed across a bounded thread pool.
+    Finally, the language server is informed about all modified files at once.
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(self, lang_server: SolidLanguageServer, encoding: str, all_or_nothing: bool = True, max_workers: int = MAX_WORKERS):
+        """
+        :param lang_server: the language server whose project the edits concern
+        :param encoding: the encoding of the files
+        :param all_or_nothing: whether, if writing any of the files fails, the files that were already written shall be restored,
+            such that either all or none of the files are modified; otherwise, successfully written files are retained
+        :param max_workers: the maximum number of threads to use for reading and writing files
+        """
+        self._lang_server = lang_server
+        self._encoding = encoding
+        self._all_or_nothing = all_or_nothing
+        self._max_workers = max_workers
+
+    def _compute_new_contents(self, relative_path: str, edits: list[ls_types.TextEdit]) -> tuple[str, str]:
+        """
+        :return: a pair (original contents, new contents)
+        """
+        abs_path = os.path.join(self._lang_server.repository_root_path, relative_path)
+        with open(abs_path, encoding=self._encoding) as f:
+            contents = f.read()
+        try:
+            return contents, TextUtils.apply_text_edits(contents, edits)
+        except InvalidTextLocationError as e:
+            raise ValueError(f"Invalid edits for file {relative_path}: {e}") from e
+
+    def _write(self, relative_path: str, contents: str) -> None:
+        write_text_file_atomically(os.path.join(self._lang_server.repository_root_path, relative_path), contents, self._encoding)
+
+    def apply(self, workspace_edit: ls_types.WorkspaceEdit) -> list[str]:
+        """
+        :param workspace_edit: the workspace edit to apply
+        :return: the relative paths of the files that were modified
+        """
+        edits_by_file: dict[str, list[ls_types.TextEdit]] = {}
+        for uri, edits in extract_text_edits(workspace_edit).items():
+            relative_path = os.path.relpath(PathUtils.uri_to_path(uri), self._lang_server.repository_root_path)
+            edits_by_file.setdefault(relative_path, []).extend(edits)
+        if not edits_by_file:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(edits_by_file)), thread_name_prefix="WorkspaceEdit") as pool:
+            # validate all edits and compute the new contents before writing anything
+            contents_by_file = dict(
+                zip(edits_by_file, pool.map(self._compute_new_contents, edits_by_file, edits_by_file.values()), strict=True)
+            )
+
+            write_futures = {
+                pool.submit(self._write, relative_path, new_contents): relative_path
+                for relative_path, (_, new_contents) in contents_by_file.items()
+            }
+            written_paths: list[str] = []
+            failures: dict[str, Exception] = {}
+            for future in as_completed(write_futures):
+                relative_path = write_futures[future]
+                try:
+                    future.result()
+                    written_paths.append(relative_path)
+                except Exception as e:
+                    failures[relative_path] = e
+
+            if failures and self._all_or_nothing:
+                log.warning(f"Writing {len(failures)} file(s) failed; restoring {len(written_paths)} already modified file(s)")
+                list(pool.map(lambda p: self._write(p, contents_by_file[p][0]), written_paths))
+                written_paths = []
+
+        written_path_set = set(written_paths)
+        written_paths = [p for p in edits_by_file if p in written_path_set]  # retain the order of the workspace edit
+        if written_paths:
+            self._lang_server.notify_files_changed(written_paths)
+        if failures:
+            failure_descriptions = ", ".join(f"{path} ({e})" for path, e in failures.items())
+            if self._all_or_nothing:
+                raise OSError(f"Failed to write {len(failures)} file(s), no file was modified: {failure_descriptions}")
+            raise OSError(
+                f"Failed to write {len(failures)} file(s), the other {len(written_paths)} file(s) were modified: {failure_descriptions}"
+            )
+        return written_paths
+
+
 class JetBrainsCodeEditor(CodeEditor[JetBrainsSymbol]):
     def __init__(self, project: Project, agent: Optional["SerenaAgent"] = None) -> None:
         self._project = project
@@ -341,6 +593,9 @@ class JetBrainsCodeEditor(CodeEditor[JetBrainsSymbol]):
         def insert_text_at_position(self, pos: PositionInFile, text: str) -> None:
             self._content, _, _ = TextUtils.insert_text_at_position(self._content, pos.line, pos.col, text)
 
+        def apply_text_edits(self, text_edits: list[ls_types.TextEdit]) -> None:
+            self._content = TextUtils.apply_text_edits(self._content, text_edits)
+
     @contextmanager
     def _open_file_context(self, relative_path: str) -> Iterator["CodeEditor.EditedFile"]:
         yield self.EditedFile(relative_path, self._project)
@@ -54,14 +54,15 @@ class SerenaPaths:
         the path to the user's Serena configuration directory, which is typically ~/.serena
         """
 
-    def get_next_log_file_path(self, prefix: str) -> str:
+    def get_next_log_file_path(self, prefix: str, extension: str = "txt") -> str:
         """
         :param prefix: the filename prefix indicating the type of the log file
+        :param extension: the filename extension
         :return: the full path to the log file to use
         """
         log_dir = os.path.join(self.user_config_dir, "logs", datetime.now().strftime("%Y-%m-%d"))
         os.makedirs(log_dir, exist_ok=True)
-        return os.path.join(log_dir, prefix + "_" + datetime_tag() + ".txt")
+        return os.path.join(log_dir, prefix + "_" + datetime_tag() + "." + extension)
 
     # TODO: Paths from constants.py should be moved here
 
@@ -351,6 +352,10 @@ class SerenaConfig(ToolInclusionDefinition, ToStringMixin):
     on the first run, which can take some time and require internet access. Others, like the Anthropic ones, may require an API key
     and rate limits may apply.
     """
+    token_count_sample_rate: float = 1.0
+    """Only relevant if `record_tool_usage` is True; the fraction of tool calls (selected at random) for which tokens are counted
+    with the token count estimator. For the remaining calls, token counts are extrapolated from the length of the input and output.
+    """
     default_max_tool_answer_chars: int = 150_000
     """Used as default for tools where the apply method has a default maximal answer length.
     Even though the value of the max_answer_chars can be changed when calling the tool, it may make sense to adjust this default 
@@ -358,6 +363,30 @@ class SerenaConfig(ToolInclusionDefinition, ToStringMixin):
     """
     ls_specific_settings: dict = field(default_factory=dict)
     """Advanced configuration option allowing to configure language server implementation specific options, see SolidLSPSettings for more info."""
+    symbol_cache_prewarming: bool = False
+    """Whether to fill the document symbol cache in the background once the language server is ready (at low priority, pausing
+    while tool calls are being processed), such that the first project-wide symbol search need not wait for the whole project
+    to be analysed. Recently modified files (according to git) are processed first.
+    """
+    persistent_shell_sessions: bool = False
+    """Whether the shell command tool shall execute commands in long-lived shell sessions (one per working directory) instead of
+    starting a new shell for every command, avoiding the repeated startup cost of the shell. Each command still runs in
+    a subshell, i.e. changes to the working directory or environment do not carry over to subsequent commands.
+    Not supported on Windows (commands are executed in new processes).
+    """
+
+    trace_tool_executions: bool = False
+    """Whether to record a trace for every tool execution, comprising nested spans for the execution phases, language server
+    requests, file searches and cache operations. Traces are written (in the OpenTelemetry OTLP JSON format, one trace per line)
+    to a file in the logs directory and the most recent traces are shown in the web dashboard.
+    """
+
+    profiled_tools: list[str] = field(default_factory=list)
+    """Names of the tools whose executions shall be profiled with cProfile ("*" for all tools). Profiles are written to
+    the project's `.serena/profiles` directory and a summary of the hotspots is added to the execution's audit record.
+    Can be overridden via the environment variable SERENA_PROFILED_TOOLS (comma-separated) and changed at runtime
+    via the web dashboard or the (optional) `set_tool_profiling` tool.
+    """
 
     CONFIG_FILE = "serena_config.yml"
     CONFIG_FILE_DOCKER = "serena_config.docker.yml"  # Docker-specific config file; auto-generated if missing, mounted via docker-compose for user customization
@@ -461,8 +490,13 @@ class SerenaConfig(ToolInclusionDefinition, ToStringMixin):
         instance.token_count_estimator = loaded_commented_yaml.get(
             "token_count_estimator", RegisteredTokenCountEstimator.TIKTOKEN_GPT4O.name
         )
+        instance.token_count_sample_rate = loaded_commented_yaml.get("token_count_sample_rate", 1.0)
         instance.default_max_tool_answer_chars = loaded_commented_yaml.get("default_max_tool_answer_chars", 150_000)
         instance.ls_specific_settings = loaded_commented_yaml.get("ls_specific_settings", {})
+        instance.symbol_cache_prewarming = loaded_commented_yaml.get("symbol_cache_prewarming", False)
+        instance.persistent_shell_sessions = loaded_commented_yaml.get("persistent_shell_sessions", False)
+        instance.trace_tool_executions = loaded_commented_yaml.get("trace_tool_executions", False)
+        instance.profiled_tools = loaded_commented_yaml.get("profiled_tools", [])
 
         # re-save the configuration file if any migrations were performed
         if num_project_migrations > 0:
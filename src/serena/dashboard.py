@@ -11,9 +11,12 @@ from sensai.util import logging
 from serena.analytics import ToolUsageStats
 from serena.constants import SERENA_DASHBOARD_DIR
 from serena.util.logging import MemoryLogHandler
+from serena.util.metrics import CallbackGauge, MetricsRegistry, metrics
+from serena.util.tracing import InMemoryTraceExporter, Span
 
 if TYPE_CHECKING:
     from serena.agent import SerenaAgent
+    from solidlsp import SolidLanguageServer
 
 log = logging.getLogger(__name__)
 
@@ -23,6 +26,11 @@ logging.getLogger("werkzeug").setLevel(logging.WARNING)
 
 class RequestLog(BaseModel):
     start_idx: int = 0
+    wait_timeout: float = 0.0
+    """
+    if no messages starting at start_idx are available yet, the maximum number of seconds to wait for new messages
+    before responding (long polling); capped at `SerenaDashboardAPI.MAX_LOG_WAIT_TIMEOUT`
+    """
 
 
 class ResponseLog(BaseModel):
@@ -39,9 +47,22 @@ class ResponseToolStats(BaseModel):
     stats: dict[str, dict[str, int]]
 
 
+class ProfiledTools(BaseModel):
+    tool_names: list[str]
+
+
+class ResponseTraces(BaseModel):
+    traces: list[dict[str, Any]]
+    """
+    the most recent traces (most recent first), each with the spans in pre-order and their depth, offset and duration
+    """
+
+
 class SerenaDashboardAPI:
     log = logging.getLogger(__qualname__)
 
+    MAX_LOG_WAIT_TIMEOUT = 30.0
+
     def __init__(
         self,
         memory_log_handler: MemoryLogHandler,
@@ -49,6 +70,7 @@ class SerenaDashboardAPI:
         agent: "SerenaAgent",
         shutdown_callback: Callable[[], None] | None = None,
         tool_usage_stats: ToolUsageStats | None = None,
+        recent_traces: InMemoryTraceExporter | None = None,
     ) -> None:
         self._memory_log_handler = memory_log_handler
         self._tool_names = tool_names
@@ -56,6 +78,8 @@ class SerenaDashboardAPI:
         self._shutdown_callback = shutdown_callback
         self._app = Flask(__name__)
         self._tool_usage_stats = tool_usage_stats
+        self._recent_traces = recent_traces
+        self._metrics = self._create_metrics()
         self._setup_routes()
 
     @property
@@ -104,17 +128,37 @@ class SerenaDashboardAPI:
             estimator_name = self._tool_usage_stats.token_estimator_name if self._tool_usage_stats else "unknown"
             return {"token_count_estimator_name": estimator_name}
 
+        @self._app.route("/get_traces", methods=["GET"])
+        def get_traces() -> dict[str, Any]:
+            result = self._get_traces(request.args.get("limit", default=50, type=int))
+            return result.model_dump()
+
+        @self._app.route("/metrics", methods=["GET"])
+        def get_metrics() -> Response:
+            return Response(self._render_metrics(), mimetype="text/plain; version=0.0.4")
+
+        @self._app.route("/get_profiled_tools", methods=["GET"])
+        def get_profiled_tools() -> dict[str, Any]:
+            return ProfiledTools(tool_names=self._agent.execution_engine.profiler.get_tool_names()).model_dump()
+
+        @self._app.route("/set_profiled_tools", methods=["POST"])
+        def set_profiled_tools() -> dict[str, Any]:
+            profiled_tools = ProfiledTools.model_validate(request.get_json())
+            profiler = self._agent.execution_engine.profiler
+            profiler.set_tool_names(profiled_tools.tool_names)
+            return ProfiledTools(tool_names=profiler.get_tool_names()).model_dump()
+
         @self._app.route("/shutdown", methods=["PUT"])
         def shutdown() -> dict[str, str]:
             self._shutdown()
             return {"status": "shutting down"}
 
     def _get_log_messages(self, request_log: RequestLog) -> ResponseLog:
-        all_messages = self._memory_log_handler.get_log_messages()
-        requested_messages = all_messages[request_log.start_idx :] if request_log.start_idx <= len(all_messages) else []
+        wait_timeout = min(max(request_log.wait_timeout, 0.0), self.MAX_LOG_WAIT_TIMEOUT)
+        messages, max_idx = self._memory_log_handler.get_log_messages_since(request_log.start_idx, wait_timeout=wait_timeout)
         project = self._agent.get_active_project()
         project_name = project.project_name if project else None
-        return ResponseLog(messages=requested_messages, max_idx=len(all_messages) - 1, active_project=project_name)
+        return ResponseLog(messages=messages, max_idx=max_idx, active_project=project_name)
 
     def _get_tool_names(self) -> ResponseToolNames:
         return ResponseToolNames(tool_names=self._tool_names)
@@ -129,6 +173,98 @@ class SerenaDashboardAPI:
         if self._tool_usage_stats is not None:
             self._tool_usage_stats.clear()
 
+    def _create_metrics(self) -> MetricsRegistry:
+        """
+        :return: a registry with the metrics which are determined from the agent's state at scrape time
+        """
+        registry = MetricsRegistry()
+
+        def language_server_value(get_value: Callable[["SolidLanguageServer"], int | None]) -> Callable[[], int | None]:
+            def callback() -> int | None:
+                language_server = self._agent.language_server
+                return get_value(language_server) if language_server is not None else None
+
+            return callback
+
+        registry.register(
+            CallbackGauge(
+                "serena_language_server_rss_bytes",
+                "Resident set size of the language server process (including child processes)",
+                language_server_value(lambda ls: ls.get_process_memory_usage()),
+            )
+        )
+        registry.register(
+            CallbackGauge(
+                "solidlsp_document_symbols_cache_entries",
+                "Number of entries in the document symbols cache",
+                language_server_value(lambda ls: ls.get_document_symbols_cache_size()),
+            )
+        )
+        registry.register(
+            CallbackGauge(
+                "serena_task_queue_depth",
+                "Number of issued agent tasks (e.g. tool calls) which have not yet completed",
+                self._agent.get_num_pending_tasks,
+            )
+        )
+        registry.register(
+            CallbackGauge(
+                "serena_log_buffer_messages",
+                "Number of log messages retained for the dashboard",
+                lambda: self._memory_log_handler.get_buffer_size()[0],
+            )
+        )
+        registry.register(
+            CallbackGauge(
+                "serena_log_buffer_chars",
+                "Total length of the log messages retained for the dashboard",
+                lambda: self._memory_log_handler.get_buffer_size()[1],
+            )
+        )
+        return registry
+
+    def _render_metrics(self) -> str:
+        return metrics.render() + self._metrics.render()
+
+    def _get_traces(self, limit: int) -> ResponseTraces:
+        if self._recent_traces is None:
+            return ResponseTraces(traces=[])
+        traces = self._recent_traces.get_traces()[-limit:] if limit > 0 else []
+        return ResponseTraces(traces=[self._trace_to_dict(spans) for spans in reversed(traces)])
+
+    @staticmethod
+    def _trace_to_dict(spans: list[Span]) -> dict[str, Any]:
+        root = spans[0]
+        children: dict[str | None, list[Span]] = {}
+        for span in spans[1:]:
+            children.setdefault(span.parent_span_id, []).append(span)
+
+        span_dicts: list[dict[str, Any]] = []
+
+        def add(span: Span, depth: int) -> None:
+            span_dicts.append(
+                {
+                    "name": span.name,
+                    "depth": depth,
+                    "offset_ms": (span.start_time_ns - root.start_time_ns) / 1e6,
+                    "duration_ms": span.duration_ms,
+                    "is_error": span.is_error,
+                    "attributes": {k: str(v) for k, v in span.attributes.items()},
+                }
+            )
+            for child in children.get(span.span_id, []):
+                add(child, depth + 1)
+
+        add(root, 0)
+        return {
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "start_time": root.start_time_ns / 1e9,
+            "duration_ms": root.duration_ms,
+            "is_error": root.is_error,
+            "spans": span_dicts,
+        }
+
     def _shutdown(self) -> None:
         log.info("Shutting down Serena")
         if self._shutdown_callback:
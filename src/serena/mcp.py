@@ -2,7 +2,9 @@
 The Serena Model Context Protocol (MCP) Server
 """
 
+import asyncio
 import sys
+import threading
 from abc import abstractmethod
 from collections.abc import AsyncIterator, Iterator, Sequence
 from contextlib import asynccontextmanager
@@ -12,7 +14,7 @@ from typing import Any, Literal, cast
 
 import docstring_parser
 from mcp.server.fastmcp import server
-from mcp.server.fastmcp.server import FastMCP, Settings
+from mcp.server.fastmcp.server import Context, FastMCP, Settings
 from mcp.server.fastmcp.tools.base import Tool as MCPTool
 from pydantic_settings import SettingsConfigDict
 from sensai.util import logging
@@ -176,7 +178,7 @@ class SerenaMCPFactory:
         func_name = tool.get_name()
         func_doc = tool.get_apply_docstring() or ""
         func_arg_metadata = tool.get_apply_fn_metadata()
-        is_async = False
+        is_async = True
         parameters = func_arg_metadata.arg_model.model_json_schema()
         if openai_tool_compatible:
             parameters = SerenaMCPFactory._sanitize_for_openai_tools(parameters)
@@ -210,8 +212,27 @@ class SerenaMCPFactory:
                 param_desc = f"{param_doc.description.strip().strip('.') + '.'}"
                 properties["description"] = param_desc[0].upper() + param_desc[1:]
 
-        def execute_fn(**kwargs) -> str:  # type: ignore
-            return tool.apply_ex(log_call=True, catch_exceptions=True, **kwargs)
+        async def execute_fn(mcp_ctx: Context | None = None, **kwargs) -> str:  # type: ignore
+            # The tool is executed by the agent's task executor; we merely await its completion here, such that
+            # the server's event loop remains free to process other requests (including cancellations) and to
+            # forward the progress reported by the tool to the client.
+            loop = asyncio.get_running_loop()
+            cancel_event = threading.Event()
+
+            def progress_callback(progress: float, total: float | None, message: str | None) -> None:
+                if mcp_ctx is not None:
+                    asyncio.run_coroutine_threadsafe(mcp_ctx.report_progress(progress, total, message), loop)
+
+            future = tool.issue_ex(
+                log_call=True, catch_exceptions=True, progress_callback=progress_callback, cancel_event=cancel_event, **kwargs
+            )
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=tool.agent.serena_config.tool_timeout)
+            except (asyncio.CancelledError, TimeoutError):
+                log.info(f"Tool call {func_name} was cancelled or timed out; signalling cancellation to the tool")
+                cancel_event.set()
+                future.cancel()
+                raise
 
         return MCPTool(
             fn=execute_fn,
@@ -220,7 +241,7 @@ class SerenaMCPFactory:
             parameters=parameters,
             fn_metadata=func_arg_metadata,
             is_async=is_async,
-            context_kwarg=None,
+            context_kwarg="mcp_ctx",
             annotations=None,
             title=None,
         )
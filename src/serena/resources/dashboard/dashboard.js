@@ -51,7 +51,7 @@ class Dashboard {
 
         this.toolNames = [];
         this.currentMaxIdx = -1;
-        this.pollInterval = null;
+        this.pollRequest = null;
         this.failureCount = 0;
         this.$logContainer = $('#log-container');
         this.$errorContainer = $('#error-container');
@@ -61,6 +61,11 @@ class Dashboard {
         this.$statsSection = $('#stats-section');
         this.$refreshStats = $('#refresh-stats');
         this.$clearStats = $('#clear-stats');
+        this.$toggleTraces = $('#toggle-traces');
+        this.$tracesSection = $('#traces-section');
+        this.$refreshTraces = $('#refresh-traces');
+        this.$profiledTools = $('#profiled-tools');
+        this.$setProfiledTools = $('#set-profiled-tools');
         this.$themeToggle = $('#theme-toggle');
         this.$themeIcon = $('#theme-icon');
         this.$themeText = $('#theme-text');
@@ -76,12 +81,16 @@ class Dashboard {
         this.$toggleStats.click(this.toggleStats.bind(this));
         this.$refreshStats.click(this.loadStats.bind(this));
         this.$clearStats.click(this.clearStats.bind(this));
+        this.$toggleTraces.click(this.toggleTraces.bind(this));
+        this.$refreshTraces.click(this.loadTraces.bind(this));
+        this.$setProfiledTools.click(this.setProfiledTools.bind(this));
         this.$themeToggle.click(this.toggleTheme.bind(this));
 
         // initialize theme
         this.initializeTheme();
 
         // initialize the application
+        this.loadProfiledTools();
         this.loadToolNames().then(function() {
             // Load logs on page load after tool names are loaded
             self.loadLogs();
@@ -132,7 +141,7 @@ class Dashboard {
                 self.$logContainer.empty();
 
                 // Update max_idx
-                self.currentMaxIdx = response.max_idx || -1;
+                self.currentMaxIdx = response.max_idx;
 
                 // Display each log message
                 if (response.messages && response.messages.length > 0) {
@@ -149,8 +158,8 @@ class Dashboard {
 
                 self.updateTitle(response.active_project);
 
-                // Start periodic polling for new logs
-                self.startPeriodicPolling();
+                // Start polling for new logs
+                self.startPolling();
             },
             error: function(xhr, status, error) {
                 console.error('Error loading logs:', error);
@@ -167,13 +176,16 @@ class Dashboard {
     pollForNewLogs() {
         let self = this;
         console.log("Polling logs", this.currentMaxIdx);
-        $.ajax({
+        // long polling: the server responds as soon as new messages are available (or after the wait timeout)
+        self.pollRequest = $.ajax({
             url: '/get_log_messages',
             type: 'POST',
             contentType: 'application/json',
             data: JSON.stringify({
-                start_idx: self.currentMaxIdx + 1
+                start_idx: self.currentMaxIdx + 1,
+                wait_timeout: 20
             }),
+            timeout: 30000,
             success: function(response) {
                 self.failureCount = 0;
                 // Only append new messages if we have any
@@ -192,7 +204,7 @@ class Dashboard {
                     });
 
                     // Update max_idx
-                    self.currentMaxIdx = response.max_idx || self.currentMaxIdx;
+                    self.currentMaxIdx = response.max_idx;
 
                     // Auto-scroll to bottom if user was already at bottom
                     if (wasAtBottom) {
@@ -200,31 +212,40 @@ class Dashboard {
                     }
                 } else {
                     // Update max_idx even if no new messages
-                    self.currentMaxIdx = response.max_idx || self.currentMaxIdx;
+                    self.currentMaxIdx = response.max_idx;
                 }
 
                 // Update window title with active project
                 self.updateTitle(response.active_project);
             },
             error: function(xhr, status, error) {
+                if (status === 'abort') {
+                    return;
+                }
                 console.error('Error polling for new logs:', error);
                 self.failureCount++;
                 if (self.failureCount >= 3) {
                     console.log('Server appears to be down, closing tab');
                     window.close();
                 }
+            },
+            complete: function(xhr, status) {
+                if (status === 'abort') {
+                    return;
+                }
+                // poll again right away, or after a delay if the request failed
+                setTimeout(self.pollForNewLogs.bind(self), status === 'success' ? 0 : 1000);
             }
         });
     }
 
-    startPeriodicPolling() {
-        // Clear any existing interval
-        if (this.pollInterval) {
-            clearInterval(this.pollInterval);
+    startPolling() {
+        // Abort any pending poll request (e.g. when the log is reloaded)
+        if (this.pollRequest) {
+            this.pollRequest.abort();
         }
 
-        // Start polling every second (1000ms)
-        this.pollInterval = setInterval(this.pollForNewLogs.bind(this), 1000);
+        this.pollForNewLogs();
     }
 
     toggleStats() {
@@ -487,6 +508,100 @@ class Dashboard {
         });
     }
 
+    loadProfiledTools() {
+        let self = this;
+        $.ajax({
+            url: '/get_profiled_tools',
+            type: 'GET',
+            success: function(response) {
+                self.$profiledTools.val(response.tool_names.join(', '));
+            },
+            error: function(xhr, status, error) {
+                console.error('Error loading profiled tools:', error);
+            }
+        });
+    }
+
+    setProfiledTools() {
+        let self = this;
+        const toolNames = this.$profiledTools.val().split(',').map(s => s.trim()).filter(s => s.length > 0);
+        $.ajax({
+            url: '/set_profiled_tools',
+            type: 'POST',
+            contentType: 'application/json',
+            data: JSON.stringify({ tool_names: toolNames }),
+            success: function(response) {
+                self.$profiledTools.val(response.tool_names.join(', '));
+            },
+            error: function(xhr, status, error) {
+                console.error('Error setting profiled tools:', error);
+            }
+        });
+    }
+
+    toggleTraces() {
+        if (this.$tracesSection.is(':visible')) {
+            this.$tracesSection.hide();
+            this.$toggleTraces.text('Show Traces');
+        } else {
+            this.$tracesSection.show();
+            this.$toggleTraces.text('Hide Traces');
+            this.loadTraces();
+        }
+    }
+
+    loadTraces() {
+        let self = this;
+        $.ajax({
+            url: '/get_traces',
+            type: 'GET',
+            data: { limit: 50 },
+            success: function(response) {
+                self.displayTraces(response.traces);
+            },
+            error: function(xhr, status, error) {
+                console.error('Error loading traces:', error);
+            }
+        });
+    }
+
+    displayTraces(traces) {
+        const $container = $('#traces-container').empty();
+        if (traces.length === 0) {
+            $('#no-traces-message').show();
+            return;
+        }
+        $('#no-traces-message').hide();
+
+        traces.forEach(function(trace) {
+            const startTime = new Date(trace.start_time * 1000).toLocaleTimeString();
+            const $trace = $('<div>').addClass('trace');
+            $('<div>').addClass('trace-title' + (trace.is_error ? ' trace-error' : ''))
+                .text(`${startTime}  ${trace.name}  ${trace.duration_ms.toFixed(1)} ms`)
+                .appendTo($trace);
+
+            // flame view: one row per nesting level, spans positioned relative to the root span
+            const $flame = $('<div>').addClass('trace-flame');
+            const maxDepth = Math.max(...trace.spans.map(s => s.depth));
+            const totalMs = Math.max(trace.duration_ms, 0.001);
+            trace.spans.forEach(function(span) {
+                const attributes = Object.entries(span.attributes).map(([k, v]) => `\n${k}: ${v}`).join('');
+                $('<div>').addClass('trace-span' + (span.is_error ? ' trace-error' : ''))
+                    .css({
+                        left: (100 * span.offset_ms / totalMs) + '%',
+                        width: Math.max(100 * span.duration_ms / totalMs, 0.2) + '%',
+                        top: (span.depth * 22) + 'px'
+                    })
+                    .attr('title', `${span.name}: ${span.duration_ms.toFixed(2)} ms${attributes}`)
+                    .text(`${span.name} (${span.duration_ms.toFixed(1)} ms)`)
+                    .appendTo($flame);
+            });
+            $flame.css('height', ((maxDepth + 1) * 22) + 'px');
+            $trace.append($flame);
+            $container.append($trace);
+        });
+    }
+
     generateColors(count) {
         const colors = [
             '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF',
@@ -0,0 +1,142 @@
+"""
+Background pre-warming of the language server's document symbol cache
+"""
+
+import os
+import threading
+from collections.abc import Iterator
+
+from sensai.util import logging
+from sensai.util.logging import LogTime
+
+from serena.util.shell import subprocess_check_output
+from solidlsp import SolidLanguageServer
+
+log = logging.getLogger(__name__)
+
+
+class SymbolCacheWarmer:
+    """
+    Fills the document symbol cache of a language server in a background thread, such that project-wide symbol
+    searches (which need the symbols of all files) can be answered from the cache.
+
+    Files are processed in an order that maximises the usefulness of a partially warmed cache:
+    recently modified files (according to git) first, then files in "hot" directories, then all remaining files.
+    All requests are sent as background requests and processing pauses while interactive requests are in flight.
+    """
+
+    HOT_DIRS = {"src", "lib", "app", "packages", "components"}
+    NUM_RECENT_COMMITS = 50
+    SAVE_CACHE_INTERVAL = 100
+    """the number of processed files after which the cache is persisted"""
+
+    def __init__(self, language_server: SolidLanguageServer):
+        self._language_server = language_server
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.num_files_processed = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="SymbolCacheWarmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stops the warming process (after the file that is currently being processed).
+
+        :param timeout: the maximum time to wait for the background thread to terminate
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _should_stop(self) -> bool:
+        return self._stop_event.is_set() or not self._language_server.is_running()
+
+    def _wait_while_interactive_requests_in_flight(self) -> None:
+        while self._language_server.server.has_interactive_requests_in_flight() and not self._should_stop():
+            self._stop_event.wait(0.1)
+
+    def _run(self) -> None:
+        with LogTime("Symbol cache pre-warming", logger=log):
+            try:
+                with self._language_server.background_requests():
+                    for relative_path in self.iter_files_in_warming_order():
+                        self._wait_while_interactive_requests_in_flight()
+                        if self._should_stop():
+                            log.info(f"Stopping symbol cache pre-warming after {self.num_files_processed} files")
+                            break
+                        try:
+                            self._language_server.request_document_symbols(relative_path)
+                        except Exception as e:
+                            log.debug(f"Failed to retrieve document symbols for {relative_path} during pre-warming: {e}")
+                        self.num_files_processed += 1
+                        if self.num_files_processed % self.SAVE_CACHE_INTERVAL == 0:
+                            self._language_server.save_cache()
+                if self._language_server.is_running():
+                    self._language_server.save_cache()
+            except Exception as e:
+                log.error(f"Symbol cache pre-warming failed: {e}", exc_info=e)
+        log.info(f"Symbol cache pre-warming processed {self.num_files_processed} files")
+
+    def _get_recently_modified_files(self) -> list[str]:
+        """
+        :return: the relative paths of files with uncommitted changes followed by files changed in recent commits
+            (most recent first); empty if the project is not a git repository
+        """
+        root = self._language_server.repository_root_path
+        try:
+            uncommitted = subprocess_check_output(["git", "-C", root, "diff", "HEAD", "--name-only", "--relative"], timeout=10).splitlines()
+            committed = subprocess_check_output(
+                ["git", "-C", root, "log", f"-{self.NUM_RECENT_COMMITS}", "--name-only", "--relative", "--pretty=format:"], timeout=10
+            ).splitlines()
+        except Exception as e:
+            log.debug(f"Could not determine recently modified files via git: {e}")
+            return []
+        return [p.strip() for p in uncommitted + committed if p.strip()]
+
+    def _is_relevant_file(self, relative_path: str) -> bool:
+        try:
+            return os.path.isfile(os.path.join(self._language_server.repository_root_path, relative_path)) and not (
+                self._language_server.is_ignored_path(relative_path)
+            )
+        except FileNotFoundError:
+            return False
+
+    def _iter_all_files(self) -> Iterator[str]:
+        root = self._language_server.repository_root_path
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dirpath = os.path.relpath(dirpath, root)
+            dirnames[:] = sorted(
+                d
+                for d in dirnames
+                if not self._language_server.is_ignored_path(os.path.normpath(os.path.join(rel_dirpath, d)), ignore_unsupported_files=False)
+            )
+            for filename in sorted(filenames):
+                yield os.path.normpath(os.path.join(rel_dirpath, filename))
+
+    def iter_files_in_warming_order(self) -> Iterator[str]:
+        """
+        :return: an iterator over the relative paths of all relevant source files, in the order in which they shall be processed
+        """
+        yielded: set[str] = set()
+        for relative_path in self._get_recently_modified_files():
+            relative_path = os.path.normpath(relative_path)
+            if relative_path not in yielded and self._is_relevant_file(relative_path):
+                yielded.add(relative_path)
+                yield relative_path
+
+        deferred: list[str] = []
+        for relative_path in self._iter_all_files():
+            if relative_path in yielded or not self._is_relevant_file(relative_path):
+                continue
+            if any(part in self.HOT_DIRS for part in relative_path.split(os.sep)[:-1]):
+                yielded.add(relative_path)
+                yield relative_path
+            else:
+                deferred.append(relative_path)
+
+        yield from deferred
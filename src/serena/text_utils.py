@@ -10,6 +10,7 @@ from typing import Any, Self
 from joblib import Parallel, delayed
 
 from serena.constants import DEFAULT_SOURCE_FILE_ENCODING
+from serena.util.tracing import tracer
 
 log = logging.getLogger(__name__)
 
@@ -343,6 +344,33 @@ def search_files(
     :param paths_exclude_glob: Optional glob pattern to exclude files from the list
     :return: List of MatchedConsecutiveLines objects
     """
+    with tracer.span("search_files", {"search.num_candidate_files": len(relative_file_paths)}, require_parent=True) as span:
+        matches, num_searched_files = _search_files(
+            relative_file_paths,
+            pattern,
+            root_path,
+            file_reader,
+            context_lines_before,
+            context_lines_after,
+            paths_include_glob,
+            paths_exclude_glob,
+        )
+        if span is not None:
+            span.set_attribute("search.num_files", num_searched_files)
+            span.set_attribute("search.num_matches", len(matches))
+    return matches
+
+
+def _search_files(
+    relative_file_paths: list[str],
+    pattern: str,
+    root_path: str,
+    file_reader: Callable[[str], str],
+    context_lines_before: int,
+    context_lines_after: int,
+    paths_include_glob: str | None,
+    paths_exclude_glob: str | None,
+) -> tuple[list[MatchedConsecutiveLines], int]:
     # Pre-filter paths (done sequentially to avoid overhead)
     # Use proper glob matching instead of gitignore patterns
     include_patterns = expand_braces(paths_include_glob) if paths_include_glob else None
@@ -404,4 +432,4 @@ def search_files(
         log.debug(f"Failed to read {len(skipped_file_error_tuples)} files: {skipped_file_error_tuples}")
 
     log.info(f"Found {len(matches)} total matches across {len(filtered_paths)} files")
-    return matches
+    return matches, len(filtered_paths)
@@ -47,6 +47,12 @@ class ExecuteShellCommandTool(Tool, ToolMarkerCanEdit):
                         f"Specified a relative working directory ({cwd}), but the resulting path is not a directory: {_cwd}"
                     )
 
-        result = execute_shell_command(command, cwd=_cwd, capture_stderr=capture_stderr)
+        shell_session_pool = self.agent.shell_session_pool
+        if shell_session_pool is not None:
+            # output beyond the answer limit cannot be returned anyway, so it need not be kept
+            max_output_chars = max_answer_chars if max_answer_chars != -1 else self.agent.serena_config.default_max_tool_answer_chars
+            result = shell_session_pool.execute(command, cwd=_cwd, capture_stderr=capture_stderr, max_output_chars=max_output_chars)
+        else:
+            result = execute_shell_command(command, cwd=_cwd, capture_stderr=capture_stderr)
         result = result.json()
         return self._limit_length(result, max_answer_chars)
@@ -53,6 +53,25 @@ class SwitchModesTool(Tool, ToolMarkerOptional):
         return result_str
 
 
+class SetToolProfilingTool(Tool, ToolMarkerDoesNotRequireActiveProject, ToolMarkerOptional):
+    """
+    Selects the tools whose executions are profiled.
+    """
+
+    def apply(self, tool_names: list[str]) -> str:
+        """
+        Selects the tools whose subsequent executions shall be profiled with cProfile, replacing the previous selection.
+        Profiles are written to the project's .serena/profiles directory.
+
+        :param tool_names: the names of the tools to profile, ["*"] for all tools or [] to disable profiling
+        """
+        profiler = self.agent.execution_engine.profiler
+        profiler.set_tool_names(tool_names)
+        if not profiler.enabled:
+            return "Profiling disabled."
+        return f"Profiling enabled for: {', '.join(profiler.get_tool_names())}"
+
+
 class GetCurrentConfigTool(Tool):
     """
     Prints the current configuration of the agent, including the active and available projects, tools, contexts, and modes.
@@ -16,6 +16,7 @@ from pathlib import Path
 from serena.text_utils import search_files
 from serena.tools import SUCCESS_RESULT, EditedFileContext, Tool, ToolMarkerCanEdit, ToolMarkerOptional
 from serena.util.file_system import scan_directory
+from solidlsp.lsp_protocol_handler.lsp_types import FileChangeType
 
 
 class ReadFileTool(Tool):
@@ -75,6 +76,7 @@ class CreateTextFileTool(Tool, ToolMarkerCanEdit):
 
         abs_path.parent.mkdir(parents=True, exist_ok=True)
         abs_path.write_text(content, encoding=self.project.project_config.encoding)
+        self.agent.notify_file_modified(relative_path, FileChangeType.Changed if will_overwrite_existing else FileChangeType.Created)
         answer = f"File created: {relative_path}."
         if will_overwrite_existing:
             answer += " Overwrote existing file."
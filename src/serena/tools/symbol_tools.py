@@ -9,13 +9,15 @@ from collections.abc import Sequence
 from copy import copy
 from typing import Any
 
+from serena.symbol import LanguageServerSymbolRetriever
 from serena.tools import (
     SUCCESS_RESULT,
     Tool,
     ToolMarkerSymbolicEdit,
     ToolMarkerSymbolicRead,
 )
-from serena.tools.tools_base import ToolMarkerOptional
+from serena.tools.tools_base import ToolMarkerOptional, ToolMarkerSymbolicReadWithIndexFallback
+from solidlsp.ls import IndexOnlyReadReport
 from solidlsp.ls_types import SymbolKind
 
 
@@ -35,6 +37,29 @@ def _sanitize_symbol_dict(symbol_dict: dict[str, Any]) -> dict[str, Any]:
     return symbol_dict
 
 
+def _add_index_only_notice(result: str, report: IndexOnlyReadReport | None, max_listed_paths: int = 20) -> str:
+    """
+    Appends a notice to the given tool result if it was obtained from the persisted symbol index instead of the language server.
+    """
+    if report is None:
+        return result
+
+    def format_paths(paths: list[str]) -> str:
+        listed = ", ".join(paths[:max_listed_paths])
+        return listed + (f" (and {len(paths) - max_listed_paths} more)" if len(paths) > max_listed_paths else "")
+
+    notice = (
+        "NOTE: The language server is currently unavailable (starting up or restarting), so this result was obtained from the symbol index."
+    )
+    if report.stale_paths:
+        notice += (
+            f" The following files changed since they were indexed, so their symbols may be outdated: {format_paths(report.stale_paths)}."
+        )
+    if report.unindexed_paths:
+        notice += f" The following files were not indexed yet and are missing from the result: {format_paths(report.unindexed_paths)}."
+    return f"{result}\n\n{notice}"
+
+
 class RestartLanguageServerTool(Tool, ToolMarkerOptional):
     """Restarts the language server, may be necessary when edits not through Serena happen."""
 
@@ -46,7 +71,7 @@ class RestartLanguageServerTool(Tool, ToolMarkerOptional):
         return SUCCESS_RESULT
 
 
-class GetSymbolsOverviewTool(Tool, ToolMarkerSymbolicRead):
+class GetSymbolsOverviewTool(Tool, ToolMarkerSymbolicReadWithIndexFallback):
     """
     Gets an overview of the top-level symbols defined in a given file.
     """
@@ -63,7 +88,6 @@ class GetSymbolsOverviewTool(Tool, ToolMarkerSymbolicRead):
             Don't adjust unless there is really no other way to get the content required for the task.
         :return: a JSON object containing info about top-level symbols in the file
         """
-        symbol_retriever = self.create_language_server_symbol_retriever()
         file_path = os.path.join(self.project.project_root, relative_path)
 
         # The symbol overview is capable of working with both files and directories,
@@ -72,12 +96,13 @@ class GetSymbolsOverviewTool(Tool, ToolMarkerSymbolicRead):
             raise FileNotFoundError(f"File or directory {relative_path} does not exist in the project.")
         if os.path.isdir(file_path):
             raise ValueError(f"Expected a file path, but got a directory path: {relative_path}. ")
-        result = symbol_retriever.get_symbol_overview(relative_path)[relative_path]
+        with self.language_server_symbol_retriever_with_index_fallback() as (symbol_retriever, index_report):
+            result = symbol_retriever.get_symbol_overview(relative_path)[relative_path]
         result_json_str = json.dumps([dataclasses.asdict(i) for i in result])
-        return self._limit_length(result_json_str, max_answer_chars)
+        return _add_index_only_notice(self._limit_length(result_json_str, max_answer_chars), index_report)
 
 
-class FindSymbolTool(Tool, ToolMarkerSymbolicRead):
+class FindSymbolTool(Tool, ToolMarkerSymbolicReadWithIndexFallback):
     """
     Performs a global (or local) search for symbols with/containing a given name/substring (optionally filtered by type).
     """
@@ -147,18 +172,32 @@ class FindSymbolTool(Tool, ToolMarkerSymbolicRead):
         """
         parsed_include_kinds: Sequence[SymbolKind] | None = [SymbolKind(k) for k in include_kinds] if include_kinds else None
         parsed_exclude_kinds: Sequence[SymbolKind] | None = [SymbolKind(k) for k in exclude_kinds] if exclude_kinds else None
-        symbol_retriever = self.create_language_server_symbol_retriever()
-        symbols = symbol_retriever.find_by_name(
-            name_path,
-            include_body=include_body,
-            include_kinds=parsed_include_kinds,
-            exclude_kinds=parsed_exclude_kinds,
-            substring_matching=substring_matching,
-            within_relative_path=relative_path,
-        )
-        symbol_dicts = [_sanitize_symbol_dict(s.to_dict(kind=True, location=True, depth=depth, include_body=include_body)) for s in symbols]
+
+        def find_symbols(symbol_retriever: LanguageServerSymbolRetriever) -> list[dict[str, Any]]:
+            symbols = symbol_retriever.find_by_name(
+                name_path,
+                include_body=include_body,
+                include_kinds=parsed_include_kinds,
+                exclude_kinds=parsed_exclude_kinds,
+                substring_matching=substring_matching,
+                within_relative_path=relative_path,
+            )
+            return [_sanitize_symbol_dict(s.to_dict(kind=True, location=True, depth=depth, include_body=include_body)) for s in symbols]
+
+        index_report: IndexOnlyReadReport | None = None
+        if include_body:
+            # bodies are not part of the symbol index, so we always need the language server
+            symbol_dicts = find_symbols(self.create_language_server_symbol_retriever())
+        else:
+            with self.language_server_symbol_retriever_with_index_fallback() as (symbol_retriever, index_report):
+                symbol_dicts = find_symbols(symbol_retriever)
+            if index_report is not None and index_report.stale_paths:
+                stale_paths = set(index_report.stale_paths)
+                for symbol_dict in symbol_dicts:
+                    if symbol_dict.get("relative_path") in stale_paths:
+                        symbol_dict["stale"] = True
         result = json.dumps(symbol_dicts)
-        return self._limit_length(result, max_answer_chars)
+        return _add_index_only_notice(self._limit_length(result, max_answer_chars), index_report)
 
 
 class FindReferencingSymbolsTool(Tool, ToolMarkerSymbolicRead):
@@ -199,7 +238,8 @@ class FindReferencingSymbolsTool(Tool, ToolMarkerSymbolicRead):
             exclude_kinds=parsed_exclude_kinds,
         )
         reference_dicts = []
-        for ref in references_in_symbols:
+        self.report_progress(0, len(references_in_symbols), "Resolving references")
+        for i, ref in enumerate(references_in_symbols, start=1):
             ref_dict = ref.symbol.to_dict(kind=True, location=True, depth=0, include_body=include_body)
             ref_dict = _sanitize_symbol_dict(ref_dict)
             if not include_body:
@@ -210,6 +250,7 @@ class FindReferencingSymbolsTool(Tool, ToolMarkerSymbolicRead):
                 )
                 ref_dict["content_around_reference"] = content_around_ref.to_display_string()
             reference_dicts.append(ref_dict)
+            self.report_progress(i, len(references_in_symbols))
         result = json.dumps(reference_dicts)
         return self._limit_length(result, max_answer_chars)
 
@@ -321,3 +362,42 @@ class RenameSymbolTool(Tool, ToolMarkerSymbolicEdit):
         code_editor = self.create_code_editor()
         status_message = code_editor.rename_symbol(name_path, relative_file_path=relative_path, new_name=new_name)
         return status_message
+
+
+class ApplySymbolicEditsTool(Tool, ToolMarkerSymbolicEdit):
+    """
+    Applies several symbolic edits (replacing, inserting before/after or deleting symbols) in one or more files as a unit.
+    """
+
+    def apply(self, edits: list[dict[str, str]]) -> str:
+        """
+        Applies several symbolic edits at once. Use this instead of repeated calls to `replace_symbol_body`,
+        `insert_after_symbol` and `insert_before_symbol` when several symbols are to be edited.
+        All symbols are identified based on the state of the files BEFORE any of the edits is applied,
+        so name paths and positions are not affected by the other edits. The edits must not overlap (e.g. a method
+        cannot be replaced together with its class). If any edit is invalid, no file is modified.
+
+        :param edits: the list of edits, each being a dictionary with the keys
+            "operation" (one of "replace_body", "insert_after", "insert_before", "delete"),
+            "name_path" (for finding the symbol, same logic as in the `find_symbol` tool),
+            "relative_path" (the relative path to the file containing the symbol) and
+            "body" (the new symbol body for "replace_body" or the content to insert for "insert_after"/"insert_before";
+            same semantics as in the corresponding individual tools; omitted for "delete").
+        :return: a summary of the modified files
+        """
+        from ..code_editor import SymbolicEdit, SymbolicEditOperation
+
+        symbolic_edits = []
+        for edit in edits:
+            try:
+                operation = SymbolicEditOperation(edit["operation"])
+                symbolic_edits.append(
+                    SymbolicEdit(
+                        operation=operation, name_path=edit["name_path"], relative_path=edit["relative_path"], body=edit.get("body", "")
+                    )
+                )
+            except KeyError as e:
+                raise ValueError(f"Edit {edit} lacks the required key {e}") from e
+        code_editor = self.create_code_editor()
+        modified_files = code_editor.apply_symbolic_edits(symbolic_edits)
+        return f"Successfully applied {len(symbolic_edits)} edit(s) to {len(modified_files)} file(s): {', '.join(modified_files)}"
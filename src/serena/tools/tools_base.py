@@ -1,7 +1,10 @@
 import inspect
 import os
+import threading
 from abc import ABC
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
 from dataclasses import dataclass
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, Protocol, Self, TypeVar
@@ -15,6 +18,7 @@ from serena.prompt_factory import PromptFactory
 from serena.symbol import LanguageServerSymbolRetriever
 from serena.util.class_decorators import singleton
 from serena.util.inspection import iter_subclasses
+from solidlsp.ls import IndexOnlyReadReport
 
 if TYPE_CHECKING:
     from serena.agent import SerenaAgent
@@ -24,6 +28,29 @@ log = logging.getLogger(__name__)
 T = TypeVar("T")
 SUCCESS_RESULT = "OK"
 
+ProgressCallback = Callable[[float, float | None, str | None], None]
+"""
+Callback receiving (progress, total, message) for the tool call currently being executed
+"""
+
+
+class ToolCancelledException(Exception):
+    """
+    Raised within a tool's execution thread when the client has cancelled the corresponding tool call
+    """
+
+
+class _ToolCallState(threading.local):
+    """
+    Per-thread state of the tool call that is currently being executed
+    """
+
+    progress_callback: ProgressCallback | None = None
+    cancel_event: threading.Event | None = None
+
+
+_tool_call_state = _ToolCallState()
+
 
 class Component(ABC):
     def __init__(self, agent: "SerenaAgent"):
@@ -46,10 +73,29 @@ class Component(ABC):
     def create_language_server_symbol_retriever(self) -> LanguageServerSymbolRetriever:
         if not self.agent.is_using_language_server():
             raise Exception("Cannot create LanguageServerSymbolRetriever; agent is not in language server mode.")
-        language_server = self.agent.language_server
-        assert language_server is not None
+        language_server = self.agent.wait_for_language_server()
         return LanguageServerSymbolRetriever(language_server, agent=self.agent)
 
+    @contextmanager
+    def language_server_symbol_retriever_with_index_fallback(
+        self,
+    ) -> Iterator[tuple[LanguageServerSymbolRetriever, IndexOnlyReadReport | None]]:
+        """
+        Provides a symbol retriever for read-only queries, which, if the language server is currently unavailable
+        (starting up or restarting), answers queries from the persisted symbol index instead of waiting for the language server.
+        Only queries not requiring symbol bodies can be answered from the index.
+
+        :return: a pair (symbol retriever, report), where the report is None if the language server is used and otherwise
+            collects the files for which the index was stale or incomplete
+        """
+        language_server = self.agent.get_language_server_for_index_reads()
+        if language_server is None:
+            yield self.create_language_server_symbol_retriever(), None
+        else:
+            log.info("Language server is unavailable; answering the query from the persisted symbol index")
+            with language_server.index_only_reads() as report:
+                yield LanguageServerSymbolRetriever(language_server, agent=self.agent), report
+
     @property
     def project(self) -> Project:
         return self.agent.get_active_project_or_raise()
@@ -91,6 +137,13 @@ class ToolMarkerSymbolicRead(ToolMarker):
     """
 
 
+class ToolMarkerSymbolicReadWithIndexFallback(ToolMarkerSymbolicRead):
+    """
+    Marker class for symbol read tools which can answer (some) queries from the persisted symbol index
+    while the language server is unavailable, i.e. which need not wait for the language server to become ready.
+    """
+
+
 class ToolMarkerSymbolicEdit(ToolMarkerCanEdit):
     """
     Marker class for tools that perform symbolic edit operations.
@@ -194,7 +247,7 @@ class Tool(Component):
 
     def _log_tool_application(self, frame: Any) -> None:
         params = {}
-        ignored_params = {"self", "log_call", "catch_exceptions", "args", "apply_fn"}
+        ignored_params = {"self", "log_call", "catch_exceptions", "args", "apply_fn", "progress_callback", "cancel_event"}
         for param, value in frame.f_locals.items():
             if param in ignored_params:
                 continue
@@ -219,30 +272,86 @@ class Tool(Component):
     def is_active(self) -> bool:
         return self.agent.tool_is_active(self.__class__)
 
-    def apply_ex(self, log_call: bool = True, catch_exceptions: bool = True, **kwargs) -> str:  # type: ignore
+    def report_progress(self, progress: float, total: float | None = None, message: str | None = None) -> None:
         """
-        Applies the tool with logging and exception handling, using the given keyword arguments
+        Reports the progress of the current tool call to the client (if the client requested progress notifications).
+        Long-running tools should call this periodically; it also serves as a cancellation point.
+
+        :param progress: the current progress value, e.g. the number of files scanned so far
+        :param total: the total value (if known)
+        :param message: an optional human-readable message
+        """
+        self.raise_if_cancelled()
+        callback = _tool_call_state.progress_callback
+        if callback is not None:
+            try:
+                callback(progress, total, message)
+            except Exception as e:
+                log.warning(f"Failed to report progress for tool {self.get_name()}: {e}")
+
+    @staticmethod
+    def raise_if_cancelled() -> None:
+        """
+        Raises a ToolCancelledException if the client has cancelled the tool call that is currently being executed
+        """
+        cancel_event = _tool_call_state.cancel_event
+        if cancel_event is not None and cancel_event.is_set():
+            raise ToolCancelledException("Tool call was cancelled by the client")
+
+    def issue_ex(
+        self,
+        log_call: bool = True,
+        catch_exceptions: bool = True,
+        progress_callback: ProgressCallback | None = None,
+        cancel_event: threading.Event | None = None,
+        **kwargs: Any,
+    ) -> Future[str]:
+        """
+        Issues the application of the tool (with logging and exception handling) to the agent's task executor
+        and returns immediately.
+
+        :param log_call: whether to log the call and its result
+        :param catch_exceptions: whether to convert exceptions into an error result
+        :param progress_callback: a callback which receives the progress reported by the tool via `report_progress`
+        :param cancel_event: an event which, once set, signals that the call was cancelled; tasks which have not
+            yet started are skipped, running tasks are interrupted at their next cancellation point
+        :return: a future holding the tool's result
         """
 
         def task() -> str:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ToolCancelledException(f"Tool call {self.get_name()} was cancelled before it started")
+
             if log_call:
                 self._log_tool_application(inspect.currentframe())
 
-            # Use ToolExecutionEngine for unified 4-phase execution
+            _tool_call_state.progress_callback = progress_callback
+            _tool_call_state.cancel_event = cancel_event
             try:
-                result = self.agent.execution_engine.execute(self, **kwargs)
-            except Exception as e:
-                if not catch_exceptions:
-                    raise
-                # Exception already logged by execution engine
-                result = f"Error executing tool: {e}"
+                # Use ToolExecutionEngine for unified 4-phase execution
+                try:
+                    result = self.agent.execution_engine.execute(self, **kwargs)
+                except Exception as e:
+                    if not catch_exceptions:
+                        raise
+                    # Exception already logged by execution engine
+                    result = f"Error executing tool: {e}"
+            finally:
+                _tool_call_state.progress_callback = None
+                _tool_call_state.cancel_event = None
 
             if log_call:
                 log.info(f"Result: {result}")
 
             return result
 
-        future = self.agent.issue_task(task, name=self.__class__.__name__)
+        return self.agent.issue_task(task, name=self.__class__.__name__)
+
+    def apply_ex(self, log_call: bool = True, catch_exceptions: bool = True, **kwargs) -> str:  # type: ignore
+        """
+        Applies the tool with logging and exception handling, using the given keyword arguments
+        """
+        future = self.issue_ex(log_call=log_call, catch_exceptions=catch_exceptions, **kwargs)
         return future.result(timeout=self.agent.serena_config.tool_timeout)
 
 
@@ -256,6 +365,8 @@ class EditedFileContext:
     """
 
     def __init__(self, relative_path: str, agent: "SerenaAgent"):
+        self._agent = agent
+        self._relative_path = relative_path
         self._project = agent.get_active_project()
         assert self._project is not None
         self._abs_path = os.path.join(self._project.project_root, relative_path)
@@ -289,8 +400,7 @@ class EditedFileContext:
             with open(self._abs_path, "w", encoding=self._project.project_config.encoding) as f:
                 f.write(self._updated_content)
             log.info(f"Updated content written to {self._abs_path}")
-            # Language servers should automatically detect the change and update its state accordingly.
-            # If they do not, we may have to add a call to notify it.
+            self._agent.notify_file_modified(self._relative_path)
 
 
 @dataclass(kw_only=True)
@@ -1,5 +1,8 @@
+import contextlib
 import logging
 import os
+import shutil
+import tempfile
 from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -98,6 +101,30 @@ def find_all_non_ignored_files(repo_root: str) -> list[str]:
     return files
 
 
+def write_text_file_atomically(path: str, content: str, encoding: str) -> None:
+    """
+    Writes the given content to the given file by writing a temporary file in the same directory and renaming it,
+    such that readers never observe a partially written file and the original file remains intact if writing fails.
+    The permissions of an existing file are retained.
+
+    :param path: the path of the file
+    :param content: the content to write
+    :param encoding: the encoding to use
+    """
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
 @dataclass
 class GitignoreSpec:
     file_path: str
@@ -8,10 +8,14 @@ from serena.constants import SERENA_LOG_FORMAT
 
 
 class MemoryLogHandler(logging.Handler):
-    def __init__(self, level: int = logging.NOTSET) -> None:
+    def __init__(self, level: int = logging.NOTSET, max_messages: int | None = None) -> None:
+        """
+        :param level: the minimum log level
+        :param max_messages: the maximum number of log messages to retain; if None, use the default of `LogBuffer`
+        """
         super().__init__(level=level)
         self.setFormatter(logging.Formatter(SERENA_LOG_FORMAT))
-        self._log_buffer = LogBuffer()
+        self._log_buffer = LogBuffer() if max_messages is None else LogBuffer(max_messages=max_messages)
         self._log_queue: queue.Queue[str] = queue.Queue()
         self._stop_event = threading.Event()
         self._emit_callbacks: list[Callable[[str], None]] = []
@@ -48,20 +52,115 @@ class MemoryLogHandler(logging.Handler):
     def get_log_messages(self) -> list[str]:
         return self._log_buffer.get_log_messages()
 
+    def get_buffer_size(self) -> tuple[int, int]:
+        """
+        :return: a pair (number of messages, total number of characters) of the retained messages
+        """
+        return self._log_buffer.get_size()
+
+    def get_log_messages_since(self, start_idx: int, wait_timeout: float = 0.0) -> tuple[list[str], int]:
+        """
+        :param start_idx: the index (sequence id) of the first message to return
+        :param wait_timeout: if no such message is available yet, the maximum number of seconds to wait for one
+        :return: a pair (messages, max_idx), see :meth:`LogBuffer.get_log_messages_since`
+        """
+        if wait_timeout > 0:
+            self._log_buffer.wait_for_messages(start_idx, wait_timeout)
+        return self._log_buffer.get_log_messages_since(start_idx)
+
 
 class LogBuffer:
     """
-    A thread-safe buffer for storing log messages.
+    A thread-safe, fixed-capacity ring buffer for storing log messages.
+
+    Every message is assigned a sequence id (0, 1, 2, ...), which keeps increasing when old messages are evicted,
+    such that readers can request the messages they have not yet seen in time proportional to the number of new messages.
+    Messages are evicted (oldest first) when either the number of messages or their total length exceeds the respective limit.
     """
 
-    def __init__(self) -> None:
-        self._log_messages: list[str] = []
-        self._lock = threading.Lock()
+    DEFAULT_MAX_MESSAGES = 10_000
+    DEFAULT_MAX_CHARS = 20_000_000
+
+    def __init__(self, max_messages: int = DEFAULT_MAX_MESSAGES, max_chars: int = DEFAULT_MAX_CHARS) -> None:
+        """
+        :param max_messages: the maximum number of messages to retain
+        :param max_chars: the maximum total length of the retained messages; the most recent message is always retained
+        """
+        self._slots: list[str | None] = [None] * max_messages
+        self._max_chars = max_chars
+        self._first_id = 0
+        """the id of the oldest retained message"""
+        self._next_id = 0
+        """the id to be assigned to the next message"""
+        self._num_chars = 0
+        self._condition = threading.Condition()
+
+    def append(self, msg: str) -> int:
+        """
+        :param msg: the message to add
+        :return: the message's sequence id
+        """
+        with self._condition:
+            capacity = len(self._slots)
+            if self._next_id - self._first_id == capacity:
+                self._evict_oldest()
+            msg_id = self._next_id
+            self._slots[msg_id % capacity] = msg
+            self._num_chars += len(msg)
+            self._next_id += 1
+            while self._num_chars > self._max_chars and self._next_id - self._first_id > 1:
+                self._evict_oldest()
+            self._condition.notify_all()
+            return msg_id
+
+    def _evict_oldest(self) -> None:
+        slot = self._first_id % len(self._slots)
+        msg = self._slots[slot]
+        assert msg is not None
+        self._num_chars -= len(msg)
+        self._slots[slot] = None
+        self._first_id += 1
+
+    @property
+    def max_id(self) -> int:
+        """
+        :return: the id of the most recent message (-1 if no messages were added yet)
+        """
+        with self._condition:
+            return self._next_id - 1
 
-    def append(self, msg: str) -> None:
-        with self._lock:
-            self._log_messages.append(msg)
+    def get_size(self) -> tuple[int, int]:
+        """
+        :return: a pair (number of messages, total number of characters) of the retained messages
+        """
+        with self._condition:
+            return self._next_id - self._first_id, self._num_chars
 
     def get_log_messages(self) -> list[str]:
-        with self._lock:
-            return self._log_messages.copy()
+        """
+        :return: all retained messages
+        """
+        return self.get_log_messages_since(0)[0]
+
+    def get_log_messages_since(self, start_id: int) -> tuple[list[str], int]:
+        """
+        :param start_id: the id of the first message to return; if this message has already been evicted, the messages
+            start with the oldest retained message
+        :return: a pair (messages, max_id), where max_id is the id of the most recent message (-1 if there is none)
+        """
+        with self._condition:
+            capacity = len(self._slots)
+            start_id = max(start_id, self._first_id)
+            messages = [self._slots[i % capacity] for i in range(start_id, self._next_id)]
+            return messages, self._next_id - 1  # type: ignore[return-value]
+
+    def wait_for_messages(self, start_id: int, timeout: float) -> bool:
+        """
+        Waits until a message with an id of at least `start_id` is available.
+
+        :param start_id: the id of the message to wait for
+        :param timeout: the maximum number of seconds to wait
+        :return: whether such a message is available
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._next_id > start_id, timeout=timeout)
@@ -0,0 +1,243 @@
+"""
+Metrics in the Prometheus text exposition format.
+
+The metric types are minimal, thread-safe implementations of Prometheus counters, gauges and histograms,
+such that no client library is required. Metrics recorded by library code (e.g. the language server handler)
+are registered in the global registry `metrics`; values which can be read from existing state at scrape time
+(e.g. the size of a cache) are better exposed via a `CallbackGauge`, which costs nothing until rendered.
+"""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""histogram bucket bounds (in seconds) suitable for the duration of tool calls and language server requests"""
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values, strict=True)) + "}"
+
+
+class Metric(ABC):
+    TYPE: str
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        """
+        :param name: the metric name (e.g. "serena_tool_calls_total")
+        :param help_text: the description of the metric
+        :param label_names: the names of the labels distinguishing the metric's time series
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, label_values: Sequence[str]) -> LabelValues:
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f"Metric {self.name} requires label values for {self.label_names}, got {label_values}")
+        return tuple(str(v) for v in label_values)
+
+    def render(self, lines: list[str]) -> None:
+        """
+        Appends the metric's lines in the text exposition format.
+        """
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} {self.TYPE}")
+        self._render_samples(lines)
+
+    @abstractmethod
+    def _render_samples(self, lines: list[str]) -> None:
+        pass
+
+
+class _ValueMetric(Metric, ABC):
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def get(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(label_values), 0.0)
+
+    def _render_samples(self, lines: list[str]) -> None:
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+
+
+class Counter(_ValueMetric):
+    TYPE = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        key = self._label_values(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_ValueMetric):
+    TYPE = "gauge"
+
+    def set(self, value: float, *label_values: str) -> None:
+        key = self._label_values(label_values)
+        with self._lock:
+            self._values[key] = value
+
+
+class CallbackGauge(Metric):
+    """
+    A gauge whose values are determined when the metric is rendered.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], float | dict[LabelValues, float] | None],
+        label_names: Sequence[str] = (),
+    ):
+        """
+        :param name: the metric name
+        :param help_text: the description of the metric
+        :param callback: a function returning the value (for a metric without labels) or a mapping from label values to values;
+            if it returns None or raises, no samples are rendered
+        :param label_names: the names of the labels
+        """
+        super().__init__(name, help_text, label_names)
+        self._callback = callback
+
+    def _render_samples(self, lines: list[str]) -> None:
+        try:
+            result = self._callback()
+        except Exception:
+            return
+        if result is None:
+            return
+        values = result if isinstance(result, dict) else {(): result}
+        for label_values, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+
+
+class _HistogramData:
+    def __init__(self, num_buckets: int):
+        self.bucket_counts = [0] * num_buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param name: the metric name
+        :param help_text: the description of the metric
+        :param label_names: the names of the labels
+        :param buckets: the (increasing) upper bounds of the buckets; the +Inf bucket is added implicitly
+        """
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        self._data: dict[LabelValues, _HistogramData] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        key = self._label_values(label_values)
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                data = self._data[key] = _HistogramData(len(self.buckets) + 1)
+            data.bucket_counts[bucket_index] += 1
+            data.sum += value
+            data.count += 1
+
+    def get_count(self, *label_values: str) -> int:
+        with self._lock:
+            data = self._data.get(self._label_values(label_values))
+            return data.count if data is not None else 0
+
+    def _render_samples(self, lines: list[str]) -> None:
+        with self._lock:
+            snapshot = [(key, list(data.bucket_counts), data.sum, data.count) for key, data in self._data.items()]
+        bucket_label_names = (*self.label_names, "le")
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for label_values, bucket_counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts, strict=True):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_label_names, (*label_values, bound))} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+
+TMetric = TypeVar("TMetric", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: TMetric) -> TMetric:
+        """
+        Registers the given metric. If a metric of the same name and type was registered before, the existing metric is returned.
+
+        :param metric: the metric to register
+        :return: the registered metric
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"A metric named {metric.name} of type {type(existing).__name__} is already registered")
+                return existing  # type: ignore[return-value]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, label_names))
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, label_names))
+
+    def histogram(
+        self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def render(self) -> str:
+        """
+        :return: the metrics in the Prometheus text exposition format
+        """
+        lines: list[str] = []
+        with self._lock:
+            registered_metrics = list(self._metrics.values())
+        for metric in registered_metrics:
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+"""the global registry for metrics recorded by library code"""
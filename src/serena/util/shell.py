@@ -1,10 +1,22 @@
+import codecs
+import logging
 import os
+import platform
+import selectors
+import shlex
+import signal
 import subprocess
+import sys
+import threading
+import time
+import uuid
 
 from pydantic import BaseModel
 
 from solidlsp.util.subprocess_util import subprocess_kwargs
 
+log = logging.getLogger(__name__)
+
 
 class ShellCommandResult(BaseModel):
     stdout: str
@@ -42,6 +54,239 @@ def execute_shell_command(command: str, cwd: str | None = None, capture_stderr:
     return ShellCommandResult(stdout=stdout, stderr=stderr, return_code=process.returncode, cwd=cwd)
 
 
+class _FramedOutput:
+    """
+    Collects the output of a single stream of a shell session up to a sentinel marker, keeping at most
+    a given number of characters (the remainder is counted but discarded).
+    """
+
+    def __init__(self, marker: bytes, max_chars: int | None):
+        self._marker = marker
+        self._max_chars = max_chars
+        self._pending = b""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._parts: list[str] = []
+        self._num_kept_chars = 0
+        self.num_chars = 0
+        self.trailer: str | None = None
+        """the remainder of the sentinel line once the sentinel has been read; None before"""
+
+    @property
+    def complete(self) -> bool:
+        return self.trailer is not None
+
+    def feed(self, data: bytes) -> None:
+        self._pending += data
+        idx = self._pending.find(self._marker)
+        if idx == -1:
+            # keep a possibly incomplete marker at the end of the pending data
+            keep = len(self._marker) - 1
+            if len(self._pending) > keep:
+                self._add(self._pending[: len(self._pending) - keep])
+                self._pending = self._pending[len(self._pending) - keep :]
+            return
+        line_end = self._pending.find(b"\n", idx + len(self._marker))
+        if line_end == -1:
+            return
+        self._add(self._pending[:idx])
+        self._add(b"", final=True)
+        self.trailer = self._pending[idx + len(self._marker) : line_end].decode("utf-8", errors="replace")
+        self._pending = b""
+
+    def _add(self, data: bytes, final: bool = False) -> None:
+        text = self._decoder.decode(data, final=final)
+        self.num_chars += len(text)
+        if self._max_chars is not None:
+            text = text[: max(0, self._max_chars - self._num_kept_chars)]
+        if text:
+            self._parts.append(text)
+            self._num_kept_chars += len(text)
+
+    def get_text(self) -> str:
+        text = "".join(self._parts)
+        if self.num_chars > self._num_kept_chars:
+            text += f"\n[... {self.num_chars - self._num_kept_chars} more characters omitted]"
+        return text
+
+
+class ShellSession:
+    """
+    A long-lived shell process which executes commands one at a time, such that the shell's startup cost is paid only once.
+
+    Every command runs in a subshell of the session's shell, with stdin redirected from /dev/null, such that changes
+    to the working directory or to the environment made by one command do not affect subsequent commands
+    (matching the behaviour of executing each command in a new process).
+    The end of a command's output and its exit code are determined via sentinel lines written after the command.
+    Only supported on POSIX systems.
+    """
+
+    SHELL = "/bin/sh"
+
+    def __init__(self, cwd: str, env: dict[str, str] | None = None):
+        """
+        :param cwd: the working directory of the session
+        :param env: the environment of the session's shell; if None, a copy of the current environment is used
+        """
+        self.cwd = cwd
+        self._sentinel = f"__SERENA_SHELL_SESSION_{uuid.uuid4().hex}__"
+        self._process = subprocess.Popen(
+            [self.SHELL],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=dict(os.environ) if env is None else env,
+            start_new_session=True,
+            **subprocess_kwargs(),
+        )
+        self._lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def execute(
+        self, command: str, capture_stderr: bool = False, max_output_chars: int | None = None, timeout: float | None = None
+    ) -> ShellCommandResult:
+        """
+        Execute a command in the session.
+
+        :param command: the command to execute.
+        :param capture_stderr: whether to capture the stderr output; if False, it is written to this process' stderr.
+        :param max_output_chars: the maximum number of characters to keep for each of stdout and stderr;
+            further output is discarded (and the number of omitted characters is noted at the end of the output).
+        :param timeout: the maximum time, in seconds, to wait for the command to finish; if it is exceeded,
+            the session is terminated and a TimeoutError is raised.
+        :return: the output of the command. If the session's shell died while executing the command, the return code is
+            the shell's return code and the session can no longer be used.
+        """
+        with self._lock:
+            if not self.is_alive():
+                raise RuntimeError(f"Shell session in {self.cwd} is no longer running")
+            marker = f"\n{self._sentinel}".encode()
+            stdout = _FramedOutput(marker + b" ", max_output_chars)
+            stderr = _FramedOutput(marker, max_output_chars)
+            frame = (
+                f"( eval {shlex.quote(command)}\n) </dev/null; __serena_rc=$?; "
+                f"printf '\\n%s\\n' '{self._sentinel}' >&2; printf '\\n%s %d\\n' '{self._sentinel}' \"$__serena_rc\"\n"
+            )
+            assert self._process.stdin is not None and self._process.stdout is not None and self._process.stderr is not None
+            try:
+                self._process.stdin.write(frame.encode())
+                self._process.stdin.flush()
+            except OSError:
+                pass  # the shell died; handled below
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with selectors.DefaultSelector() as selector:
+                selector.register(self._process.stdout, selectors.EVENT_READ, stdout)
+                selector.register(self._process.stderr, selectors.EVENT_READ, stderr)
+                while not (stdout.complete and stderr.complete) and selector.get_map():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self.close()
+                        raise TimeoutError(f"Command did not finish within {timeout} seconds: {command}")
+                    for key, _ in selector.select(remaining):
+                        data = os.read(key.fd, 65536)
+                        output: _FramedOutput = key.data
+                        if not data:
+                            selector.unregister(key.fileobj)
+                            continue
+                        output.feed(data)
+                        if output.complete:
+                            selector.unregister(key.fileobj)
+
+            if not capture_stderr and stderr.num_chars > 0:
+                sys.stderr.write(stderr.get_text())
+            if stdout.trailer is not None:
+                return_code = int(stdout.trailer)
+            else:
+                return_code = self._process.wait()
+                log.warning(f"Shell session in {self.cwd} terminated while executing command (return code {return_code}): {command}")
+            return ShellCommandResult(
+                stdout=stdout.get_text(), stderr=stderr.get_text() if capture_stderr else None, return_code=return_code, cwd=self.cwd
+            )
+
+    def close(self) -> None:
+        if self.is_alive():
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except OSError:
+                self._process.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout, self._process.stderr):
+            if stream is not None:
+                stream.close()
+
+
+class ShellSessionPool:
+    """
+    A pool of shell sessions, keyed by working directory.
+    Sessions which are busy are not shared, i.e. concurrent commands for the same directory use separate sessions,
+    and sessions whose shell has died are replaced by new ones.
+    On platforms other than POSIX, commands are executed via :func:`execute_shell_command`.
+    """
+
+    def __init__(self, max_idle_sessions_per_cwd: int = 2, env: dict[str, str] | None = None):
+        """
+        :param max_idle_sessions_per_cwd: the maximum number of idle sessions to keep per working directory
+        :param env: the environment for new sessions; if None, a copy of the current environment at session creation is used
+        """
+        self._max_idle_sessions_per_cwd = max_idle_sessions_per_cwd
+        self._env = env
+        self._idle_sessions: dict[str, list[ShellSession]] = {}
+        self._lock = threading.Lock()
+        self.is_supported = platform.system() != "Windows"
+
+    def execute(
+        self, command: str, cwd: str | None = None, capture_stderr: bool = False, max_output_chars: int | None = None
+    ) -> ShellCommandResult:
+        """
+        Execute a shell command in a session for the given working directory.
+
+        :param command: the command to execute.
+        :param cwd: the working directory to execute the command in. If None, the current working directory will be used.
+        :param capture_stderr: whether to capture the stderr output.
+        :param max_output_chars: the maximum number of characters to keep for each of stdout and stderr.
+        :return: the output of the command.
+        """
+        cwd = os.path.abspath(os.getcwd() if cwd is None else cwd)
+        if not self.is_supported:
+            return execute_shell_command(command, cwd=cwd, capture_stderr=capture_stderr)
+
+        session = self._acquire(cwd)
+        try:
+            return session.execute(command, capture_stderr=capture_stderr, max_output_chars=max_output_chars)
+        finally:
+            self._release(session)
+
+    def _acquire(self, cwd: str) -> ShellSession:
+        with self._lock:
+            sessions = self._idle_sessions.get(cwd, [])
+            while sessions:
+                session = sessions.pop()
+                if session.is_alive():
+                    return session
+                session.close()
+        log.info(f"Starting shell session in {cwd}")
+        return ShellSession(cwd, env=None if self._env is None else dict(self._env))
+
+    def _release(self, session: ShellSession) -> None:
+        if session.is_alive():
+            with self._lock:
+                sessions = self._idle_sessions.setdefault(session.cwd, [])
+                if len(sessions) < self._max_idle_sessions_per_cwd:
+                    sessions.append(session)
+                    return
+        session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = [s for cwd_sessions in self._idle_sessions.values() for s in cwd_sessions]
+            self._idle_sessions.clear()
+        for session in sessions:
+            session.close()
+
+
 def subprocess_check_output(args: list[str], encoding: str = "utf-8", strip: bool = True, timeout: float | None = None) -> str:
     output = subprocess.check_output(args, stdin=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout, env=os.environ.copy(), **subprocess_kwargs()).decode(encoding)  # type: ignore
     if strip:
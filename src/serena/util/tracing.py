@@ -0,0 +1,233 @@
+"""
+Lightweight tracing with nested spans.
+
+The data model follows OpenTelemetry (trace and span ids, parent span ids, nanosecond timestamps, attributes, status),
+and traces are exported in the OTLP JSON format, but no external collector or library is required.
+Tracing is disabled by default, in which case opening a span costs no more than checking a flag.
+
+A trace is exported once its root span ends. Spans which are opened by a thread are nested in the span that
+was open in the same thread (spans opened in other threads, e.g. thread pools, start new traces unless the
+span requires a parent).
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_ns: int
+    end_time_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    is_error: bool = False
+    status_message: str = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp_dict(self) -> dict[str, Any]:
+        """
+        :return: the span in the OTLP JSON representation
+        """
+        result: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.status_message} if self.is_error else {"code": 1},
+        }
+        if self.parent_span_id is not None:
+            result["parentSpanId"] = self.parent_span_id
+        return result
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_document(spans: list[Span], service_name: str = "serena") -> dict[str, Any]:
+    """
+    :param spans: the spans of one or more traces
+    :param service_name: the name of the service which emitted the spans
+    :return: an OTLP JSON document (as accepted by OpenTelemetry collectors and many trace viewers)
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp_dict() for span in spans]}],
+            }
+        ]
+    }
+
+
+class TraceExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """
+        Export the spans of a completed trace (root span first, then in order of their start).
+        Called in the thread which ended the root span, so implementations should be fast.
+        """
+
+
+class JsonFileTraceExporter(TraceExporter):
+    """
+    Appends every trace to a file as a single line containing an OTLP JSON document.
+    """
+
+    def __init__(self, path: str, service_name: str = "serena"):
+        self.path = path
+        self._service_name = service_name
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, spans: list[Span]) -> None:
+        line = json.dumps(to_otlp_document(spans, self._service_name), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class InMemoryTraceExporter(TraceExporter):
+    """
+    Retains the most recent traces in memory (e.g. for display in a dashboard).
+    """
+
+    def __init__(self, max_traces: int = 200):
+        self._traces: deque[list[Span]] = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self._traces.append(spans)
+
+    def get_traces(self) -> list[list[Span]]:
+        """
+        :return: the retained traces (oldest first), each given as a list of spans with the root span first
+        """
+        with self._lock:
+            return list(self._traces)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+
+class _ActiveSpan:
+    """A span which is open, together with the list collecting the spans of its trace"""
+
+    def __init__(self, span: Span, trace_spans: list[Span]):
+        self.span = span
+        self.trace_spans = trace_spans
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self._exporters: list[TraceExporter] = []
+        self._current: contextvars.ContextVar[_ActiveSpan | None] = contextvars.ContextVar("current_span", default=None)
+        self.enabled = False
+
+    def add_exporter(self, exporter: TraceExporter) -> None:
+        """
+        Adds an exporter and enables tracing.
+        """
+        self._exporters.append(exporter)
+        self.enabled = True
+
+    def remove_exporter(self, exporter: TraceExporter) -> None:
+        """
+        Removes an exporter; tracing is disabled once no exporters remain.
+        """
+        self._exporters.remove(exporter)
+        self.enabled = len(self._exporters) > 0
+
+    def get_current_span(self) -> Span | None:
+        active = self._current.get()
+        return active.span if active is not None else None
+
+    def span(
+        self, name: str, attributes: dict[str, Any] | None = None, require_parent: bool = False
+    ) -> AbstractContextManager[Span | None]:
+        """
+        Opens a span, which is ended when the context is exited. Exceptions propagating through the span mark it as failed.
+
+        :param name: the name of the span
+        :param attributes: the span's initial attributes
+        :param require_parent: whether to record the span only if it is nested in another span (i.e. not to start a new trace)
+        :return: a context manager providing the span, or None if the span is not recorded
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, attributes, require_parent)
+
+    @contextmanager
+    def _span(self, name: str, attributes: dict[str, Any] | None, require_parent: bool) -> Iterator[Span | None]:
+        parent = self._current.get()
+        if parent is None and require_parent:
+            yield None
+            return
+
+        if parent is None:
+            span = Span(name, os.urandom(16).hex(), os.urandom(8).hex(), None, time.time_ns(), attributes=dict(attributes or {}))
+            trace_spans = [span]
+        else:
+            span = Span(
+                name, parent.span.trace_id, os.urandom(8).hex(), parent.span.span_id, time.time_ns(), attributes=dict(attributes or {})
+            )
+            trace_spans = parent.trace_spans
+            trace_spans.append(span)
+
+        token = self._current.set(_ActiveSpan(span, trace_spans))
+        try:
+            yield span
+        except BaseException as e:
+            span.is_error = True
+            span.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_time_ns = time.time_ns()
+            self._current.reset(token)
+            if parent is None:
+                self._export(trace_spans)
+
+    def _export(self, spans: list[Span]) -> None:
+        for exporter in list(self._exporters):
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                log.error(f"Failed to export trace with {exporter}: {e}", exc_info=e)
+
+
+_NO_SPAN: AbstractContextManager[None] = nullcontext()
+
+tracer = Tracer()
+"""the global tracer"""
@@ -8,6 +8,7 @@ import pickle
 import shutil
 import subprocess
 import threading
+import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from collections.abc import Iterator
@@ -21,13 +22,15 @@ import pathspec
 
 from serena.text_utils import MatchedConsecutiveLines
 from serena.util.file_system import match_path
+from serena.util.metrics import metrics
+from serena.util.tracing import tracer
 from solidlsp import ls_types
 from solidlsp.ls_config import Language, LanguageServerConfig
 from solidlsp.ls_exceptions import SolidLSPException
-from solidlsp.ls_handler import SolidLanguageServerHandler
+from solidlsp.ls_handler import RequestPriority, SolidLanguageServerHandler
 from solidlsp.ls_logger import LanguageServerLogger
 from solidlsp.ls_types import UnifiedSymbolInformation
-from solidlsp.ls_utils import FileUtils, PathUtils, TextUtils
+from solidlsp.ls_utils import FileUtils, LineIndex, PathUtils, TextUtils
 from solidlsp.lsp_protocol_handler import lsp_types
 from solidlsp.lsp_protocol_handler import lsp_types as LSPTypes
 from solidlsp.lsp_protocol_handler.lsp_constants import LSPConstants
@@ -39,6 +42,17 @@ from solidlsp.lsp_protocol_handler.server import (
 )
 from solidlsp.settings import SolidLSPSettings
 
+_document_symbols_cache_requests = metrics.counter(
+    "solidlsp_document_symbols_cache_requests_total",
+    "Number of document symbol requests by cache result (hit, miss, or stale for outdated entries)",
+    ["result"],
+)
+_cache_save_duration = metrics.histogram(
+    "solidlsp_cache_save_duration_seconds",
+    "Duration of saving the document symbols cache",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
 GenericDocumentSymbol = Union[LSPTypes.DocumentSymbol, LSPTypes.SymbolInformation, ls_types.UnifiedSymbolInformation]
 
 
@@ -51,31 +65,94 @@ class ReferenceInSymbol:
     character: int
 
 
-@dataclasses.dataclass
 class LSPFileBuffer:
     """
     This class is used to store the contents of an open LSP file in memory.
+
+    The line index of the contents (for mapping between positions and indices) and the content hash are computed
+    lazily and are recomputed only when they are requested after the contents were modified, i.e. a batch of edits
+    incurs the cost only once.
     """
 
-    # uri of the file
-    uri: str
+    def __init__(self, uri: str, contents: str, version: int, language_id: str, ref_count: int):
+        # uri of the file
+        self.uri = uri
+        # The version of the file
+        self.version = version
+        # The language id of the file
+        self.language_id = language_id
+        # reference count of the file
+        self.ref_count = ref_count
+        self._contents = contents
+        self._line_index: LineIndex | None = None
+        self._content_hash: str | None = None
+
+    @property
+    def contents(self) -> str:
+        """The contents of the file"""
+        return self._contents
+
+    @contents.setter
+    def contents(self, contents: str) -> None:
+        self._contents = contents
+        self._line_index = None
+        self._content_hash = None
+
+    @property
+    def line_index(self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(self._contents)
+        return self._line_index
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = hashlib.md5(self._contents.encode("utf-8")).hexdigest()
+        return self._content_hash
+
+    def insert_text_at_position(self, line: int, col: int, text_to_be_inserted: str) -> tuple[int, int]:
+        """
+        Inserts the given text at the given position.
+
+        :return: the line and column of the end of the inserted text
+        """
+        self.contents, new_l, new_c = TextUtils.insert_text_at_position(
+            self._contents, line, col, text_to_be_inserted, line_index=self.line_index
+        )
+        return new_l, new_c
 
-    # The contents of the file
-    contents: str
+    def delete_text_between_positions(self, start_line: int, start_col: int, end_line: int, end_col: int) -> str:
+        """
+        Deletes the text between the given positions.
+
+        :return: the deleted text
+        """
+        self.contents, deleted_text = TextUtils.delete_text_between_positions(
+            self._contents, start_line, start_col, end_line, end_col, line_index=self.line_index
+        )
+        return deleted_text
 
-    # The version of the file
-    version: int
+    def apply_text_edits(self, edits: list[ls_types.TextEdit]) -> None:
+        """
+        Applies the given (non-overlapping) text edits, whose ranges refer to the current contents, in a single pass.
+        """
+        self.contents = TextUtils.apply_text_edits(self._contents, edits, line_index=self.line_index)
 
-    # The language id of the file
-    language_id: str
 
-    # reference count of the file
-    ref_count: int
+@dataclasses.dataclass
+class IndexOnlyReadReport:
+    """
+    Collects information on the quality of the results of symbol queries that were answered from the persisted
+    document symbol cache (index) instead of the language server
+    """
 
-    content_hash: str = ""
+    stale_paths: list[str] = dataclasses.field(default_factory=list)
+    """relative paths of files which changed since their symbols were cached (the cached symbols were served nonetheless)"""
+    unindexed_paths: list[str] = dataclasses.field(default_factory=list)
+    """relative paths of files for which no symbols were cached (no symbols were served)"""
 
-    def __post_init__(self):
-        self.content_hash = hashlib.md5(self.contents.encode("utf-8")).hexdigest()
+    def is_complete(self) -> bool:
+        return not self.stale_paths and not self.unindexed_paths
 
 
 class SolidLanguageServer(ABC):
@@ -85,6 +162,11 @@ class SolidLanguageServer(ABC):
     """
 
     CACHE_FOLDER_NAME = "cache"
+    CONTENT_CHANGE_SIZE_OVERHEAD = 100
+    """
+    the approximate size (in characters) of a serialised range-based content change without its text;
+    used to decide whether to send individual changes or the full document contents to the language server
+    """
 
     # To be overridden and extended by subclasses
     def is_ignored_dirname(self, dirname: str) -> bool:
@@ -186,6 +268,9 @@ class SolidLanguageServer(ABC):
 
         self.language_id = language_id
         self.open_file_buffers: dict[str, LSPFileBuffer] = {}
+        self._open_file_buffers_lock = threading.RLock()
+        """guards the bookkeeping of open file buffers, which may be accessed concurrently (e.g. by background cache warming)"""
+        self._index_only_state = threading.local()
         self.language = Language(language_id)
 
         # load cache first to prevent any racing conditions due to asyncio stuff
@@ -249,6 +334,42 @@ class SolidLanguageServer(ABC):
         """
         self.server.set_request_timeout(timeout)
 
+    @contextmanager
+    def background_requests(self) -> Iterator[None]:
+        """
+        Context manager within which all requests sent by the current thread are treated as background requests,
+        i.e. they are deferred while interactive requests (e.g. from tool calls) are in flight.
+        """
+        with self.server.request_priority(RequestPriority.BACKGROUND):
+            yield
+
+    def clear_document_symbols_cache(self) -> None:
+        """
+        Clears the in-memory document symbols cache, such that symbols are requested from the language server again
+        (the cache file is not affected).
+        """
+        with self._cache_lock:
+            self._document_symbols_cache = {}
+
+    def get_document_symbols_cache_size(self) -> int:
+        """
+        :return: the number of entries in the document symbols cache
+        """
+        return len(self._document_symbols_cache)
+
+    def get_process_memory_usage(self) -> int | None:
+        """
+        :return: the resident set size, in bytes, of the language server process including its child processes
+            (None if the process is not running)
+        """
+        return self.server.get_process_memory_usage()
+
+    def get_request_queue_stats(self) -> dict[str, dict[str, float]]:
+        """
+        :return: a mapping from request priority class to statistics on queueing delays
+        """
+        return self.server.get_request_queue_stats()
+
     def get_ignore_spec(self) -> pathspec.PathSpec:
         """Returns the pathspec matcher for the paths that were configured to be ignored through
         the multilspy config.
@@ -384,41 +505,43 @@ class SolidLanguageServer(ABC):
         absolute_file_path = str(PurePath(self.repository_root_path, relative_file_path))
         uri = pathlib.Path(absolute_file_path).as_uri()
 
-        if uri in self.open_file_buffers:
-            assert self.open_file_buffers[uri].uri == uri
-            assert self.open_file_buffers[uri].ref_count >= 1
-
-            self.open_file_buffers[uri].ref_count += 1
-            yield self.open_file_buffers[uri]
-            self.open_file_buffers[uri].ref_count -= 1
-        else:
-            contents = FileUtils.read_file(absolute_file_path, self._encoding)
+        with self._open_file_buffers_lock:
+            file_buffer = self.open_file_buffers.get(uri)
+            if file_buffer is not None:
+                assert file_buffer.uri == uri
+                assert file_buffer.ref_count >= 1
+                file_buffer.ref_count += 1
+            else:
+                contents = FileUtils.read_file(absolute_file_path, self._encoding)
 
-            version = 0
-            self.open_file_buffers[uri] = LSPFileBuffer(uri, contents, version, self.language_id, 1)
+                version = 0
+                file_buffer = LSPFileBuffer(uri, contents, version, self.language_id, 1)
+                self.open_file_buffers[uri] = file_buffer
 
-            self.server.notify.did_open_text_document(
-                {
-                    LSPConstants.TEXT_DOCUMENT: {
-                        LSPConstants.URI: uri,
-                        LSPConstants.LANGUAGE_ID: self.language_id,
-                        LSPConstants.VERSION: 0,
-                        LSPConstants.TEXT: contents,
+                self.server.notify.did_open_text_document(
+                    {
+                        LSPConstants.TEXT_DOCUMENT: {
+                            LSPConstants.URI: uri,
+                            LSPConstants.LANGUAGE_ID: self.language_id,
+                            LSPConstants.VERSION: 0,
+                            LSPConstants.TEXT: contents,
+                        }
                     }
-                }
-            )
-            yield self.open_file_buffers[uri]
-            self.open_file_buffers[uri].ref_count -= 1
+                )
 
-        if self.open_file_buffers[uri].ref_count == 0:
-            self.server.notify.did_close_text_document(
-                {
-                    LSPConstants.TEXT_DOCUMENT: {
-                        LSPConstants.URI: uri,
+        yield file_buffer
+
+        with self._open_file_buffers_lock:
+            file_buffer.ref_count -= 1
+            if file_buffer.ref_count == 0:
+                self.server.notify.did_close_text_document(
+                    {
+                        LSPConstants.TEXT_DOCUMENT: {
+                            LSPConstants.URI: uri,
+                        }
                     }
-                }
-            )
-            del self.open_file_buffers[uri]
+                )
+                del self.open_file_buffers[uri]
 
     def insert_text_at_position(self, relative_file_path: str, line: int, column: int, text_to_be_inserted: str) -> ls_types.Position:
         """
@@ -446,8 +569,7 @@ class SolidLanguageServer(ABC):
         file_buffer = self.open_file_buffers[uri]
         file_buffer.version += 1
 
-        new_contents, new_l, new_c = TextUtils.insert_text_at_position(file_buffer.contents, line, column, text_to_be_inserted)
-        file_buffer.contents = new_contents
+        new_l, new_c = file_buffer.insert_text_at_position(line, column, text_to_be_inserted)
         self.server.notify.did_change_text_document(
             {
                 LSPConstants.TEXT_DOCUMENT: {
@@ -491,10 +613,9 @@ class SolidLanguageServer(ABC):
 
         file_buffer = self.open_file_buffers[uri]
         file_buffer.version += 1
-        new_contents, deleted_text = TextUtils.delete_text_between_positions(
-            file_buffer.contents, start_line=start["line"], start_col=start["character"], end_line=end["line"], end_col=end["character"]
+        deleted_text = file_buffer.delete_text_between_positions(
+            start_line=start["line"], start_col=start["character"], end_line=end["line"], end_col=end["character"]
         )
-        file_buffer.contents = new_contents
         self.server.notify.did_change_text_document(
             {
                 LSPConstants.TEXT_DOCUMENT: {
@@ -829,6 +950,111 @@ class SolidLanguageServer(ABC):
 
             return [json.loads(json_repr) for json_repr in set(json.dumps(item, sort_keys=True) for item in completions_list)]
 
+    @contextmanager
+    def index_only_reads(self) -> Iterator[IndexOnlyReadReport]:
+        """
+        Context manager within which document symbol queries issued by the current thread are answered exclusively from the
+        (persisted) document symbol cache, without any communication with the language server process.
+        This allows read-only symbol queries to be answered while the language server is not available (e.g. while it is
+        starting up or restarting).
+        Cached symbols of files that have changed since they were cached are served nonetheless but are reported as stale;
+        files without cached symbols are treated as having no symbols.
+
+        :return: the report, which is filled while queries are processed
+        """
+        previous_report = self._get_index_only_report()
+        report = IndexOnlyReadReport()
+        self._index_only_state.report = report
+        try:
+            yield report
+        finally:
+            self._index_only_state.report = previous_report
+
+    def _get_index_only_report(self) -> IndexOnlyReadReport | None:
+        return getattr(self._index_only_state, "report", None)
+
+    def notify_file_changed(
+        self, relative_file_path: str, change_type: lsp_types.FileChangeType = lsp_types.FileChangeType.Changed
+    ) -> None:
+        """
+        Informs the language server that the given file was created, changed or deleted on disk by means other than
+        the editing methods of this class; see `notify_files_changed`.
+
+        :param relative_file_path: the relative path of the file
+        :param change_type: the type of the change
+        """
+        self.notify_files_changed([relative_file_path], change_type)
+
+    def notify_files_changed(
+        self, relative_file_paths: list[str], change_type: lsp_types.FileChangeType = lsp_types.FileChangeType.Changed
+    ) -> None:
+        """
+        Informs the language server that the given files were created, changed or deleted on disk by means other than
+        the editing methods of this class and drops the cached document symbols of the files.
+        For files that are currently open, the open buffer is updated with the new contents, which are sent to the language
+        server via `textDocument/didChange`; all other files are reported in a single `workspace/didChangeWatchedFiles` notification.
+
+        :param relative_file_paths: the relative paths of the files
+        :param change_type: the type of the change
+        """
+        for relative_file_path in relative_file_paths:
+            self._invalidate_document_symbols_cache(relative_file_path)
+        if not self.server_started:
+            return
+
+        file_events: list[lsp_types.FileEvent] = []
+        with self._open_file_buffers_lock:
+            for relative_file_path in relative_file_paths:
+                absolute_file_path = os.path.join(self.repository_root_path, relative_file_path)
+                uri = pathlib.Path(absolute_file_path).as_uri()
+                file_buffer = self.open_file_buffers.get(uri)
+                if file_buffer is None or change_type != lsp_types.FileChangeType.Changed:
+                    file_events.append({"uri": uri, "type": change_type})
+                    continue
+                contents = FileUtils.read_file(absolute_file_path, self._encoding)
+                if contents != file_buffer.contents:
+                    file_buffer.contents = contents
+                    file_buffer.version += 1
+                    self.server.notify.did_change_text_document(
+                        {
+                            LSPConstants.TEXT_DOCUMENT: {
+                                LSPConstants.VERSION: file_buffer.version,
+                                LSPConstants.URI: file_buffer.uri,
+                            },
+                            LSPConstants.CONTENT_CHANGES: [{"text": contents}],  # type: ignore[typeddict-item]
+                        }
+                    )
+        if file_events:
+            self.server.notify.did_change_watched_files({"changes": file_events})
+
+    def _invalidate_document_symbols_cache(self, relative_file_path: str) -> None:
+        """
+        Removes the cached document symbols of the given file (if any)
+        """
+        with self._cache_lock:
+            for path in {relative_file_path, os.path.normpath(relative_file_path)}:
+                for include_body in (False, True):
+                    if self._document_symbols_cache.pop(f"{path}-{include_body}", None) is not None:
+                        self._cache_has_changed = True
+
+    def _read_document_symbols_from_cache(
+        self, relative_file_path: str, include_body: bool, report: IndexOnlyReadReport
+    ) -> tuple[list[ls_types.UnifiedSymbolInformation], list[ls_types.UnifiedSymbolInformation]]:
+        contents = FileUtils.read_file(os.path.join(self.repository_root_path, relative_file_path), self._encoding)
+        content_hash = hashlib.md5(contents.encode("utf-8")).hexdigest()
+        with self._cache_lock:
+            file_hash_and_result = self._document_symbols_cache.get(f"{relative_file_path}-{include_body}")
+            if file_hash_and_result is None and not include_body:
+                # symbols including bodies are a superset of the symbols without bodies
+                file_hash_and_result = self._document_symbols_cache.get(f"{relative_file_path}-True")
+        if file_hash_and_result is None:
+            report.unindexed_paths.append(relative_file_path)
+            return [], []
+        file_hash, result = file_hash_and_result
+        if file_hash != content_hash:
+            report.stale_paths.append(relative_file_path)
+        return result
+
     def request_document_symbols(
         self, relative_file_path: str, include_body: bool = False
     ) -> tuple[list[ls_types.UnifiedSymbolInformation], list[ls_types.UnifiedSymbolInformation]]:
@@ -847,6 +1073,10 @@ class SolidLanguageServer(ABC):
         """
         # TODO: it's kinda dumb to not use the cache if include_body is False after include_body was True once
         #   Should be fixed in the future, it's a small performance optimization
+        index_only_report = self._get_index_only_report()
+        if index_only_report is not None:
+            return self._read_document_symbols_from_cache(relative_file_path, include_body, index_only_report)
+
         cache_key = f"{relative_file_path}-{include_body}"
         with self.open_file(relative_file_path) as file_data:
             with self._cache_lock:
@@ -855,11 +1085,14 @@ class SolidLanguageServer(ABC):
                     file_hash, result = file_hash_and_result
                     if file_hash == file_data.content_hash:
                         self.logger.log(f"Returning cached document symbols for {relative_file_path}", logging.DEBUG)
+                        _document_symbols_cache_requests.inc("hit")
                         return result
                     else:
                         self.logger.log(f"Content for {relative_file_path} has changed. Will overwrite in-memory cache", logging.DEBUG)
+                        _document_symbols_cache_requests.inc("stale")
                 else:
                     self.logger.log(f"No cache hit for symbols with {include_body=} in {relative_file_path}", logging.DEBUG)
+                    _document_symbols_cache_requests.inc("miss")
 
             self.logger.log(f"Requesting document symbols for {relative_file_path} from the Language Server", logging.DEBUG)
             response = self.server.send.document_symbol(
@@ -1052,8 +1285,11 @@ class SolidLanguageServer(ABC):
 
                     # Create file symbol, link with children
                     file_rel_path = str(Path(contained_dir_or_file_abs_path).resolve().relative_to(self.repository_root_path))
-                    with self.open_file(file_rel_path) as file_data:
-                        fileRange = self._get_range_from_file_content(file_data.contents)
+                    if self._get_index_only_report() is not None:
+                        fileRange = self._get_range_from_file_content(FileUtils.read_file(contained_dir_or_file_abs_path, self._encoding))
+                    else:
+                        with self.open_file(file_rel_path) as file_data:
+                            fileRange = self._get_range_from_file_content(file_data.contents)
                     file_symbol = ls_types.UnifiedSymbolInformation(  # type: ignore
                         name=os.path.splitext(contained_dir_or_file_name)[0],
                         kind=ls_types.SymbolKind.File,
@@ -1563,18 +1799,25 @@ class SolidLanguageServer(ABC):
             / "document_symbols_cache_v23-06-25.pkl"
         )
 
-    def save_cache(self):
-        with self._cache_lock:
-            if not self._cache_has_changed:
+    def save_cache(self, force: bool = False):
+        """
+        Saves the document symbols cache to disk if it has changed since it was last saved or loaded.
+
+        :param force: whether to save the cache even if it has not changed
+        """
+        with self._cache_lock, tracer.span("ls.save_cache", require_parent=True):
+            if not self._cache_has_changed and not force:
                 self.logger.log("No changes to document symbols cache, skipping save", logging.DEBUG)
                 return
 
             self.logger.log(f"Saving updated document symbols cache to {self.cache_path}", logging.INFO)
             self.cache_path.parent.mkdir(parents=True, exist_ok=True)
             try:
+                start_time = time.monotonic()
                 with open(self.cache_path, "wb") as f:
                     pickle.dump(self._document_symbols_cache, f)
                 self._cache_has_changed = False
+                _cache_save_duration.observe(time.monotonic() - start_time)
             except Exception as e:
                 self.logger.log(
                     f"Failed to save document symbols cache to {self.cache_path}: {e}. "
@@ -1586,7 +1829,7 @@ class SolidLanguageServer(ABC):
         if not self.cache_path.exists():
             return
 
-        with self._cache_lock:
+        with self._cache_lock, tracer.span("ls.load_cache", require_parent=True):
             self.logger.log(f"Loading document symbols cache from {self.cache_path}", logging.INFO)
             try:
                 with open(self.cache_path, "rb") as f:
@@ -1656,22 +1899,49 @@ class SolidLanguageServer(ABC):
 
     def apply_text_edits_to_file(self, relative_path: str, edits: list[ls_types.TextEdit]) -> None:
         """
-        Apply a list of text edits to a file.
+        Apply a list of (non-overlapping) text edits, whose ranges refer to the current contents of the file, to the file buffer.
+        All edits are communicated to the language server in a single `textDocument/didChange` notification, which either
+        contains the individual changes or, if this is cheaper, the full new document contents.
 
         :param relative_path: The relative path of the file to edit
         :param edits: List of TextEdit dictionaries to apply
         """
-        with self.open_file(relative_path):
-            # Sort edits by position (latest first) to avoid position shifts
-            sorted_edits = sorted(edits, key=lambda e: (e["range"]["start"]["line"], e["range"]["start"]["character"]), reverse=True)
+        if not edits:
+            return
+        if not self.server_started:
+            self.logger.log(
+                "apply_text_edits_to_file called before Language Server started",
+                logging.ERROR,
+            )
+            raise SolidLSPException("Language Server not started")
+
+        with self.open_file(relative_path) as file_buffer:
+            file_buffer.apply_text_edits(edits)
+            file_buffer.version += 1
 
-            for edit in sorted_edits:
-                start_pos = ls_types.Position(line=edit["range"]["start"]["line"], character=edit["range"]["start"]["character"])
-                end_pos = ls_types.Position(line=edit["range"]["end"]["line"], character=edit["range"]["end"]["character"])
+            content_changes: list[dict]
+            if sum(len(edit["newText"]) for edit in edits) + self.CONTENT_CHANGE_SIZE_OVERHEAD * len(edits) >= len(file_buffer.contents):
+                content_changes = [{"text": file_buffer.contents}]
+            else:
+                # The changes in a notification are applied one after the other, so we send them in reverse document order,
+                # such that the ranges of all changes remain valid; the index is used as a secondary key to retain the order
+                # of insertions at the same position
+                indexed_edits = sorted(
+                    enumerate(edits),
+                    key=lambda ie: (ie[1]["range"]["start"]["line"], ie[1]["range"]["start"]["character"], ie[0]),
+                    reverse=True,
+                )
+                content_changes = [{LSPConstants.RANGE: edit["range"], "text": edit["newText"]} for _, edit in indexed_edits]
 
-                # Delete the old text and insert the new text
-                self.delete_text_between_positions(relative_path, start_pos, end_pos)
-                self.insert_text_at_position(relative_path, start_pos["line"], start_pos["character"], edit["newText"])
+            self.server.notify.did_change_text_document(
+                {
+                    LSPConstants.TEXT_DOCUMENT: {
+                        LSPConstants.VERSION: file_buffer.version,
+                        LSPConstants.URI: file_buffer.uri,
+                    },
+                    LSPConstants.CONTENT_CHANGES: content_changes,  # type: ignore[typeddict-item]
+                }
+            )
 
     def start(self) -> "SolidLanguageServer":
         """
@@ -6,14 +6,18 @@ import platform
 import subprocess
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from enum import Enum
 from queue import Empty, Queue
 from typing import Any
 
 import psutil
 from sensai.util.string import ToStringMixin
 
+from serena.util.metrics import metrics
+from serena.util.tracing import tracer
 from solidlsp.ls_exceptions import SolidLSPException
 from solidlsp.ls_request import LanguageServerRequest
 from solidlsp.lsp_protocol_handler.lsp_requests import LspNotification
@@ -36,6 +40,11 @@ from solidlsp.util.subprocess_util import subprocess_kwargs
 
 log = logging.getLogger(__name__)
 
+_request_duration = metrics.histogram(
+    "solidlsp_request_duration_seconds", "Duration of language server requests (including queueing) by LSP method", ["method"]
+)
+_request_errors = metrics.counter("solidlsp_request_errors_total", "Number of failed language server requests by LSP method", ["method"])
+
 
 class LanguageServerTerminatedException(Exception):
     """
@@ -92,6 +101,45 @@ class Request(ToStringMixin):
             raise e
 
 
+class RequestPriority(Enum):
+    """
+    The priority class of a request sent to the language server
+    """
+
+    INTERACTIVE = "interactive"
+    """
+    requests issued on behalf of a tool call, which are sent immediately
+    """
+    BACKGROUND = "background"
+    """
+    requests issued by background work (e.g. cache pre-warming), which are deferred while interactive requests are in flight
+    """
+
+
+@dataclass
+class RequestQueueStats:
+    """
+    Statistics on the time requests of a priority class had to wait before being sent to the language server
+    """
+
+    count: int = 0
+    total_delay: float = 0.0
+    max_delay: float = 0.0
+
+    def add(self, delay: float) -> None:
+        self.count += 1
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total_delay_s": self.total_delay,
+            "avg_delay_s": self.total_delay / self.count if self.count > 0 else 0.0,
+            "max_delay_s": self.max_delay,
+        }
+
+
 class SolidLanguageServerHandler:
     """
     This class provides the implementation of Python client for the Language Server Protocol.
@@ -160,6 +208,16 @@ class SolidLanguageServerHandler:
         self._response_handlers_lock = threading.Lock()
         self._tasks_lock = threading.Lock()
 
+        # request prioritisation: background requests are deferred while interactive requests are in flight
+        # and are limited in number, such that they cannot delay interactive requests by more than a single request
+        self._priority_state = threading.local()
+        self._admission_condition = threading.Condition()
+        self._num_requests_in_flight = dict.fromkeys(RequestPriority, 0)
+        self._last_interactive_request_end = 0.0
+        self._max_background_requests_in_flight = 1
+        self._background_resume_delay = 0.05
+        self._request_queue_stats = {priority: RequestQueueStats() for priority in RequestPriority}
+
     def set_request_timeout(self, timeout: float | None) -> None:
         """
         :param timeout: the timeout, in seconds, for all requests sent to the language server.
@@ -454,10 +512,102 @@ class SolidLanguageServerHandler:
                 request.on_error(exception)
             self._pending_requests.clear()
 
+    @contextmanager
+    def request_priority(self, priority: RequestPriority) -> Iterator[None]:
+        """
+        Context manager which sets the priority of all requests sent by the current thread within the context.
+        Requests are interactive by default.
+
+        :param priority: the priority to apply
+        """
+        previous_priority = self.get_request_priority()
+        self._priority_state.priority = priority
+        try:
+            yield
+        finally:
+            self._priority_state.priority = previous_priority
+
+    def get_request_priority(self) -> RequestPriority:
+        """
+        :return: the priority with which requests are sent by the current thread
+        """
+        return getattr(self._priority_state, "priority", RequestPriority.INTERACTIVE)
+
+    def has_interactive_requests_in_flight(self) -> bool:
+        with self._admission_condition:
+            return self._num_requests_in_flight[RequestPriority.INTERACTIVE] > 0
+
+    def get_request_queue_stats(self) -> dict[str, dict[str, float]]:
+        """
+        :return: a mapping from priority class name to statistics on the queueing delay of requests of that class
+        """
+        with self._admission_condition:
+            return {priority.value: stats.to_dict() for priority, stats in self._request_queue_stats.items()}
+
+    def get_process_memory_usage(self) -> int | None:
+        """
+        :return: the resident set size, in bytes, of the language server process including its child processes
+            (None if the process is not running)
+        """
+        process = self.process
+        if process is None or process.returncode is not None:
+            return None
+        try:
+            parent = psutil.Process(process.pid)
+            processes = [parent, *parent.children(recursive=True)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        rss = 0
+        for p in processes:
+            try:
+                rss += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return rss
+
+    def _is_background_request_admissible(self) -> bool:
+        if self._num_requests_in_flight[RequestPriority.INTERACTIVE] > 0:
+            return False
+        if self._num_requests_in_flight[RequestPriority.BACKGROUND] >= self._max_background_requests_in_flight:
+            return False
+        return time.monotonic() - self._last_interactive_request_end >= self._background_resume_delay
+
+    def _acquire_request_slot(self, priority: RequestPriority) -> None:
+        enqueue_time = time.monotonic()
+        with self._admission_condition:
+            if priority == RequestPriority.BACKGROUND:
+                # wait with a timeout, such that we notice the process terminating and the resume delay passing
+                while self.is_running() and not self._is_background_request_admissible():
+                    self._admission_condition.wait(timeout=self._background_resume_delay)
+            self._num_requests_in_flight[priority] += 1
+            self._request_queue_stats[priority].add(time.monotonic() - enqueue_time)
+
+    def _release_request_slot(self, priority: RequestPriority) -> None:
+        with self._admission_condition:
+            self._num_requests_in_flight[priority] -= 1
+            if priority == RequestPriority.INTERACTIVE:
+                self._last_interactive_request_end = time.monotonic()
+            self._admission_condition.notify_all()
+
     def send_request(self, method: str, params: dict | None = None) -> PayloadLike:
         """
-        Send request to the server, register the request id, and wait for the response
+        Send request to the server, register the request id, and wait for the response.
+        The request is sent with the priority set for the current thread (see `request_priority`).
         """
+        priority = self.get_request_priority()
+        start_time = time.monotonic()
+        with tracer.span(f"lsp/{method}", {"lsp.method": method, "lsp.priority": priority.value}, require_parent=True):
+            self._acquire_request_slot(priority)
+            try:
+                return self._send_request(method, params)
+            except Exception:
+                _request_errors.inc(method)
+                raise
+            finally:
+                self._release_request_slot(priority)
+                _request_duration.observe(time.monotonic() - start_time, method)
+
+    def _send_request(self, method: str, params: dict | None) -> PayloadLike:
         with self._request_id_lock:
             request_id = self.request_id
             self.request_id += 1
@@ -10,7 +10,9 @@ import shutil
 import subprocess
 import uuid
 import zipfile
+from bisect import bisect_right
 from enum import Enum
+from itertools import accumulate
 from pathlib import Path, PurePath
 
 import charset_normalizer
@@ -18,7 +20,7 @@ import requests
 
 from solidlsp.ls_exceptions import SolidLSPException
 from solidlsp.ls_logger import LanguageServerLogger
-from solidlsp.ls_types import UnifiedSymbolInformation
+from solidlsp.ls_types import TextEdit, UnifiedSymbolInformation
 
 log = logging.getLogger(__name__)
 
@@ -27,43 +29,71 @@ class InvalidTextLocationError(Exception):
     pass
 
 
+class LineIndex:
+    """
+    Index of the offsets at which the lines of a text start, which allows a line/column position to be mapped to
+    an index in constant time and an index to be mapped to a line/column position in logarithmic time.
+    """
+
+    def __init__(self, text: str):
+        self._line_starts = [0]
+        self._line_starts.extend(accumulate(len(line) + 1 for line in text.split("\n")[:-1]))
+
+    @property
+    def num_lines(self) -> int:
+        return len(self._line_starts)
+
+    def get_index_from_line_col(self, line: int, col: int) -> int:
+        """
+        Returns the index of the given zero-indexed line and column number
+        """
+        if line >= len(self._line_starts):
+            raise InvalidTextLocationError
+        return self._line_starts[line] + col
+
+    def get_line_col_from_index(self, index: int) -> tuple[int, int]:
+        """
+        Returns the zero-indexed line and column number of the given index
+        """
+        line = bisect_right(self._line_starts, index) - 1
+        return line, index - self._line_starts[line]
+
+
 class TextUtils:
     """
     Utilities for text operations.
+
+    Functions which map between positions and indices accept an optional `LineIndex` of the text, which should be
+    passed whenever several positions in the same (unmodified) text are to be mapped.
     """
 
     @staticmethod
-    def get_line_col_from_index(text: str, index: int) -> tuple[int, int]:
+    def get_line_col_from_index(text: str, index: int, line_index: LineIndex | None = None) -> tuple[int, int]:
         """
         Returns the zero-indexed line and column number of the given index in the given text
         """
-        l = 0
-        c = 0
-        idx = 0
-        while idx < index:
-            if text[idx] == "\n":
-                l += 1
-                c = 0
-            else:
-                c += 1
-            idx += 1
-
-        return l, c
+        if line_index is not None:
+            return line_index.get_line_col_from_index(index)
+        if index > len(text):
+            raise IndexError(f"Index {index} is out of range for text of length {len(text)}")
+        line = text.count("\n", 0, index)
+        return line, index - (text.rfind("\n", 0, index) + 1)
 
     @staticmethod
-    def get_index_from_line_col(text: str, line: int, col: int) -> int:
+    def get_index_from_line_col(text: str, line: int, col: int, line_index: LineIndex | None = None) -> int:
         """
         Returns the index of the given zero-indexed line and column number in the given text
         """
+        if line_index is not None:
+            return line_index.get_index_from_line_col(line, col)
         idx = 0
         while line > 0:
-            if idx >= len(text):
+            newline_idx = text.find("\n", idx)
+            if newline_idx == -1:
                 raise InvalidTextLocationError
-            if text[idx] == "\n":
-                line -= 1
-            idx += 1
-        idx += col
-        return idx
+            idx = newline_idx + 1
+            line -= 1
+        return idx + col
 
     @staticmethod
     def _get_updated_position_from_line_and_column_and_edit(l: int, c: int, text_to_be_inserted: str) -> tuple[int, int]:
@@ -73,32 +103,36 @@ class TextUtils:
         num_newlines_in_gen_text = text_to_be_inserted.count("\n")
         if num_newlines_in_gen_text > 0:
             l += num_newlines_in_gen_text
-            c = len(text_to_be_inserted.split("\n")[-1])
+            c = len(text_to_be_inserted) - text_to_be_inserted.rfind("\n") - 1
         else:
             c += len(text_to_be_inserted)
         return (l, c)
 
     @staticmethod
-    def delete_text_between_positions(text: str, start_line: int, start_col: int, end_line: int, end_col: int) -> tuple[str, str]:
+    def delete_text_between_positions(
+        text: str, start_line: int, start_col: int, end_line: int, end_col: int, line_index: LineIndex | None = None
+    ) -> tuple[str, str]:
         """
         Deletes the text between the given start and end positions.
         Returns the modified text and the deleted text.
         """
-        del_start_idx = TextUtils.get_index_from_line_col(text, start_line, start_col)
-        del_end_idx = TextUtils.get_index_from_line_col(text, end_line, end_col)
+        del_start_idx = TextUtils.get_index_from_line_col(text, start_line, start_col, line_index=line_index)
+        del_end_idx = TextUtils.get_index_from_line_col(text, end_line, end_col, line_index=line_index)
 
         deleted_text = text[del_start_idx:del_end_idx]
         new_text = text[:del_start_idx] + text[del_end_idx:]
         return new_text, deleted_text
 
     @staticmethod
-    def insert_text_at_position(text: str, line: int, col: int, text_to_be_inserted: str) -> tuple[str, int, int]:
+    def insert_text_at_position(
+        text: str, line: int, col: int, text_to_be_inserted: str, line_index: LineIndex | None = None
+    ) -> tuple[str, int, int]:
         """
         Inserts the given text at the given line and column.
         Returns the modified text and the new line and column.
         """
         try:
-            change_index = TextUtils.get_index_from_line_col(text, line, col)
+            change_index = TextUtils.get_index_from_line_col(text, line, col, line_index=line_index)
         except InvalidTextLocationError:
             num_lines_in_text = text.count("\n") + 1
             max_line = num_lines_in_text - 1
@@ -112,6 +146,43 @@ class TextUtils:
         new_l, new_c = TextUtils._get_updated_position_from_line_and_column_and_edit(line, col, text_to_be_inserted)
         return new_text, new_l, new_c
 
+    @staticmethod
+    def apply_text_edits(text: str, edits: list[TextEdit], line_index: LineIndex | None = None) -> str:
+        """
+        Applies the given text edits, whose ranges all refer to the given (original) text, in a single pass.
+        As in the LSP specification, the ranges must not overlap and multiple insertions at the same position
+        are applied in the order in which they are given.
+
+        :param text: the text to edit
+        :param edits: the edits to apply
+        :param line_index: the line index of the given text (computed if not given)
+        :return: the modified text
+        """
+        if not edits:
+            return text
+        if line_index is None:
+            line_index = LineIndex(text)
+        spans = []
+        for edit in edits:
+            start, end = edit["range"]["start"], edit["range"]["end"]
+            start_idx = line_index.get_index_from_line_col(start["line"], start["character"])
+            end_idx = line_index.get_index_from_line_col(end["line"], end["character"])
+            if end_idx < start_idx:
+                raise InvalidTextLocationError(f"Invalid range in text edit: end {end} precedes start {start}")
+            spans.append((start_idx, end_idx, edit["newText"]))
+        spans.sort(key=lambda span: span[0])  # stable, i.e. insertions at the same position retain their order
+
+        pieces = []
+        idx = 0
+        for start_idx, end_idx, new_text in spans:
+            if start_idx < idx:
+                raise InvalidTextLocationError(f"Overlapping text edits at index {start_idx}")
+            pieces.append(text[idx:start_idx])
+            pieces.append(new_text)
+            idx = end_idx
+        pieces.append(text[idx:])
+        return "".join(pieces)
+
 
 class PathUtils:
     """
@@ -0,0 +1 @@
+print('hello')
\ No newline at end of file
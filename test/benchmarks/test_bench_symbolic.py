@@ -0,0 +1,66 @@
+"""
+Benchmarks of language server operations and symbolic tools for use with pytest-benchmark, e.g.
+
+    pytest test/benchmarks -m benchmark --benchmark-autosave
+    pytest test/benchmarks -m benchmark --benchmark-compare --benchmark-compare-fail=median:25%
+
+The same operations are timed by `serena bench`, which does not require pytest-benchmark.
+"""
+
+from collections.abc import Iterator
+
+import pytest
+
+from serena.benchmark import LanguageBenchmark, get_default_repos_dir
+from solidlsp.ls_config import Language
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module", params=[pytest.param(Language.PYTHON, marks=pytest.mark.python)])
+def bench(request: pytest.FixtureRequest) -> Iterator[LanguageBenchmark]:
+    with LanguageBenchmark(request.param, get_default_repos_dir()) as language_benchmark:
+        yield language_benchmark
+
+
+def test_ls_cold_start(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark.pedantic(bench.restart_language_server, rounds=3, iterations=1)
+
+
+def test_full_symbol_tree_cold(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark.pedantic(bench.request_full_symbol_tree_cold, rounds=3, iterations=1)
+
+
+def test_full_symbol_tree_warm(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.request_full_symbol_tree_warm)
+
+
+def test_get_symbols_overview(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.get_symbols_overview)
+
+
+def test_find_symbol(benchmark, bench: LanguageBenchmark) -> None:
+    result = benchmark(bench.find_symbol)
+    assert bench.target_symbol in result
+
+
+def test_find_referencing_symbols(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.find_referencing_symbols)
+
+
+def test_search_for_pattern(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.search_for_pattern)
+
+
+def test_cache_save(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.save_cache)
+
+
+def test_cache_load(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.load_cache)
+
+
+def test_symbolic_edit(benchmark, bench: LanguageBenchmark) -> None:
+    benchmark(bench.symbolic_edit)
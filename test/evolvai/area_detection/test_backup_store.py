@@ -0,0 +1,139 @@
+"""
+测试BackupStore的内容寻址备份存储
+"""
+
+import os
+
+import pytest
+
+from evolvai.area_detection.backup_store import BackupStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(str(tmp_path / "store"))
+
+
+def _write(path, content: str) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+class TestBackupStore:
+    """测试BackupStore的核心功能"""
+
+    def test_identical_content_stored_once(self, store, tmp_path):
+        """测试相同内容只存储一次"""
+        paths = [_write(tmp_path / f"dir{i}" / "module.py", "same content") for i in range(3)]
+
+        first = store.snapshot(paths)
+        second = store.snapshot(paths)
+
+        assert len(set(first.files.values())) == 1
+        assert len(list((tmp_path / "store" / "objects").glob("*/*"))) == 1
+        assert first.snapshot_id != second.snapshot_id
+
+    def test_restore_including_missing_file(self, store, tmp_path):
+        """测试恢复快照，快照时不存在的文件被删除"""
+        existing = _write(tmp_path / "existing.py", "original")
+        new_file = str(tmp_path / "new.py")
+
+        snapshot = store.snapshot([existing, new_file])
+        _write(tmp_path / "existing.py", "edited")
+        _write(tmp_path / "new.py", "created by edit")
+
+        store.restore(snapshot.snapshot_id)
+
+        assert (tmp_path / "existing.py").read_text(encoding="utf-8") == "original"
+        assert not os.path.exists(new_file)
+
+    def test_restore_subset(self, store, tmp_path):
+        """测试只恢复快照中的部分文件"""
+        a = _write(tmp_path / "a.py", "a")
+        b = _write(tmp_path / "b.py", "b")
+        snapshot = store.snapshot([a, b])
+        _write(tmp_path / "a.py", "a2")
+        _write(tmp_path / "b.py", "b2")
+
+        store.restore(snapshot.snapshot_id, [b])
+
+        assert (tmp_path / "a.py").read_text(encoding="utf-8") == "a2"
+        assert (tmp_path / "b.py").read_text(encoding="utf-8") == "b"
+        with pytest.raises(KeyError):
+            store.restore(snapshot.snapshot_id, [str(tmp_path / "other.py")])
+
+    def test_find_latest_snapshot(self, store, tmp_path):
+        """测试查找包含文件的最新快照"""
+        path = _write(tmp_path / "a.py", "v1")
+        store.snapshot([path])
+        _write(tmp_path / "a.py", "v2")
+        latest = store.snapshot([path])
+
+        assert store.find_latest_snapshot(path).snapshot_id == latest.snapshot_id
+        assert store.find_latest_snapshot(str(tmp_path / "unknown.py")) is None
+
+    def test_garbage_collection(self, store, tmp_path):
+        """测试垃圾回收删除旧快照和未引用的对象"""
+        path = _write(tmp_path / "a.py", "v1")
+        store.snapshot([path])
+        _write(tmp_path / "a.py", "v2")
+        latest = store.snapshot([path])
+        size_before = store.get_total_size()
+
+        freed = store.collect_garbage(max_snapshots=1)
+
+        assert freed > 0
+        assert store.get_total_size() == size_before - freed
+        assert [s.snapshot_id for s in store.list_snapshots()] == [latest.snapshot_id]
+        assert len(list((tmp_path / "store" / "objects").glob("*/*"))) == 1
+
+    def test_index_persistence_and_rebuild(self, store, tmp_path):
+        """测试索引持久化以及索引丢失后的重建"""
+        path = _write(tmp_path / "a.py", "content")
+        snapshot = store.snapshot([path])
+        total_size = store.get_total_size()
+
+        reloaded = BackupStore(str(tmp_path / "store"))
+        assert reloaded.get_snapshot(snapshot.snapshot_id) is not None
+        assert reloaded.get_total_size() == total_size
+
+        os.remove(tmp_path / "store" / BackupStore.INDEX_FILE_NAME)
+        rebuilt = BackupStore(str(tmp_path / "store"))
+        assert rebuilt.get_snapshot(snapshot.snapshot_id).files == snapshot.files
+        assert rebuilt.get_total_size() == total_size
+
+    def test_index_is_appended_per_snapshot(self, store, tmp_path):
+        """测试每次快照只向索引追加记录，文件列表只保存在清单中"""
+        index_path = tmp_path / "store" / BackupStore.INDEX_FILE_NAME
+        path = _write(tmp_path / "a.py", "v1")
+        store.snapshot([path])
+        first_index = index_path.read_text(encoding="utf-8")
+
+        _write(tmp_path / "a.py", "v2")
+        latest = store.snapshot([path])
+        store.snapshot([path])  # 内容未变，不写入新对象
+
+        index = index_path.read_text(encoding="utf-8")
+        assert index.startswith(first_index)
+        assert len(index.splitlines()) == 5  # 2个对象 + 3个快照
+        assert path not in index
+
+        reloaded = BackupStore(str(tmp_path / "store"))
+        assert reloaded.find_latest_snapshot(path).files == latest.files
+        assert reloaded.get_total_size() == store.get_total_size()
+
+        reloaded.collect_garbage(max_snapshots=1)
+        assert len(index_path.read_text(encoding="utf-8").splitlines()) == 2  # 压缩后：1个对象 + 1个快照
+
+    def test_incomplete_index_record_triggers_rebuild(self, store, tmp_path):
+        """测试写入中断导致的不完整索引记录会触发重建"""
+        path = _write(tmp_path / "a.py", "content")
+        snapshot = store.snapshot([path])
+        with open(tmp_path / "store" / BackupStore.INDEX_FILE_NAME, "a", encoding="utf-8") as f:
+            f.write('{"snapshot": "snap-')
+
+        rebuilt = BackupStore(str(tmp_path / "store"))
+
+        assert rebuilt.get_snapshot(snapshot.snapshot_id).files == snapshot.files
+        assert rebuilt.get_total_size() == store.get_total_size()
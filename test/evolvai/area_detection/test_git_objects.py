@@ -0,0 +1,172 @@
+"""
+测试GitObjectStore和基于Git对象的回滚
+"""
+
+import subprocess
+
+import pytest
+
+from evolvai.area_detection.edit_wrapper import SafeEditWrapper
+from evolvai.area_detection.git_objects import GitObjectError, GitObjectStore
+from evolvai.area_detection.rollback_manager import RollbackManager, RollbackStrategy
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "tracked.py").write_text("committed = True\n", encoding="utf-8")
+    (repo / "other.py").write_text("other = 1\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "initial"], cwd=repo, check=True
+    )
+    return repo
+
+
+class TestGitObjectStore:
+    """测试GitObjectStore的核心功能"""
+
+    def test_repo_detection(self, git_repo, tmp_path):
+        """测试仓库检测（按目录缓存）"""
+        (tmp_path / "no_repo").mkdir()
+
+        store = GitObjectStore.for_path(str(git_repo))
+
+        assert store is not None
+        assert GitObjectStore.for_path(str(git_repo)) is store
+        assert GitObjectStore.find_repo_root(str(tmp_path / "no_repo")) is None
+
+    def test_write_and_restore_blob(self, git_repo):
+        """测试将文件写入为blob并恢复"""
+        store = GitObjectStore.for_path(str(git_repo))
+        path = str(git_repo / "tracked.py")
+        (git_repo / "tracked.py").write_text("uncommitted = True\n", encoding="utf-8")
+
+        blob_hash = store.write_blobs([path])[path]
+        (git_repo / "tracked.py").write_text("edited = True\n", encoding="utf-8")
+        store.restore_files(blob_hash, [path])
+
+        assert (git_repo / "tracked.py").read_text(encoding="utf-8") == "uncommitted = True\n"
+        assert store.read_object(blob_hash) == ("blob", b"uncommitted = True\n")
+
+    def test_restore_from_commit(self, git_repo):
+        """测试从提交中只恢复指定文件"""
+        store = GitObjectStore.for_path(str(git_repo))
+        (git_repo / "tracked.py").write_text("edited = True\n", encoding="utf-8")
+        (git_repo / "other.py").write_text("unrelated work\n", encoding="utf-8")
+
+        store.restore_files("HEAD", [str(git_repo / "tracked.py")])
+
+        assert (git_repo / "tracked.py").read_text(encoding="utf-8") == "committed = True\n"
+        assert (git_repo / "other.py").read_text(encoding="utf-8") == "unrelated work\n"
+
+    def test_missing_objects(self, git_repo):
+        """测试不存在的对象"""
+        store = GitObjectStore.for_path(str(git_repo))
+
+        assert store.read_object("0" * 40) is None
+        with pytest.raises(GitObjectError):
+            store.restore_files("HEAD", [str(git_repo / "untracked.py")])
+        with pytest.raises(GitObjectError):
+            store.write_blobs([str(git_repo / "untracked.py")])
+        # 出错后进程仍可继续使用
+        assert store.read_object("HEAD:other.py") == ("blob", b"other = 1\n")
+
+
+class TestGitRollback:
+    """测试RollbackManager基于Git对象的回滚"""
+
+    def test_git_rollback_point(self, git_repo):
+        """测试Git回滚点只恢复被编辑的文件"""
+        manager = RollbackManager(project_root=str(git_repo))
+        path = str(git_repo / "tracked.py")
+
+        backup = manager.create_git_rollback_point(path)
+        (git_repo / "tracked.py").write_text("edited = True\n", encoding="utf-8")
+        (git_repo / "other.py").write_text("unrelated work\n", encoding="utf-8")
+        result = manager.git_rollback(backup.rollback_hash, file_paths=[path])
+
+        assert backup.success
+        assert backup.strategy == RollbackStrategy.GIT
+        assert result.success
+        assert (git_repo / "tracked.py").read_text(encoding="utf-8") == "committed = True\n"
+        assert (git_repo / "other.py").read_text(encoding="utf-8") == "unrelated work\n"
+
+    def test_smart_rollback_keeps_uncommitted_changes(self, git_repo):
+        """测试智能回滚恢复到编辑前的回滚点，而不是丢弃未提交的修改"""
+        manager = RollbackManager(project_root=str(git_repo))
+        path = git_repo / "tracked.py"
+        path.write_text("uncommitted = True\n", encoding="utf-8")
+
+        manager.create_git_rollback_point(str(path))
+        path.write_text("edited = True\n", encoding="utf-8")
+        result = manager.smart_rollback(str(path))
+
+        assert result.success
+        assert result.strategy == RollbackStrategy.GIT
+        assert path.read_text(encoding="utf-8") == "uncommitted = True\n"
+
+    def test_smart_rollback_without_rollback_point_restores_head(self, git_repo):
+        """测试没有回滚点时恢复为最近提交中的内容"""
+        manager = RollbackManager(project_root=str(git_repo))
+        path = git_repo / "tracked.py"
+        path.write_text("edited = True\n", encoding="utf-8")
+
+        result = manager.smart_rollback(str(path))
+
+        assert result.success
+        assert path.read_text(encoding="utf-8") == "committed = True\n"
+
+    def test_smart_rollback_falls_back_to_snapshot(self, git_repo):
+        """测试未提交的文件回退到文件备份"""
+        manager = RollbackManager(project_root=str(git_repo))
+        path = git_repo / "new_file.py"
+        path.write_text("v1\n", encoding="utf-8")
+        manager.create_file_backup(str(path))
+        path.write_text("v2\n", encoding="utf-8")
+
+        result = manager.smart_rollback(str(path))
+
+        assert result.success
+        assert result.strategy == RollbackStrategy.FILE_BACKUP
+        assert path.read_text(encoding="utf-8") == "v1\n"
+
+    def test_rollback_point_uses_repository_of_file(self, git_repo, tmp_path, monkeypatch):
+        """测试回滚点写入文件所在的仓库，而不是当前目录所在的仓库"""
+        other_repo = tmp_path / "other_repo"
+        other_repo.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=other_repo, check=True)
+        monkeypatch.chdir(other_repo)
+        manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        path = git_repo / "tracked.py"
+        path.write_text("uncommitted = True\n", encoding="utf-8")
+
+        backup = manager.create_git_rollback_point(str(path))
+        path.write_text("edited = True\n", encoding="utf-8")
+        result = manager.smart_rollback(str(path))
+
+        assert backup.success
+        assert GitObjectStore.for_path(str(git_repo)).read_object(backup.rollback_hash) == ("blob", b"uncommitted = True\n")
+        assert GitObjectStore.for_path(str(other_repo)).read_object(backup.rollback_hash) is None
+        assert result.success
+        assert path.read_text(encoding="utf-8") == "uncommitted = True\n"
+
+    def test_safe_edit_rollback_round_trip(self, git_repo, tmp_path):
+        """测试使用 safe_edit 返回的回滚信息撤销编辑"""
+        wrapper = SafeEditWrapper()
+        wrapper._rollback_manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        path = git_repo / "tracked.py"
+        path.write_text("uncommitted = True\n", encoding="utf-8")
+
+        result = wrapper.safe_edit(file_path=str(path), content="edited = True\n")
+        assert result["success"]
+        assert result["rollback_info"]["strategy"] == RollbackStrategy.GIT.value
+        assert path.read_text(encoding="utf-8") == "edited = True\n"
+
+        rollback = wrapper.rollback_edit(str(path), backup_info=result["rollback_info"])
+
+        assert rollback["success"]
+        assert path.read_text(encoding="utf-8") == "uncommitted = True\n"
+        assert (git_repo / "other.py").read_text(encoding="utf-8") == "other = 1\n"
@@ -0,0 +1,63 @@
+"""
+测试行级差异计算
+"""
+
+from evolvai.area_detection.edit_validator import EditValidator
+from evolvai.area_detection.line_diff import DiffHunk, diff_lines, diff_text
+
+
+class TestLineDiff:
+    """测试diff_text/diff_lines"""
+
+    def test_identical(self):
+        """测试相同内容"""
+        diff = diff_text("a\nb\nc", "a\nb\nc")
+
+        assert diff.changes_count == 0
+        assert diff.hunks == []
+
+    def test_insertion_at_top(self):
+        """测试在开头插入一行只计为一个变更"""
+        original = "\n".join(f"line {i}" for i in range(100))
+
+        diff = diff_text(original, "new first line\n" + original)
+
+        assert diff.changes_count == 1
+        assert diff.lines_added == 1
+        assert diff.lines_removed == 0
+        assert diff.hunks == [DiffHunk(0, 0, 0, 1)]
+
+    def test_added_removed_modified(self):
+        """测试新增、删除和修改行的计数"""
+        diff = diff_lines(["a", "b", "c", "d", "e"], ["a", "B", "c", "e", "f", "g"])
+
+        assert diff.lines_modified == 1
+        assert diff.lines_removed == 1
+        assert diff.lines_added == 2
+        assert diff.changes_count == 4
+        assert diff.exact
+
+    def test_limit_exceeded(self):
+        """测试超出变更上限时提前终止"""
+        original = [f"line {i}" for i in range(1000)]
+
+        diff = diff_lines(original, list(reversed(original)), max_changes=10)
+
+        assert not diff.exact
+        assert diff.changes_count > 10
+
+
+class TestEditValidatorDiff:
+    """测试EditValidator使用行级差异"""
+
+    def test_insertion_does_not_trip_change_limit(self):
+        """测试插入一行不会让后续所有行都计为变更"""
+        validator = EditValidator()
+        original = "\n".join(f"x{i} = {i}" for i in range(50))
+
+        result = validator.validate_edit_size(original, "import os\n" + original, max_changes=5)
+
+        assert result.is_valid
+        assert result.changes_count == 1
+        assert result.lines_added == 1
+        assert result.diff.hunks == [DiffHunk(0, 0, 0, 1)]
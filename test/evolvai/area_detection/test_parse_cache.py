@@ -0,0 +1,67 @@
+"""
+测试解析缓存
+"""
+
+from evolvai.area_detection.edit_validator import EditValidator
+from evolvai.area_detection.parse_cache import ParseCache
+
+
+class TestParseCache:
+    """测试ParseCache的核心功能"""
+
+    def test_python_parse(self):
+        """测试Python解析结果（导入和结构统计来自AST）"""
+        cache = ParseCache()
+        code = "import os, sys\nfrom . import utils\n\nclass A:\n    def f(self):\n        import json\n"
+
+        parsed = cache.get(code, "py")
+
+        assert parsed.syntax_errors == ()
+        assert parsed.imports == {"os", "sys", ".", "json"}
+        assert parsed.stats["classes"] == 1
+        assert parsed.stats["functions"] == 1
+
+    def test_syntax_error_falls_back_to_line_matching(self):
+        """测试语法错误时仍然提取导入"""
+        parsed = ParseCache().get("import os\ndef broken(:\n", "python")
+
+        assert len(parsed.syntax_errors) == 1
+        assert "line 2" in parsed.syntax_errors[0]
+        assert parsed.imports == {"os"}
+
+    def test_parse_once_per_content_and_language(self):
+        """测试相同内容和语言只解析一次"""
+        cache = ParseCache()
+
+        first = cache.get("import os\n", "python")
+        second = cache.get("import os\n", "py")
+        cache.get("import os\n", "javascript")
+
+        assert first is second
+        assert cache.get_statistics() == {"entries": 2, "hits": 1, "misses": 2}
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = ParseCache(max_entries=2)
+        cache.get("a = 1", "python")
+        cache.get("b = 1", "python")
+        cache.get("a = 1", "python")
+        cache.get("c = 1", "python")
+
+        cache.get("a = 1", "python")
+        assert cache.get_statistics()["hits"] == 2
+        cache.get("b = 1", "python")
+        assert cache.get_statistics()["misses"] == 4
+
+    def test_validator_reuses_parse(self):
+        """测试验证链中语法和导入验证共享解析结果"""
+        cache = ParseCache()
+        validator = EditValidator(parse_cache=cache)
+        original = "import os\n"
+        edited = "import os\nimport sys\n"
+
+        validator.validate_edit_syntax(original, edited, "a.py", "python")
+        result = validator.validate_import_changes(original, edited, "a.py", "python")
+
+        assert result.new_imports == ["sys"]
+        assert cache.get_statistics() == {"entries": 2, "hits": 1, "misses": 2}
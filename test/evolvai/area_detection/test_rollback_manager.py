@@ -2,6 +2,7 @@
 测试RollbackManager的回滚管理功能
 """
 
+from pathlib import Path
 from unittest.mock import patch
 
 from evolvai.area_detection.rollback_manager import RollbackManager, RollbackResult, RollbackStrategy
@@ -85,47 +86,61 @@ class TestRollbackManager:
             assert result.strategy == RollbackStrategy.FILE_BACKUP
             assert "backup file not found" in result.error_message.lower()
 
-    def test_create_backup_before_edit(self):
+    def test_create_backup_before_edit(self, tmp_path):
         """测试编辑前创建备份"""
-        manager = RollbackManager()
-
-        with patch('os.path.exists') as mock_exists, \
-             patch('shutil.copy2') as mock_copy, \
-             patch('os.makedirs') as mock_makedirs:
-
-            mock_exists.return_value = True
-
-            backup_path = manager.create_backup(
-                file_path="/test/project/src/main.py"
-            )
-
-            assert backup_path.endswith(".backup")
-            assert "main.py.backup" in backup_path
-            assert mock_copy.called
-            assert mock_makedirs.called
-
-    def test_create_backup_directory_creation(self):
-        """测试创建备份时的目录创建"""
-        manager = RollbackManager()
-
-        with patch('os.path.exists') as mock_exists, \
-             patch('shutil.copy2') as mock_copy, \
-             patch('os.makedirs') as mock_makedirs:
-
-            # 模拟目录不存在
-            def exists_side_effect(path):
-                if ".backup" in path:
-                    return False
-                return True
-
-            mock_exists.side_effect = exists_side_effect
-
-            backup_path = manager.create_backup(
-                file_path="/test/project/src/main.py"
-            )
-
-            assert backup_path.endswith(".backup")
-            assert mock_makedirs.called
+        manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        file_path = tmp_path / "src" / "main.py"
+        file_path.parent.mkdir()
+        file_path.write_text("print('original')", encoding="utf-8")
+
+        backup_id = manager.create_backup(file_path=str(file_path))
+
+        assert backup_id.startswith("snap-")
+        assert manager._select_rollback_strategy(backup_id) == RollbackStrategy.FILE_BACKUP
+
+        file_path.write_text("print('edited')", encoding="utf-8")
+        result = manager.rollback_file_backup(backup_id, str(file_path))
+
+        assert result.success
+        assert file_path.read_text(encoding="utf-8") == "print('original')"
+
+    def test_create_backup_same_basename(self, tmp_path):
+        """测试同名文件的备份不会互相覆盖"""
+        manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        file_a = tmp_path / "a" / "main.py"
+        file_b = tmp_path / "b" / "main.py"
+        for path, content in ((file_a, "a"), (file_b, "b")):
+            path.parent.mkdir()
+            path.write_text(content, encoding="utf-8")
+
+        backup_a = manager.create_backup(str(file_a))
+        backup_b = manager.create_backup(str(file_b))
+        file_a.write_text("changed", encoding="utf-8")
+        file_b.write_text("changed", encoding="utf-8")
+
+        assert manager.rollback_file_backup(backup_a, str(file_a)).success
+        assert manager.rollback_file_backup(backup_b, str(file_b)).success
+        assert file_a.read_text(encoding="utf-8") == "a"
+        assert file_b.read_text(encoding="utf-8") == "b"
+
+    def test_create_snapshot_multiple_files(self, tmp_path):
+        """测试一次操作为多个文件创建快照"""
+        manager = RollbackManager(project_root=str(tmp_path))
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"file{i}.py"
+            path.write_text(f"x = {i}", encoding="utf-8")
+            paths.append(str(path))
+
+        result = manager.create_snapshot(paths, label="batch")
+
+        assert result.success
+        assert (tmp_path / ".evolvai" / "backups" / "manifests" / f"{result.rollback_hash}.json").exists()
+        for path in paths:
+            Path(path).write_text("changed", encoding="utf-8")
+        assert manager.restore_snapshot(result.rollback_hash).success
+        assert [Path(p).read_text(encoding="utf-8") for p in paths] == ["x = 0", "x = 1", "x = 2"]
+        assert manager.get_backup_size() > 0
 
     def test_multiple_file_rollback_success(self):
         """测试多文件回滚成功"""
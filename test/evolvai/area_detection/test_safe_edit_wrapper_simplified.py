@@ -6,6 +6,7 @@
 from unittest.mock import Mock, patch
 
 from evolvai.area_detection.edit_wrapper import SafeEditWrapper
+from evolvai.area_detection.rollback_manager import RollbackManager
 
 
 class TestSafeEditWrapperSimplified:
@@ -180,4 +181,54 @@ class TestSafeEditWrapperSimplified:
 
             # 验证错误处理
             assert not result["success"]
-            assert "File not found" in result["error"]
\ No newline at end of file
+            assert "File not found" in result["error"]
+
+    def test_safe_edit_batch_validates_before_writing(self, tmp_path):
+        """测试批量编辑：任一编辑验证失败时不写入任何文件"""
+        wrapper = SafeEditWrapper()
+        wrapper._rollback_manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        good = tmp_path / "good.py"
+        bad = tmp_path / "bad.py"
+        good.write_text("x = 1\n", encoding="utf-8")
+        bad.write_text("y = 1\n", encoding="utf-8")
+
+        with patch.object(wrapper, '_get_project_areas', wraps=wrapper._get_project_areas) as mock_areas:
+            result = wrapper.safe_edit_batch([
+                {"file_path": str(good), "content": "x = 2\n"},
+                {"file_path": str(bad), "content": "def broken(:\n"},
+            ])
+
+        assert not result["success"]
+        assert result["failed_edits"] == 2
+        assert mock_areas.call_count == 1
+        assert good.read_text(encoding="utf-8") == "x = 1\n"
+        assert bad.read_text(encoding="utf-8") == "y = 1\n"
+
+    def test_safe_edit_batch_single_snapshot(self, tmp_path):
+        """测试批量编辑：为所有文件创建一个快照并记录阶段耗时"""
+        wrapper = SafeEditWrapper()
+        wrapper._rollback_manager = RollbackManager(backup_dir=str(tmp_path / "backups"))
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"module{i}.py"
+            path.write_text(f"value = {i}\n", encoding="utf-8")
+            paths.append(path)
+
+        result = wrapper.safe_edit_batch([{"file_path": str(p), "content": "value = 10\n"} for p in paths])
+
+        assert result["success"]
+        assert all(p.read_text(encoding="utf-8") == "value = 10\n" for p in paths)
+        snapshot_id = result["rollback_info"]["rollback_hash"]
+        assert {r["rollback_info"]["rollback_hash"] for r in result["results"]} == {snapshot_id}
+
+        # 回滚单个文件
+        rollback = wrapper.rollback_edit(str(paths[1]), backup_info=result["results"][1]["rollback_info"])
+        assert rollback["success"]
+        assert paths[1].read_text(encoding="utf-8") == "value = 1\n"
+
+        stats = wrapper.get_edit_statistics()
+        assert stats["successful_edits"] == 3
+        assert {"detect_areas", "validate", "snapshot", "write"} <= set(stats["stage_timings"])
+        assert stats["stage_timings"]["snapshot"]["count"] == 1
+        write_timings = stats["stage_timings"]["write"]
+        assert 0 <= write_timings["p95_ms"] <= write_timings["max_ms"] <= write_timings["total_ms"]
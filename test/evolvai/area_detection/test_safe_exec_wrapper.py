@@ -3,6 +3,8 @@
 遵循KISS原则：专注行为验证，避免过度设计
 """
 
+import sys
+import time
 from unittest.mock import Mock, patch
 
 from evolvai.area_detection.data_models import ExecutionPrecondition, ExecutionResult, ExecutionRiskLevel
@@ -144,30 +146,29 @@ class TestProcessManager:
             assert process_info.is_running is True
             assert process_info.start_time > 0
 
-    def test_timeout_kills_all_children(self):
+    def test_timeout_kills_all_children(self, tmp_path):
         """测试超时时杀死所有子进程"""
         # 用户故事：超时时系统能够清理所有相关进程
 
         from evolvai.area_detection.exec_manager import ProcessManager
 
         manager = ProcessManager()
-
-        # 模拟超时场景
-        with patch('subprocess.TimeoutExpired'), \
-             patch('os.killpg') as mock_killpg, \
-             patch('time.sleep'):
-
-            result = manager.wait_with_timeout(
-                process_info=Mock(pgid=12345),
-                timeout_seconds=0.001  # 强制超时
-            )
-
-            # 验证超时结果
-            assert result.timeout_occurred is True
-            assert result.success is False
-            assert "timed out" in result.stderr  # 验证包含超时信息
-            # 验证尝试了杀死进程组（不管具体调用次数）
-            assert mock_killpg.call_count > 0
+        process_info = manager.create_process("echo started; (sleep 1; touch late) & sleep 10", working_directory=str(tmp_path))
+
+        start = time.time()
+        result = manager.wait_with_timeout(process_info, timeout_seconds=0.5)  # 不足一秒的超时同样由等待逻辑处理
+        manager.cleanup_process(process_info)
+
+        # 验证超时结果，已读取的输出被保留
+        assert result.timeout_occurred is True
+        assert result.success is False
+        assert time.time() - start < 5
+        assert result.stdout == "started\n"
+        assert "timed out" in result.stderr  # 验证包含超时信息
+        assert manager.get_active_processes() == []
+        # 验证整个进程组（包括后台子进程）都已被杀死
+        time.sleep(1.5)
+        assert not (tmp_path / "late").exists()
 
     def test_cleanup_on_failure(self):
         """测试失败时的清理"""
@@ -186,6 +187,58 @@ class TestProcessManager:
             assert mock_killpg.call_count > 0
 
 
+class TestProcessOutput:
+    """测试进程输出的读取（真实进程）"""
+
+    def test_output_buffer_keeps_head_and_tail(self):
+        """测试有界缓冲区只保留开头和结尾"""
+        from evolvai.area_detection.exec_manager import OutputBuffer
+
+        buffer = OutputBuffer(head_size=10, tail_size=10)
+        for i in range(100):
+            buffer.append(f"{i:03d}\n")
+
+        text = buffer.get_text()
+        assert text.startswith("000\n001\n00")
+        assert text.endswith("8\n099\n")
+        assert buffer.omitted_length == 380
+        assert "[380 characters omitted]" in text
+
+    def test_large_output_does_not_block(self):
+        """测试大量输出不会因管道缓冲区写满而阻塞"""
+        from evolvai.area_detection.exec_manager import ProcessManager
+
+        manager = ProcessManager()
+        command = "python -c \"import sys; sys.stdout.write('x' * 2000000); sys.stderr.write('done')\""
+
+        process_info = manager.create_process(command, working_directory=".")
+        result = manager.wait_with_timeout(process_info, timeout_seconds=30)
+        manager.cleanup_process(process_info)
+
+        assert result.success
+        assert result.output_truncated
+        assert result.stderr == "done"
+        assert len(result.stdout) < 400 * 1024
+
+    def test_streaming_and_timeout(self):
+        """测试增量输出回调，以及超时后保留已读取的输出"""
+        from evolvai.area_detection.exec_manager import ProcessManager
+
+        manager = ProcessManager()
+        chunks = []
+
+        process_info = manager.create_process(
+            "echo started; sleep 10", working_directory=".", output_callback=lambda name, text: chunks.append((name, text))
+        )
+        result = manager.wait_with_timeout(process_info, timeout_seconds=1)
+        manager.cleanup_process(process_info)
+
+        assert result.timeout_occurred
+        assert result.stdout == "started\n"
+        assert "timed out" in result.stderr
+        assert chunks == [("stdout", "started\n")]
+
+
 class TestSafeExecWrapper:
     """测试SafeExecWrapper集成功能"""
 
@@ -286,3 +339,80 @@ class TestSafeExecWrapper:
 
             # 验证审计日志被调用
             assert mock_engine.log_execution.called
+
+
+class TestBatchExecution:
+    """测试批量并发执行"""
+
+    def test_commands_run_concurrently(self, tmp_path):
+        """测试独立命令并发执行，结果与命令顺序一致"""
+        from evolvai.area_detection.exec_wrapper import SafeExecWrapper
+
+        wrapper = SafeExecWrapper(config={})
+        start = time.time()
+        result = wrapper.safe_exec_batch(
+            ["sleep 0.5; echo first", "sleep 0.5; echo second", {"command": "sleep 0.5; echo third"}],
+            max_parallel=3,
+            working_directory=str(tmp_path)
+        )
+
+        assert result.success
+        assert [r.stdout for r in result.results] == ["first\n", "second\n", "third\n"]
+        assert time.time() - start < 1.4
+        assert wrapper.get_execution_statistics()["successful_executions"] == 3
+
+    def test_stop_on_failure(self, tmp_path):
+        """测试首个失败后终止其他命令并跳过未开始的命令"""
+        from evolvai.area_detection.exec_wrapper import SafeExecWrapper
+
+        wrapper = SafeExecWrapper(config={})
+        start = time.time()
+        result = wrapper.safe_exec_batch(
+            ["sleep 0.2; exit 3", "sleep 10", "echo never"],
+            max_parallel=2,
+            stop_on_failure=True,
+            working_directory=str(tmp_path)
+        )
+
+        assert not result.success
+        assert result.stopped_early
+        assert time.time() - start < 5
+        assert result.results[0].exit_code == 3
+        assert result.failed_commands == ["sleep 0.2; exit 3", "sleep 10"]
+        assert result.cancelled_commands == ["echo never"]
+
+    def test_cpu_time_limit(self, tmp_path):
+        """测试CPU时间限制"""
+        from evolvai.area_detection.data_models import ResourceLimits
+        from evolvai.area_detection.exec_wrapper import SafeExecWrapper
+
+        wrapper = SafeExecWrapper(config={})
+        result = wrapper.safe_exec_batch(
+            [f"{sys.executable} -c 'while True: pass'"],
+            working_directory=str(tmp_path),
+            resource_limits=ResourceLimits(cpu_time_seconds=1)
+        )
+
+        assert not result.success
+        assert result.results[0].error_message == "CPU time limit exceeded"
+        assert not result.results[0].timeout_occurred
+
+    def test_memory_limit(self, tmp_path):
+        """测试内存限制（由 shell 在子进程中设置，不影响当前进程）"""
+        import resource
+
+        from evolvai.area_detection.data_models import ResourceLimits
+        from evolvai.area_detection.exec_wrapper import SafeExecWrapper
+
+        limits_before = resource.getrlimit(resource.RLIMIT_AS)
+        wrapper = SafeExecWrapper(config={})
+        result = wrapper.safe_exec_batch(
+            [f"{sys.executable} -c 'x = bytearray(1024 ** 3)'", "ulimit -v"],
+            working_directory=str(tmp_path),
+            resource_limits=ResourceLimits(max_memory_mb=256)
+        )
+
+        assert result.results[0].exit_code != 0
+        assert "MemoryError" in result.results[0].stderr
+        assert result.results[1].stdout.strip() == str(256 * 1024)
+        assert resource.getrlimit(resource.RLIMIT_AS) == limits_before
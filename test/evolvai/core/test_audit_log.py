@@ -0,0 +1,105 @@
+"""Tests for the bounded audit log."""
+
+import random
+
+import pytest
+
+from evolvai.core.audit import AuditLog, LatencyHistogram
+
+
+def _record(tool: str, duration: float, success: bool = True, tokens: int = 10) -> dict:
+    return {"tool": tool, "duration": duration, "tokens": tokens, "success": success, "constraints": []}
+
+
+class TestLatencyHistogram:
+    """Test latency percentiles."""
+
+    def test_percentiles_within_relative_error(self):
+        """Test that percentiles are accurate to within the bucket precision."""
+        histogram = LatencyHistogram()
+        values = [random.uniform(0.001, 2.0) for _ in range(10_000)]
+        for value in values:
+            histogram.add(value)
+
+        values.sort()
+        for q in (50, 90, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            assert abs(histogram.percentile(q) - exact) / exact < 0.05
+        assert histogram.percentile(100) == max(values)
+        assert histogram.count == len(values)
+
+    def test_empty_histogram(self):
+        """Test empty histogram."""
+        assert LatencyHistogram().percentile(50) == 0.0
+
+
+class TestAuditLog:
+    """Test ring buffer and aggregates."""
+
+    def test_ring_buffer_keeps_aggregates_of_evicted_records(self):
+        """Test that aggregates cover records evicted from the ring buffer."""
+        audit_log = AuditLog(max_records=3)
+        for i in range(5):
+            audit_log.append(_record("find_symbol", 0.1 * (i + 1), success=i != 0))
+
+        assert len(audit_log) == 3
+        assert [r["duration"] for r in audit_log] == pytest.approx([0.3, 0.4, 0.5])
+        stats = audit_log.get_tool_stats()["find_symbol"]
+        assert stats["count"] == 5
+        assert stats["errors"] == 1
+        assert stats["error_rate"] == 0.2
+        assert stats["total_tokens"] == 50
+        summary = audit_log.get_summary()
+        assert summary["total_executions"] == 5
+        assert summary["failed_executions"] == 1
+
+    def test_filtered_and_limited_records(self):
+        """Test filtering by tool and limiting to the most recent records."""
+        audit_log = AuditLog()
+        for i in range(4):
+            audit_log.append(_record("a" if i % 2 == 0 else "b", float(i)))
+
+        assert [r["duration"] for r in audit_log.get_records("a")] == [0.0, 2.0]
+        assert [r["duration"] for r in audit_log.get_records(limit=2)] == [2.0, 3.0]
+        assert audit_log.get_records("unknown") == []
+
+    def test_per_tool_records_are_bounded(self):
+        """Test that per-tool ring buffers have their own, smaller capacity."""
+        audit_log = AuditLog(max_records=20)
+        for tool_index in range(5):
+            for i in range(10):
+                audit_log.append(_record(f"tool{tool_index}", float(i)))
+
+        assert len(audit_log) == 20
+        assert [r["duration"] for r in audit_log.get_records("tool0")] == [8.0, 9.0]
+        assert audit_log.get_tool_stats()["tool0"]["count"] == 10
+
+        custom_log = AuditLog(max_records=20, max_records_per_tool=5)
+        for i in range(10):
+            custom_log.append(_record("tool", float(i)))
+        assert [r["duration"] for r in custom_log.get_records("tool")] == [5.0, 6.0, 7.0, 8.0, 9.0]
+
+    def test_slow_records(self):
+        """Test that only the slowest records are retained for slow record queries."""
+        audit_log = AuditLog(max_slow_records=2)
+        for duration in (0.5, 3.0, 0.1, 2.0, 1.0):
+            audit_log.append(_record("tool", duration))
+
+        assert [r["duration"] for r in audit_log.get_slow_records(0.2)] == [3.0, 2.0]
+        assert [r["duration"] for r in audit_log.get_slow_records(2.5)] == [3.0]
+
+    def test_persistence(self, tmp_path):
+        """Test that persisted records can be analyzed in a later session."""
+        path = tmp_path / "audit" / "audit.jsonl"
+        first_session = AuditLog(persist_path=path)
+        first_session.append(_record("a", 1.0))
+        first_session.close()
+        second_session = AuditLog(persist_path=path)
+        second_session.append(_record("a", 2.0, success=False))
+        second_session.close()
+
+        combined = AuditLog.from_file(path)
+
+        assert len(combined) == 2
+        assert combined.get_tool_stats()["a"]["count"] == 2
+        assert combined.get_tool_stats()["a"]["errors"] == 1
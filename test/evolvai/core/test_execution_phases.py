@@ -5,7 +5,8 @@ from unittest.mock import Mock
 import pytest
 
 from evolvai.core.execution import ToolExecutionEngine
-from serena.tools.tools_base import Tool, ToolMarkerDoesNotRequireActiveProject
+from serena.tools.tools_base import Tool, ToolMarkerDoesNotRequireActiveProject, ToolMarkerSymbolicRead
+from serena.util.tracing import InMemoryTraceExporter, tracer
 
 
 class MockTool(Tool):
@@ -24,6 +25,14 @@ class MockToolNoProject(Tool, ToolMarkerDoesNotRequireActiveProject):
         return "no_project_result"
 
 
+class MockSymbolicTool(Tool, ToolMarkerSymbolicRead):
+    """Mock tool that requires the language server."""
+
+    def apply(self) -> str:
+        """Mock apply method."""
+        return "symbolic_result"
+
+
 class TestPreValidationPhase:
     """Test Pre-validation phase implementation."""
 
@@ -96,17 +105,30 @@ class TestPreValidationPhase:
 
         assert result == "no_project_result"
 
-    def test_lsp_check_starts_language_server_if_needed(self, engine, mock_agent):
-        """Test that LSP check starts language server if needed."""
+    def test_lsp_check_waits_for_language_server_for_symbolic_tools(self, engine, mock_agent):
+        """Test that LSP check waits for the language server (starting it if needed) for symbolic tools."""
         mock_agent.is_using_language_server = Mock(return_value=True)
         mock_agent.is_language_server_running = Mock(return_value=False)
+        mock_agent.wait_for_language_server = Mock()
+        tool = MockSymbolicTool(mock_agent)
+
+        result = engine.execute(tool)
+
+        mock_agent.wait_for_language_server.assert_called_once()
+        assert result == "symbolic_result"
+
+    def test_lsp_check_skipped_for_non_symbolic_tools(self, engine, mock_agent):
+        """Test that non-symbolic tools do not wait for the language server (e.g. while it is still starting)."""
+        mock_agent.is_using_language_server = Mock(return_value=True)
+        mock_agent.is_language_server_running = Mock(return_value=False)
+        mock_agent.wait_for_language_server = Mock()
         mock_agent.reset_language_server = Mock()
         tool = MockTool(mock_agent)
 
         result = engine.execute(tool, test_arg="test")
 
-        # Should start language server
-        mock_agent.reset_language_server.assert_called_once()
+        mock_agent.wait_for_language_server.assert_not_called()
+        mock_agent.reset_language_server.assert_not_called()
         assert result == "result: test"
 
     def test_lsp_check_skipped_when_not_using_lsp(self, engine, mock_agent):
@@ -250,3 +272,59 @@ class TestExecutionPhase:
         # Result should be in audit log
         audit_record = engine._audit_log[0]
         assert audit_record["success"] is True
+
+
+class TestExecutionTracing:
+    """Test tracing of the execution phases."""
+
+    @pytest.fixture
+    def mock_agent(self):
+        """Create mock SerenaAgent."""
+        agent = Mock()
+        agent.serena_config = Mock()
+        agent._active_project = Mock()
+        agent.is_using_language_server = Mock(return_value=False)
+        agent.language_server = None
+        return agent
+
+    @pytest.fixture
+    def traces(self):
+        """Enable tracing for the duration of the test."""
+        exporter = InMemoryTraceExporter()
+        tracer.add_exporter(exporter)
+        yield exporter
+        tracer.remove_exporter(exporter)
+
+    def test_phases_are_nested_in_tool_span(self, mock_agent, traces):
+        """Test that each phase is recorded as a child span of the tool span."""
+        engine = ToolExecutionEngine(agent=mock_agent)
+
+        result = engine.execute(MockTool(mock_agent), test_arg="test")
+
+        assert result == "result: test"
+        [spans] = traces.get_traces()
+        root = spans[0]
+        assert root.name == "tool/mock"
+        assert [s.name for s in spans if s.parent_span_id == root.span_id] == ["pre_validation", "execution", "post_execution"]
+        assert engine._audit_log[0]["trace_id"] == root.trace_id
+
+    def test_failed_execution_marks_tool_span_as_error(self, mock_agent, traces):
+        """Test that errors reported via the result mark the tool span as failed."""
+        mock_agent._active_project = None
+        engine = ToolExecutionEngine(agent=mock_agent)
+
+        result = engine.execute(MockTool(mock_agent), test_arg="test")
+
+        assert "no active project" in result.lower()
+        [spans] = traces.get_traces()
+        assert spans[0].is_error
+        assert spans[1].name == "pre_validation"
+        assert spans[1].is_error
+
+    def test_no_trace_id_when_tracing_disabled(self, mock_agent):
+        """Test that audit records have no trace id when tracing is disabled."""
+        engine = ToolExecutionEngine(agent=mock_agent)
+
+        engine.execute(MockTool(mock_agent), test_arg="test")
+
+        assert engine._audit_log[0]["trace_id"] is None
@@ -0,0 +1,107 @@
+"""Tests for on-demand profiling of tool executions."""
+
+import pstats
+from unittest.mock import Mock
+
+import pytest
+
+from evolvai.core.execution import ToolExecutionEngine
+from evolvai.core.profiling import ToolProfiler
+from serena.tools.tools_base import Tool
+
+
+def _busy_function() -> int:
+    return sum(i * i for i in range(20_000))
+
+
+class BusyTool(Tool):
+    """Mock tool doing some computation."""
+
+    def apply(self) -> str:
+        """Mock apply method."""
+        return str(_busy_function())
+
+
+class TestToolProfiler:
+    """Test tool selection and profile capture."""
+
+    def test_tool_selection(self):
+        """Test selecting individual tools, all tools and no tools."""
+        profiler = ToolProfiler(["find_symbol", " read_file "])
+        assert profiler.enabled
+        assert profiler.is_profiled("read_file")
+        assert not profiler.is_profiled("list_dir")
+
+        profiler.set_tool_names([ToolProfiler.ALL_TOOLS])
+        assert profiler.is_profiled("list_dir")
+
+        profiler.set_tool_names([])
+        assert not profiler.enabled
+        assert not profiler.is_profiled("find_symbol")
+
+    def test_profile_is_written_and_summarised(self, tmp_path):
+        """Test that the profile file is loadable and the hotspots include the profiled code."""
+        profiler = ToolProfiler(["busy"], top_n=5)
+
+        with profiler.profile("busy", str(tmp_path / "profiles")) as capture:
+            _busy_function()
+
+        assert capture.path is not None
+        assert capture.path.startswith(str(tmp_path / "profiles" / "busy-"))
+        assert pstats.Stats(capture.path).total_calls > 0  # type: ignore[attr-defined]
+        assert 0 < len(capture.hotspots) <= 5
+        assert any("_busy_function" in hotspot["function"] or "genexpr" in hotspot["function"] for hotspot in capture.hotspots)
+
+    def test_profile_is_captured_upon_exception(self, tmp_path):
+        """Test that the profile is saved if the profiled code raises."""
+        profiler = ToolProfiler(["busy"])
+
+        with pytest.raises(RuntimeError):
+            with profiler.profile("busy", str(tmp_path)) as capture:
+                raise RuntimeError("failed")
+
+        assert capture.path is not None
+
+    def test_concurrent_profiling_is_skipped(self, tmp_path):
+        """Test that nested profiling does not fail but only profiles the outer execution."""
+        profiler = ToolProfiler(["outer", "inner"])
+
+        with profiler.profile("outer", str(tmp_path)) as outer:
+            with profiler.profile("inner", str(tmp_path)) as inner:
+                pass
+
+        assert outer.path is not None
+        assert inner.path is None
+
+
+class TestEngineProfiling:
+    """Test profiling within the execution engine."""
+
+    @pytest.fixture
+    def mock_agent(self, tmp_path):
+        """Create mock SerenaAgent with an active project in a temporary directory."""
+        agent = Mock()
+        agent._active_project = Mock()
+        agent._active_project.path_to_serena_data_folder = Mock(return_value=str(tmp_path / ".serena"))
+        agent.is_using_language_server = Mock(return_value=False)
+        agent.language_server = None
+        return agent
+
+    def test_selected_tool_is_profiled(self, mock_agent, tmp_path):
+        """Test that the profile is written to the project's profiles directory and attached to the audit record."""
+        engine = ToolExecutionEngine(agent=mock_agent, profiler=ToolProfiler(["busy"]))
+
+        engine.execute(BusyTool(mock_agent))
+
+        profile = engine.get_audit_log()[0]["profile"]
+        assert profile["path"].startswith(str(tmp_path / ".serena" / "profiles" / "busy-"))
+        assert len(profile["hotspots"]) > 0
+
+    def test_other_tools_are_not_profiled(self, mock_agent, tmp_path):
+        """Test that tools which are not selected are executed without profiling."""
+        engine = ToolExecutionEngine(agent=mock_agent, profiler=ToolProfiler(["find_symbol"]))
+
+        engine.execute(BusyTool(mock_agent))
+
+        assert engine.get_audit_log()[0]["profile"] is None
+        assert not (tmp_path / ".serena").exists()
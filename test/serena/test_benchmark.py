@@ -0,0 +1,72 @@
+import pytest
+
+from serena.benchmark import (
+    CASE_FIND_SYMBOL,
+    CASE_LS_COLD_START,
+    BenchmarkReport,
+    LanguageBenchmarkResult,
+    TimingStats,
+    percentile,
+)
+
+
+def _report(find_symbol: list[float], cold_start: list[float] | None = None, peak_rss_bytes: int | None = None) -> BenchmarkReport:
+    timings = {CASE_FIND_SYMBOL: TimingStats(find_symbol)}
+    if cold_start is not None:
+        timings[CASE_LS_COLD_START] = TimingStats(cold_start)
+    return BenchmarkReport(results={"python": LanguageBenchmarkResult("python", timings=timings, peak_rss_bytes=peak_rss_bytes)})
+
+
+class TestPercentile:
+    def test_interpolates_between_ranks(self):
+        values = [4.0, 1.0, 3.0, 2.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == pytest.approx(2.5)
+        assert percentile(values, 100) == 4.0
+        assert percentile(values, 95) == pytest.approx(3.85)
+
+    def test_single_and_no_values(self):
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 50) == 0.0
+
+
+class TestBenchmarkReport:
+    def test_save_and_load(self, tmp_path):
+        report = _report([0.01, 0.02, 0.03], cold_start=[1.0], peak_rss_bytes=2**20)
+        path = str(tmp_path / "bench.json")
+        report.save(path)
+
+        loaded = BenchmarkReport.load(path)
+        assert loaded.environment == report.environment
+        result = loaded.results["python"]
+        assert result.timings[CASE_FIND_SYMBOL].samples == [0.01, 0.02, 0.03]
+        assert result.timings[CASE_FIND_SYMBOL].p50 == pytest.approx(0.02)
+        assert result.peak_rss_bytes == 2**20
+        assert result.error is None
+
+    def test_compare_flags_slower_cases(self):
+        baseline = _report([0.1] * 5, cold_start=[1.0] * 3)
+        current = _report([0.1] * 5, cold_start=[1.5] * 3)
+        regressions = current.compare(baseline, tolerance=0.25)
+        assert {(r.language, r.metric) for r in regressions} == {("python", "ls_cold_start.p50"), ("python", "ls_cold_start.p95")}
+        assert regressions[0].ratio == pytest.approx(1.5)
+        assert current.compare(baseline, tolerance=0.6) == []
+
+    def test_compare_ignores_small_absolute_deltas(self):
+        baseline = _report([0.001] * 5)
+        current = _report([0.003] * 5)
+        assert current.compare(baseline, min_delta_seconds=0.005) == []
+        assert len(current.compare(baseline, min_delta_seconds=0.0)) == 2
+
+    def test_compare_flags_memory_growth(self):
+        baseline = _report([0.1], peak_rss_bytes=100 * 2**20)
+        current = _report([0.1], peak_rss_bytes=200 * 2**20)
+        [regression] = current.compare(baseline)
+        assert regression.metric == "peak_rss_bytes"
+
+    def test_compare_skips_cases_and_languages_missing_from_baseline(self):
+        baseline = _report([0.1])
+        baseline.results["rust"] = LanguageBenchmarkResult("rust")
+        current = _report([0.1], cold_start=[5.0])
+        assert current.compare(baseline) == []
+        assert current.compare(BenchmarkReport(results={})) == []
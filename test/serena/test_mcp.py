@@ -1,10 +1,15 @@
 """Tests for the mcp.py module in serena."""
 
+import asyncio
+import threading
+from concurrent.futures import Future
+
 import pytest
 from mcp.server.fastmcp.tools.base import Tool as MCPTool
 
 from serena.agent import Tool, ToolRegistry
 from serena.config.context_mode import SerenaAgentContext
+from serena.config.serena_config import SerenaConfig
 from serena.mcp import SerenaMCPFactory
 
 make_tool = SerenaMCPFactory.make_mcp_tool
@@ -14,7 +19,7 @@ make_tool = SerenaMCPFactory.make_mcp_tool
 class MockAgent:
     def __init__(self):
         self.project_config = None
-        self.serena_config = None
+        self.serena_config = SerenaConfig(gui_log_window_enabled=False, web_dashboard=False)
 
     @staticmethod
     def get_context() -> SerenaAgentContext:
@@ -49,6 +54,12 @@ class BasicTool(BaseMockTool):
         """Mock implementation of apply_ex."""
         return self.apply(**kwargs)
 
+    def issue_ex(self, log_call=True, catch_exceptions=True, progress_callback=None, cancel_event=None, **kwargs) -> Future:  # type: ignore
+        """Mock implementation of issue_ex, which completes immediately."""
+        future: Future = Future()
+        future.set_result(self.apply(**kwargs))
+        return future
+
 
 def test_make_tool_basic() -> None:
     """Test that make_tool correctly creates an MCP tool from a Tool object."""
@@ -76,11 +87,41 @@ def test_make_tool_execution() -> None:
     mcp_tool = make_tool(mock_tool)
 
     # Execute the MCP tool function
-    result = mcp_tool.fn(name="Alice", age=30)
+    assert mcp_tool.is_async
+    result = asyncio.run(mcp_tool.fn(name="Alice", age=30))
 
     assert result == "Hello Alice, you are 30 years old!"
 
 
+def test_make_tool_execution_cancellation() -> None:
+    """Test that cancelling the MCP call cancels the issued task and signals cancellation to the tool."""
+
+    class PendingTool(BasicTool):
+        def __init__(self):
+            super().__init__()
+            self.future: Future = Future()
+            self.cancel_event: threading.Event | None = None
+
+        def issue_ex(self, log_call=True, catch_exceptions=True, progress_callback=None, cancel_event=None, **kwargs) -> Future:  # type: ignore
+            self.cancel_event = cancel_event
+            return self.future
+
+    tool = PendingTool()
+    mcp_tool = make_tool(tool)
+
+    async def call_and_cancel() -> None:
+        task = asyncio.create_task(mcp_tool.fn(name="Alice"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(call_and_cancel())
+
+    assert tool.future.cancelled()
+    assert tool.cancel_event is not None and tool.cancel_event.is_set()
+
+
 def test_make_tool_no_params() -> None:
     """Test make_tool with a function that has no parameters."""
 
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from serena.symbol_cache_warmer import SymbolCacheWarmer
+from solidlsp import SolidLanguageServer
+from solidlsp.ls_config import Language
+
+
+@pytest.mark.python
+class TestSymbolCacheWarmer:
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_warming_order_covers_relevant_files_once(self, language_server: SolidLanguageServer) -> None:
+        warmer = SymbolCacheWarmer(language_server)
+        files = list(warmer.iter_files_in_warming_order())
+
+        assert len(files) == len(set(files))
+        assert os.path.join("test_repo", "services.py") in files
+        assert all(f.endswith(".py") for f in files)
+        assert not any("ignore_this_dir" in f for f in files)
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_warming_fills_document_symbol_cache(self, language_server: SolidLanguageServer) -> None:
+        warmer = SymbolCacheWarmer(language_server)
+        warmer.start()
+        warmer._thread.join(timeout=120)  # type: ignore
+
+        assert not warmer.is_running()
+        assert warmer.num_files_processed > 0
+        assert f"{os.path.join('test_repo', 'services.py')}-False" in language_server._document_symbols_cache
@@ -21,7 +21,7 @@ import pytest
 from overrides import overrides
 from syrupy import SnapshotAssertion
 
-from serena.code_editor import CodeEditor, LanguageServerCodeEditor
+from serena.code_editor import CodeEditor, LanguageServerCodeEditor, SymbolicEdit, SymbolicEditOperation
 from solidlsp.ls_config import Language
 from src.serena.symbol import LanguageServerSymbolRetriever
 from test.conftest import create_ls, get_repo_path
@@ -519,3 +519,88 @@ def test_rename_symbol(snapshot: SnapshotAssertion):
         "renamed_typed_module_var",
     )
     test_case.run_test(content_after_ground_truth=snapshot)
+
+
+class SymbolicEditsTest(EditingTest):
+    """Applies several symbolic edits at once and compares the result with the result of applying them one by one"""
+
+    def __init__(self, language: Language, rel_path: str, edits: list[SymbolicEdit]):
+        super().__init__(language, rel_path)
+        self.edits = edits
+
+    def _apply_edit(self, code_editor: CodeEditor) -> None:
+        modified_files = code_editor.apply_symbolic_edits(self.edits)
+        assert modified_files == [self.rel_path]
+
+    def _apply_edits_individually(self, code_editor: CodeEditor) -> None:
+        for edit in self.edits:
+            match edit.operation:
+                case SymbolicEditOperation.REPLACE_BODY:
+                    code_editor.replace_body(edit.name_path, edit.relative_path, edit.body)
+                case SymbolicEditOperation.INSERT_AFTER:
+                    code_editor.insert_after_symbol(edit.name_path, edit.relative_path, edit.body)
+                case SymbolicEditOperation.INSERT_BEFORE:
+                    code_editor.insert_before_symbol(edit.name_path, edit.relative_path, edit.body)
+                case SymbolicEditOperation.DELETE:
+                    code_editor.delete_symbol(edit.name_path, edit.relative_path)
+
+    def get_content_after_individual_edits(self) -> str:
+        with self._setup() as symbol_retriever:
+            self._apply_edits_individually(LanguageServerCodeEditor(symbol_retriever))
+            return self._read_file(self.rel_path)
+
+
+@pytest.mark.python
+def test_apply_symbolic_edits_matches_individual_edits():
+    test_case = SymbolicEditsTest(
+        Language.PYTHON,
+        PYTHON_TEST_REL_FILE_PATH,
+        [
+            SymbolicEdit(
+                operation=SymbolicEditOperation.REPLACE_BODY,
+                name_path="VariableContainer/modify_instance_var",
+                relative_path=PYTHON_TEST_REL_FILE_PATH,
+                body=PYTHON_REPLACED_BODY,
+            ),
+            SymbolicEdit(
+                operation=SymbolicEditOperation.INSERT_BEFORE,
+                name_path="VariableDataclass",
+                relative_path=PYTHON_TEST_REL_FILE_PATH,
+                body=NEW_PYTHON_FUNCTION,
+            ),
+            SymbolicEdit(
+                operation=SymbolicEditOperation.INSERT_AFTER,
+                name_path="use_module_variables",
+                relative_path=PYTHON_TEST_REL_FILE_PATH,
+                body=NEW_PYTHON_CLASS_WITH_LEADING_NEWLINES,
+            ),
+            SymbolicEdit(
+                operation=SymbolicEditOperation.DELETE,
+                name_path="VariableContainer/use_class_var",
+                relative_path=PYTHON_TEST_REL_FILE_PATH,
+            ),
+        ],
+    )
+    test_case.run_test(content_after_ground_truth=test_case.get_content_after_individual_edits())
+
+
+@pytest.mark.python
+def test_apply_symbolic_edits_rejects_overlapping_edits():
+    test_case = SymbolicEditsTest(
+        Language.PYTHON,
+        PYTHON_TEST_REL_FILE_PATH,
+        [
+            SymbolicEdit(
+                operation=SymbolicEditOperation.REPLACE_BODY,
+                name_path="VariableContainer/modify_instance_var",
+                relative_path=PYTHON_TEST_REL_FILE_PATH,
+                body=PYTHON_REPLACED_BODY,
+            ),
+            SymbolicEdit(operation=SymbolicEditOperation.DELETE, name_path="VariableContainer", relative_path=PYTHON_TEST_REL_FILE_PATH),
+        ],
+    )
+    with test_case._setup() as symbol_retriever:
+        content_before = test_case._read_file(test_case.rel_path)
+        with pytest.raises(ValueError, match="overlap"):
+            LanguageServerCodeEditor(symbol_retriever).apply_symbolic_edits(test_case.edits)
+        assert test_case._read_file(test_case.rel_path) == content_before
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from serena.analytics import ByteLengthTokenCountEstimator, RegisteredTokenCountEstimator, TokenCountEstimator, ToolUsageStats
+
+
+class BlockingEstimator(TokenCountEstimator):
+    """Counts one token per character, blocking until released."""
+
+    def __init__(self) -> None:
+        self.released = threading.Event()
+
+    def estimate_token_count(self, text: str) -> int:
+        self.released.wait(timeout=10)
+        return len(text)
+
+
+class TestToolUsageStats:
+    def test_byte_length_estimator(self):
+        estimator = ByteLengthTokenCountEstimator()
+
+        assert estimator.estimate_token_count("") == 0
+        assert estimator.estimate_token_count("abcdefgh") == 2
+        assert estimator.estimate_token_count("é") == 1
+
+    def test_background_recording(self):
+        stats = ToolUsageStats(RegisteredTokenCountEstimator.BYTE_LENGTH)
+        stats.record_tool_usage("find_symbol", {"name_path": "Foo"}, "x" * 400)
+        stats.record_tool_usage("find_symbol", {"name_path": "Bar"}, "y" * 40)
+        stats.flush()
+
+        entry = stats.get_stats("find_symbol")
+        assert entry.num_times_called == 2
+        assert entry.output_tokens == 110
+        assert entry.input_tokens > 0
+
+    def test_recording_does_not_wait_for_estimation(self):
+        stats = ToolUsageStats(RegisteredTokenCountEstimator.BYTE_LENGTH, max_queue_size=1)
+        estimator = BlockingEstimator()
+        stats._token_count_estimator = estimator
+        stats.record_tool_usage("tool", "a", "first")
+
+        # the worker is blocked, so the second call waits in the queue and further calls are estimated heuristically
+        start = time.time()
+        for _ in range(5):
+            stats.record_tool_usage("tool", "a" * 4, "b" * 40)
+        assert time.time() - start < 5
+        estimator.released.set()
+        stats.flush()
+
+        entry = stats.get_stats("tool")
+        assert entry.num_times_called == 6
+
+    def test_sampling_uses_calibrated_heuristic(self):
+        stats = ToolUsageStats(background=False, token_count_estimator=RegisteredTokenCountEstimator.BYTE_LENGTH, sample_rate=0.0)
+        stats._sampled_tokens, stats._sampled_bytes = 1, 2
+        stats.record_tool_usage("tool", "", "x" * 100)
+
+        assert stats.get_stats("tool").output_tokens == 50
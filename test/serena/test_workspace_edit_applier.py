@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from serena.code_editor import WorkspaceEditApplier
+from solidlsp import ls_types
+
+
+def _rename_edit(line: int, start_col: int, end_col: int, new_text: str) -> ls_types.TextEdit:
+    return ls_types.TextEdit(
+        range=ls_types.Range(start=ls_types.Position(line=line, character=start_col), end=ls_types.Position(line=line, character=end_col)),
+        newText=new_text,
+    )
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    for i in range(20):
+        (tmp_path / f"module_{i}.py").write_text(f"from lib import foo\n\nvalue_{i} = foo()\n", encoding="utf-8")
+    return tmp_path
+
+
+def _rename_workspace_edit(project: Path, num_files: int) -> ls_types.WorkspaceEdit:
+    return {
+        "changes": {
+            (project / f"module_{i}.py").as_uri(): [
+                _rename_edit(0, 16, 19, "bar"),
+                _rename_edit(2, len(f"value_{i} = "), len(f"value_{i} = foo"), "bar"),
+            ]
+            for i in range(num_files)
+        }
+    }
+
+
+def _create_applier(project: Path, all_or_nothing: bool = True) -> tuple[WorkspaceEditApplier, Mock]:
+    lang_server = Mock()
+    lang_server.repository_root_path = str(project)
+    return WorkspaceEditApplier(lang_server, "utf-8", all_or_nothing=all_or_nothing, max_workers=4), lang_server
+
+
+def test_all_files_are_modified(project: Path) -> None:
+    applier, lang_server = _create_applier(project)
+    modified_files = applier.apply(_rename_workspace_edit(project, 20))
+
+    assert modified_files == [f"module_{i}.py" for i in range(20)]
+    for i in range(20):
+        assert (project / f"module_{i}.py").read_text(encoding="utf-8") == f"from lib import bar\n\nvalue_{i} = bar()\n"
+    lang_server.notify_files_changed.assert_called_once_with(modified_files)
+    assert not [f for f in os.listdir(project) if f.endswith(".tmp")]
+
+
+def test_invalid_edits_modify_no_file(project: Path) -> None:
+    applier, lang_server = _create_applier(project)
+    workspace_edit = _rename_workspace_edit(project, 20)
+    workspace_edit["changes"][(project / "module_7.py").as_uri()].append(_rename_edit(0, 17, 18, "x"))  # overlapping
+
+    with pytest.raises(ValueError, match=r"module_7\.py"):
+        applier.apply(workspace_edit)
+
+    for i in range(20):
+        assert (project / f"module_{i}.py").read_text(encoding="utf-8") == f"from lib import foo\n\nvalue_{i} = foo()\n"
+    lang_server.notify_files_changed.assert_not_called()
+
+
+@pytest.mark.parametrize("all_or_nothing", [True, False])
+def test_write_failure(project: Path, monkeypatch: pytest.MonkeyPatch, all_or_nothing: bool) -> None:
+    applier, lang_server = _create_applier(project, all_or_nothing=all_or_nothing)
+    write = applier._write
+    failed_write_attempted = False
+
+    def failing_write(relative_path: str, contents: str) -> None:
+        nonlocal failed_write_attempted
+        if relative_path == "module_3.py" and not failed_write_attempted:
+            failed_write_attempted = True
+            raise PermissionError("read-only file")
+        write(relative_path, contents)
+
+    monkeypatch.setattr(applier, "_write", failing_write)
+    with pytest.raises(OSError, match=r"module_3\.py"):
+        applier.apply(_rename_workspace_edit(project, 20))
+
+    for i in range(20):
+        is_modified = not all_or_nothing and i != 3
+        expected_name = "bar" if is_modified else "foo"
+        assert (project / f"module_{i}.py").read_text(
+            encoding="utf-8"
+        ) == f"from lib import {expected_name}\n\nvalue_{i} = {expected_name}()\n"
+    if all_or_nothing:
+        lang_server.notify_files_changed.assert_not_called()
+    else:
+        lang_server.notify_files_changed.assert_called_once_with([f"module_{i}.py" for i in range(20) if i != 3])
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from serena.util.logging import LogBuffer
+
+
+class TestLogBuffer:
+    def test_sequence_ids_and_incremental_reads(self):
+        buffer = LogBuffer(max_messages=3)
+        ids = [buffer.append(f"msg {i}") for i in range(5)]
+
+        assert ids == [0, 1, 2, 3, 4]
+        assert buffer.max_id == 4
+        # the two oldest messages were evicted, ids keep increasing
+        assert buffer.get_log_messages() == ["msg 2", "msg 3", "msg 4"]
+        assert buffer.get_log_messages_since(4) == (["msg 4"], 4)
+        assert buffer.get_log_messages_since(5) == ([], 4)
+        assert buffer.get_log_messages_since(0) == (["msg 2", "msg 3", "msg 4"], 4)
+
+    def test_character_limit(self):
+        buffer = LogBuffer(max_messages=100, max_chars=10)
+        buffer.append("aaaa")
+        buffer.append("bbbb")
+        buffer.append("cccc")
+
+        assert buffer.get_log_messages() == ["bbbb", "cccc"]
+
+        # a single message exceeding the limit is retained
+        buffer.append("x" * 20)
+        assert buffer.get_log_messages_since(0) == (["x" * 20], 3)
+
+    def test_empty_buffer(self):
+        buffer = LogBuffer()
+
+        assert buffer.get_log_messages_since(0) == ([], -1)
+        assert not buffer.wait_for_messages(0, timeout=0.01)
+
+    def test_wait_for_messages(self):
+        buffer = LogBuffer()
+        buffer.append("old")
+        timer = threading.Timer(0.1, lambda: buffer.append("new"))
+        timer.start()
+
+        start = time.time()
+        assert buffer.wait_for_messages(1, timeout=5)
+        assert time.time() - start < 4
+        assert buffer.get_log_messages_since(1) == (["new"], 1)
+        timer.join()
@@ -0,0 +1,104 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from serena.dashboard import SerenaDashboardAPI
+from serena.util.logging import MemoryLogHandler
+from serena.util.metrics import CallbackGauge, MetricsRegistry
+
+
+class TestMetrics:
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Number of requests", ["method"])
+        gauge = registry.gauge("queue_depth", "Queue depth")
+        counter.inc("textDocument/definition")
+        counter.inc("textDocument/definition", amount=2)
+        counter.inc('say "hi"\n')
+        gauge.set(1.5)
+
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Number of requests",
+            "# TYPE requests_total counter",
+            'requests_total{method="textDocument/definition"} 3',
+            'requests_total{method="say \\"hi\\"\\n"} 1',
+            "# HELP queue_depth Queue depth",
+            "# TYPE queue_depth gauge",
+            "queue_depth 1.5",
+        ]
+
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("duration_seconds", "Duration", ["tool"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "find_symbol")
+
+        assert histogram.get_count("find_symbol") == 4
+        assert registry.render().splitlines()[2:] == [
+            'duration_seconds_bucket{tool="find_symbol",le="0.1"} 2',
+            'duration_seconds_bucket{tool="find_symbol",le="1"} 3',
+            'duration_seconds_bucket{tool="find_symbol",le="+Inf"} 4',
+            'duration_seconds_sum{tool="find_symbol"} 2.65',
+            'duration_seconds_count{tool="find_symbol"} 4',
+        ]
+
+    def test_label_values_are_validated(self):
+        counter = MetricsRegistry().counter("requests_total", "Number of requests", ["method"])
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_registration_is_idempotent(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Number of requests")
+        assert registry.counter("requests_total", "Number of requests") is counter
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total", "Number of requests")
+
+    def test_callback_gauge(self):
+        registry = MetricsRegistry()
+        registry.register(CallbackGauge("cache_entries", "Cache entries", lambda: 42))
+        registry.register(CallbackGauge("unavailable", "Unavailable value", lambda: None))
+        registry.register(CallbackGauge("failing", "Failing callback", lambda: 1 / 0))
+        registry.register(CallbackGauge("by_kind", "By kind", lambda: {("a",): 1, ("b",): 2}, ["kind"]))
+
+        lines = registry.render().splitlines()
+        assert "cache_entries 42" in lines
+        assert not any(line.startswith(("unavailable", "failing")) for line in lines)
+        assert 'by_kind{kind="a"} 1' in lines
+        assert 'by_kind{kind="b"} 2' in lines
+
+    def test_concurrent_updates(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Number of events")
+
+        def worker() -> None:
+            for _ in range(10_000):
+                counter.inc()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.get() == 40_000
+
+
+class TestDashboardMetrics:
+    def test_metrics_endpoint(self):
+        agent = Mock()
+        agent.language_server = None
+        agent.get_num_pending_tasks = Mock(return_value=3)
+        dashboard = SerenaDashboardAPI(MemoryLogHandler(), [], agent=agent)
+
+        response = dashboard._app.test_client().get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        lines = response.get_data(as_text=True).splitlines()
+        assert "serena_task_queue_depth 3" in lines
+        assert "serena_log_buffer_messages 0" in lines
+        assert "# TYPE solidlsp_request_duration_seconds histogram" in lines
+        # no language server is running
+        assert not any(line.startswith("serena_language_server_rss_bytes ") for line in lines)
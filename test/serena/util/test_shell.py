@@ -0,0 +1,74 @@
+import platform
+
+import pytest
+
+from serena.util.shell import ShellSession, ShellSessionPool
+
+pytestmark = pytest.mark.skipif(platform.system() == "Windows", reason="Shell sessions are not supported on Windows")
+
+
+class TestShellSession:
+    def test_exit_code_and_output(self, tmp_path):
+        session = ShellSession(str(tmp_path))
+        try:
+            result = session.execute("echo out; echo err >&2; printf 'no newline'; exit 3", capture_stderr=True)
+            assert result.stdout == "out\nno newline"
+            assert result.stderr == "err\n"
+            assert result.return_code == 3
+            assert result.cwd == str(tmp_path)
+            # the session survives commands which exit
+            assert session.execute("echo again").stdout == "again\n"
+        finally:
+            session.close()
+
+    def test_commands_are_isolated(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        session = ShellSession(str(tmp_path))
+        try:
+            session.execute("cd sub; export SERENA_TEST_VAR=1")
+            result = session.execute("pwd; echo ${SERENA_TEST_VAR:-unset}")
+            assert result.stdout == f"{tmp_path}\nunset\n"
+        finally:
+            session.close()
+
+    def test_quoting_and_syntax_errors(self, tmp_path):
+        session = ShellSession(str(tmp_path))
+        try:
+            assert session.execute("""echo "it's" '$HOME'""").stdout == "it's $HOME\n"
+            result = session.execute("if then", capture_stderr=True)
+            assert result.return_code != 0
+            assert session.execute("echo ok").stdout == "ok\n"
+        finally:
+            session.close()
+
+    def test_output_truncation(self, tmp_path):
+        session = ShellSession(str(tmp_path))
+        try:
+            result = session.execute("seq 1 100000", max_output_chars=10)
+            assert result.stdout.startswith("1\n2\n3\n4\n5\n")
+            assert "more characters omitted" in result.stdout
+            assert result.return_code == 0
+        finally:
+            session.close()
+
+    def test_timeout(self, tmp_path):
+        session = ShellSession(str(tmp_path))
+        with pytest.raises(TimeoutError):
+            session.execute("sleep 10", timeout=0.5)
+        assert not session.is_alive()
+
+
+class TestShellSessionPool:
+    def test_sessions_are_reused_and_restarted(self, tmp_path):
+        pool = ShellSessionPool()
+        try:
+            first_pid = pool.execute("echo $$", cwd=str(tmp_path)).stdout
+            assert pool.execute("echo $$", cwd=str(tmp_path)).stdout == first_pid
+
+            # a command killing the session's shell reports the failure, and the next command gets a new session
+            result = pool.execute("kill -9 $$", cwd=str(tmp_path))
+            assert result.return_code != 0
+            second_pid = pool.execute("echo $$", cwd=str(tmp_path)).stdout
+            assert second_pid != first_pid
+        finally:
+            pool.close()
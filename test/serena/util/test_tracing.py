@@ -0,0 +1,113 @@
+import json
+import threading
+
+import pytest
+
+from serena.util.tracing import InMemoryTraceExporter, JsonFileTraceExporter, Tracer
+
+
+@pytest.fixture
+def tracer_and_traces() -> tuple[Tracer, InMemoryTraceExporter]:
+    tracer = Tracer()
+    traces = InMemoryTraceExporter()
+    tracer.add_exporter(traces)
+    return tracer, traces
+
+
+class TestTracer:
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("root") as span:
+            assert span is None
+        assert not tracer.enabled
+
+    def test_nested_spans(self, tracer_and_traces):
+        tracer, traces = tracer_and_traces
+        with tracer.span("root", {"tool.name": "find_symbol"}) as root:
+            with tracer.span("child") as child:
+                with tracer.span("grandchild", require_parent=True) as grandchild:
+                    assert tracer.get_current_span() is grandchild
+            with tracer.span("second_child"):
+                pass
+            # nothing is exported before the root span ends
+            assert traces.get_traces() == []
+
+        [spans] = traces.get_traces()
+        assert [s.name for s in spans] == ["root", "child", "grandchild", "second_child"]
+        assert {s.trace_id for s in spans} == {root.trace_id}
+        assert root.parent_span_id is None
+        assert child.parent_span_id == root.span_id
+        assert grandchild.parent_span_id == child.span_id
+        assert spans[3].parent_span_id == root.span_id
+        assert root.attributes == {"tool.name": "find_symbol"}
+        assert all(s.end_time_ns >= s.start_time_ns for s in spans)
+        assert tracer.get_current_span() is None
+
+    def test_span_requiring_parent_is_not_recorded_without_parent(self, tracer_and_traces):
+        tracer, traces = tracer_and_traces
+        with tracer.span("lsp/textDocument/documentSymbol", require_parent=True) as span:
+            assert span is None
+        assert traces.get_traces() == []
+
+    def test_spans_in_other_threads_start_new_traces(self, tracer_and_traces):
+        tracer, traces = tracer_and_traces
+
+        def worker() -> None:
+            with tracer.span("worker_root"):
+                pass
+
+        with tracer.span("root"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert sorted(spans[0].name for spans in traces.get_traces()) == ["root", "worker_root"]
+        assert all(len(spans) == 1 for spans in traces.get_traces())
+
+    def test_exception_marks_span_as_error(self, tracer_and_traces):
+        tracer, traces = tracer_and_traces
+        with pytest.raises(ValueError):
+            with tracer.span("root"):
+                with tracer.span("child"):
+                    raise ValueError("boom")
+
+        [spans] = traces.get_traces()
+        assert all(s.is_error for s in spans)
+        assert spans[1].status_message == "ValueError: boom"
+        assert spans[0].to_otlp_dict()["status"] == {"code": 2, "message": "ValueError: boom"}
+
+    def test_json_file_exporter(self, tmp_path):
+        path = tmp_path / "traces" / "traces.jsonl"
+        tracer = Tracer()
+        tracer.add_exporter(JsonFileTraceExporter(str(path)))
+        for i in range(2):
+            with tracer.span("root", {"index": i, "ok": True}):
+                with tracer.span("child"):
+                    pass
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        document = json.loads(lines[1])
+        [resource_spans] = document["resourceSpans"]
+        assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "serena"}}]
+        root, child = resource_spans["scopeSpans"][0]["spans"]
+        assert "parentSpanId" not in root
+        assert child["parentSpanId"] == root["spanId"]
+        assert root["attributes"] == [{"key": "index", "value": {"intValue": "1"}}, {"key": "ok", "value": {"boolValue": True}}]
+
+    def test_failing_exporter_does_not_affect_others(self, tracer_and_traces):
+        tracer, traces = tracer_and_traces
+
+        class FailingExporter(InMemoryTraceExporter):
+            def export(self, spans):
+                raise OSError("disk full")
+
+        failing = FailingExporter()
+        tracer.add_exporter(failing)
+        with tracer.span("root"):
+            pass
+        assert len(traces.get_traces()) == 1
+
+        tracer.remove_exporter(failing)
+        tracer.remove_exporter(traces)
+        assert not tracer.enabled
@@ -0,0 +1,74 @@
+"""
+Tests for applying multiple text edits to a file with a single didChange notification.
+"""
+
+import os
+import re
+
+import pytest
+
+from solidlsp import SolidLanguageServer, ls_types
+from solidlsp.ls_config import Language
+from solidlsp.ls_utils import TextUtils
+
+
+def _word_replacement_edits(contents: str, word: str, replacement: str) -> list[ls_types.TextEdit]:
+    edits = []
+    for match in re.finditer(rf"\b{word}\b", contents):
+        start_line, start_col = TextUtils.get_line_col_from_index(contents, match.start())
+        end_line, end_col = TextUtils.get_line_col_from_index(contents, match.end())
+        edits.append(
+            ls_types.TextEdit(
+                range=ls_types.Range(
+                    start=ls_types.Position(line=start_line, character=start_col),
+                    end=ls_types.Position(line=end_line, character=end_col),
+                ),
+                newText=replacement,
+            )
+        )
+    return edits
+
+
+@pytest.mark.python
+class TestBatchedTextEdits:
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    @pytest.mark.parametrize(
+        "word, replacement",
+        [
+            ("BaseModel", "RenamedBaseModel"),  # few edits: sent as individual changes
+            ("self", "this"),  # many edits: sent as full document
+        ],
+    )
+    def test_edits_are_sent_in_single_notification(
+        self, language_server: SolidLanguageServer, monkeypatch: pytest.MonkeyPatch, word: str, replacement: str
+    ) -> None:
+        file_path = os.path.join("test_repo", "models.py")
+        notifications = []
+        did_change_text_document = language_server.server.notify.did_change_text_document
+
+        def did_change_text_document_recording(params):  # type: ignore[no-untyped-def]
+            notifications.append(params)
+            did_change_text_document(params)
+
+        monkeypatch.setattr(language_server.server.notify, "did_change_text_document", did_change_text_document_recording)
+
+        with language_server.open_file(file_path) as file_buffer:
+            original_contents = file_buffer.contents
+            edits = _word_replacement_edits(original_contents, word, replacement)
+            assert len(edits) > 1
+            language_server.apply_text_edits_to_file(file_path, edits)
+
+            assert file_buffer.contents == re.sub(rf"\b{word}\b", replacement, original_contents)
+            assert len(notifications) == 1
+            content_changes = notifications[0]["contentChanges"]
+            is_full_sync = len(content_changes) == 1 and "range" not in content_changes[0]
+            assert is_full_sync == (word == "self")
+
+            # the language server's view of the document must reflect the edits
+            symbols, _ = language_server.request_document_symbols(file_path)
+            symbol_names = {s["name"] for s in symbols}
+            if word == "BaseModel":
+                assert "RenamedBaseModel" in symbol_names
+                assert "BaseModel" not in symbol_names
+            else:
+                assert "User" in symbol_names
@@ -0,0 +1,46 @@
+"""
+Tests for answering symbol queries from the document symbol cache without querying the language server.
+"""
+
+import os
+
+import pytest
+
+from solidlsp import SolidLanguageServer
+from solidlsp.ls_config import Language
+
+
+@pytest.mark.python
+class TestIndexOnlyReads:
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_cached_symbols_are_served(self, language_server: SolidLanguageServer) -> None:
+        file_path = os.path.join("test_repo", "services.py")
+        _, expected_roots = language_server.request_document_symbols(file_path)
+
+        with language_server.index_only_reads() as report:
+            _, roots = language_server.request_document_symbols(file_path)
+
+        assert [r["name"] for r in roots] == [r["name"] for r in expected_roots]
+        assert report.is_complete()
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_stale_and_unindexed_files_are_reported(self, language_server: SolidLanguageServer) -> None:
+        stale_file_path = os.path.join("test_repo", "models.py")
+        _, expected_roots = language_server.request_document_symbols(stale_file_path)
+        cache_key = f"{stale_file_path}-False"
+        _, cached_result = language_server._document_symbols_cache[cache_key]
+        language_server._document_symbols_cache[cache_key] = ("outdated-hash", cached_result)
+        unindexed_file_path = os.path.join("test_repo", "nested.py")
+        language_server._document_symbols_cache.pop(f"{unindexed_file_path}-False", None)
+        language_server._document_symbols_cache.pop(f"{unindexed_file_path}-True", None)
+
+        with language_server.index_only_reads() as report:
+            _, stale_roots = language_server.request_document_symbols(stale_file_path)
+            _, unindexed_roots = language_server.request_document_symbols(unindexed_file_path)
+            overview = language_server.request_dir_overview("test_repo")
+
+        assert [r["name"] for r in stale_roots] == [r["name"] for r in expected_roots]
+        assert unindexed_roots == []
+        assert stale_file_path in report.stale_paths
+        assert unindexed_file_path in report.unindexed_paths
+        assert stale_file_path in overview
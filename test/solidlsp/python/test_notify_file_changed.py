@@ -0,0 +1,53 @@
+"""
+Tests for informing the language server about files that were modified on disk.
+"""
+
+import os
+
+import pytest
+
+from solidlsp import SolidLanguageServer, ls_types
+from solidlsp.ls_config import Language
+
+
+@pytest.mark.python
+class TestNotifyFileChanged:
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_open_file_is_synchronised(self, language_server: SolidLanguageServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        file_path = os.path.join("test_repo", "models.py")
+        language_server.request_document_symbols(file_path)
+        assert f"{file_path}-False" in language_server._document_symbols_cache
+
+        with language_server.open_file(file_path) as file_buffer:
+            disk_contents = file_buffer.contents
+            # let the buffer diverge from the contents on disk
+            edit = ls_types.TextEdit(
+                range=ls_types.Range(start=ls_types.Position(line=0, character=0), end=ls_types.Position(line=0, character=0)),
+                newText="# modified\n",
+            )
+            language_server.apply_text_edits_to_file(file_path, [edit])
+            version = file_buffer.version
+
+            notifications = []
+            monkeypatch.setattr(language_server.server.notify, "did_change_text_document", notifications.append)
+            language_server.notify_file_changed(file_path)
+
+            assert file_buffer.contents == disk_contents
+            assert file_buffer.version == version + 1
+            assert notifications[0]["contentChanges"] == [{"text": disk_contents}]
+        assert f"{file_path}-False" not in language_server._document_symbols_cache
+
+    @pytest.mark.parametrize("language_server", [Language.PYTHON], indirect=True)
+    def test_closed_file_is_reported_as_watched_file_change(
+        self, language_server: SolidLanguageServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        file_path = os.path.join("test_repo", "services.py")
+        language_server.request_document_symbols(file_path)
+
+        notifications = []
+        monkeypatch.setattr(language_server.server.notify, "did_change_watched_files", notifications.append)
+        language_server.notify_file_changed(file_path)
+
+        assert len(notifications) == 1
+        assert notifications[0]["changes"][0]["uri"].endswith("test_repo/services.py")
+        assert f"{file_path}-False" not in language_server._document_symbols_cache
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from solidlsp.ls_handler import RequestPriority, SolidLanguageServerHandler
+from solidlsp.lsp_protocol_handler.server import ProcessLaunchInfo
+
+
+class PrioritisingTestHandler(SolidLanguageServerHandler):
+    """
+    Handler without a language server process, which answers requests after a fixed delay
+    and records the order in which requests were sent
+    """
+
+    def __init__(self, response_delay: float):
+        super().__init__(ProcessLaunchInfo(cmd="true"))
+        self.response_delay = response_delay
+        self.sent_methods: list[str] = []
+        self._sent_lock = threading.Lock()
+
+    def is_running(self) -> bool:
+        return True
+
+    def _send_request(self, method: str, params: dict | None) -> str:
+        with self._sent_lock:
+            self.sent_methods.append(method)
+        time.sleep(self.response_delay)
+        return method
+
+
+def test_requests_are_interactive_by_default():
+    handler = PrioritisingTestHandler(response_delay=0)
+    assert handler.get_request_priority() == RequestPriority.INTERACTIVE
+    with handler.request_priority(RequestPriority.BACKGROUND):
+        assert handler.get_request_priority() == RequestPriority.BACKGROUND
+    assert handler.get_request_priority() == RequestPriority.INTERACTIVE
+
+
+def test_background_requests_are_deferred_while_interactive_requests_are_in_flight():
+    handler = PrioritisingTestHandler(response_delay=0.3)
+
+    interactive_thread = threading.Thread(target=lambda: handler.send_request("interactive"))
+    interactive_thread.start()
+    time.sleep(0.05)
+    assert handler.has_interactive_requests_in_flight()
+
+    def send_background() -> None:
+        with handler.request_priority(RequestPriority.BACKGROUND):
+            handler.send_request("background")
+
+    background_thread = threading.Thread(target=send_background)
+    background_thread.start()
+    time.sleep(0.05)
+    # the background request must not have been sent while the interactive one is in flight
+    assert handler.sent_methods == ["interactive"]
+
+    interactive_thread.join()
+    background_thread.join()
+    assert handler.sent_methods == ["interactive", "background"]
+
+    stats = handler.get_request_queue_stats()
+    assert stats["interactive"]["count"] == 1
+    assert stats["background"]["count"] == 1
+    assert stats["background"]["max_delay_s"] > stats["interactive"]["max_delay_s"]
@@ -0,0 +1,64 @@
+import pytest
+
+from solidlsp.ls import LSPFileBuffer
+from solidlsp.ls_utils import InvalidTextLocationError, LineIndex, TextUtils
+
+TEXT = "def f():\n    return 1\n\nclass A:\n    pass"
+
+
+def _edit(start_line: int, start_col: int, end_line: int, end_col: int, new_text: str) -> dict:
+    return {
+        "range": {"start": {"line": start_line, "character": start_col}, "end": {"line": end_line, "character": end_col}},
+        "newText": new_text,
+    }
+
+
+def _naive_line_col_from_index(text: str, index: int) -> tuple[int, int]:
+    prefix = text[:index]
+    return prefix.count("\n"), len(prefix.split("\n")[-1])
+
+
+@pytest.mark.parametrize("text", [TEXT, TEXT + "\n", "", "\n\n", "x"])
+def test_position_index_mapping_is_consistent(text: str) -> None:
+    line_index = LineIndex(text)
+    assert line_index.num_lines == text.count("\n") + 1
+    for index in range(len(text) + 1):
+        line, col = _naive_line_col_from_index(text, index)
+        assert TextUtils.get_line_col_from_index(text, index) == (line, col)
+        assert line_index.get_line_col_from_index(index) == (line, col)
+        assert TextUtils.get_index_from_line_col(text, line, col) == index
+        assert line_index.get_index_from_line_col(line, col) == index
+    with pytest.raises(InvalidTextLocationError):
+        TextUtils.get_index_from_line_col(text, text.count("\n") + 1, 0)
+    with pytest.raises(InvalidTextLocationError):
+        line_index.get_index_from_line_col(text.count("\n") + 1, 0)
+
+
+def test_apply_text_edits_matches_sequential_application() -> None:
+    edits = [_edit(0, 4, 0, 5, "g"), _edit(3, 6, 3, 7, "B"), _edit(1, 11, 1, 12, "2")]
+    expected = TEXT
+    for edit in sorted(edits, key=lambda e: (e["range"]["start"]["line"], e["range"]["start"]["character"]), reverse=True):
+        start, end = edit["range"]["start"], edit["range"]["end"]
+        expected, _ = TextUtils.delete_text_between_positions(expected, start["line"], start["character"], end["line"], end["character"])
+        expected, _, _ = TextUtils.insert_text_at_position(expected, start["line"], start["character"], edit["newText"])
+    assert TextUtils.apply_text_edits(TEXT, edits) == expected == "def g():\n    return 2\n\nclass B:\n    pass"
+
+
+def test_apply_text_edits_insertions_at_same_position_keep_order() -> None:
+    assert TextUtils.apply_text_edits("ab", [_edit(0, 1, 0, 1, "1"), _edit(0, 1, 0, 1, "2")]) == "a12b"
+
+
+def test_apply_text_edits_rejects_overlapping_edits() -> None:
+    with pytest.raises(InvalidTextLocationError):
+        TextUtils.apply_text_edits(TEXT, [_edit(0, 0, 0, 5, ""), _edit(0, 3, 1, 0, "")])
+
+
+def test_file_buffer_updates_hash_and_line_index_lazily() -> None:
+    buffer = LSPFileBuffer("file:///a.py", TEXT, 0, "python", 1)
+    initial_hash = buffer.content_hash
+    assert buffer.insert_text_at_position(4, 0, "    x = 1\n") == (5, 0)
+    assert buffer.delete_text_between_positions(0, 4, 0, 5) == "f"
+    buffer.apply_text_edits([_edit(0, 4, 0, 4, "h")])
+    assert buffer.contents == "def h():\n    return 1\n\nclass A:\n    x = 1\n    pass"
+    assert buffer.content_hash != initial_hash
+    assert buffer.line_index.get_index_from_line_col(4, 4) == buffer.contents.index("x = 1")